@@ -0,0 +1,180 @@
+"""
+Stand-ins for the MAGICC7 and CICERO-SCM executables
+
+The stand-ins (in ``fake_models``) read the same input files and write
+output files in the same format as the real models but otherwise do no work.
+This means the cost of everything around the models (copying run
+directories, writing input files, starting the executables and reading their
+output) can be benchmarked without the real binaries. How long each run
+takes can be set with the ``FAKE_MAGICC_DELAY`` and ``FAKE_CICEROSCM_DELAY``
+environment variables (in seconds, default: no delay).
+
+Use :func:`get_fake_model_settings` to get the settings needed to run a
+climate model with its stand-in.
+"""
+import datetime as dt
+import os
+import os.path
+import shutil
+import stat
+
+import numpy as np
+
+FAKE_MODELS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fake_models"
+)
+"""str: Directory which contains the stand-ins"""
+
+FAKE_CICEROSCM_EXECUTABLE = os.path.join(FAKE_MODELS_DIR, "scm_vCH4fb")
+"""str: Stand-in for the CICERO-SCM binary (use as ``CICEROSCM_EXECUTABLE``)"""
+
+_MAGICC_OUTPUT_UNITS = (
+    ("Temperature", "K"),
+    ("Radiative Forcing", "W / m^2"),
+    ("Atmospheric Concentrations|CO2", "ppm"),
+    ("Atmospheric Concentrations", "ppb"),
+    ("Heat Content", "10^22 J"),
+    ("Heat Uptake", "W / m^2"),
+    ("Flux", "GtC / yr"),
+)
+
+
+def _get_magicc_output_unit(variable):
+    for start, unit in _MAGICC_OUTPUT_UNITS:
+        if start in variable:
+            return unit
+
+    return "dimensionless"
+
+
+def install_fake_magicc(root_dir, output_variables, years=range(1750, 2101), seed=0):
+    """
+    Install the MAGICC7 stand-in
+
+    The stand-in is installed with the same layout as MAGICC (``bin``,
+    ``run`` and ``out`` directories) so pymagicc can copy and run it like
+    MAGICC. The output files which the stand-in copies are written here,
+    with pymagicc, so the stand-in doesn't have to import anything.
+
+    Parameters
+    ----------
+    root_dir : str
+        Directory in which to install the stand-in
+
+    output_variables : list[str]
+        Variables (OpenSCM names) for which the stand-in writes output
+
+    years : range
+        Years of the output
+
+    seed : int
+        Seed for the random output
+
+    Returns
+    -------
+    str
+        Path to the stand-in executable (use as ``MAGICC_EXECUTABLE_7``)
+    """
+    # only needed (and installed) when MAGICC is benchmarked
+    # pylint:disable=import-outside-toplevel
+    import pymagicc
+    from openscm_runner.adapters.magicc7.magicc7 import _convert_to_pymagicc_var
+
+    bin_dir = os.path.join(root_dir, "bin")
+    run_dir = os.path.join(root_dir, "run")
+    for directory in (bin_dir, run_dir, os.path.join(root_dir, "out")):
+        os.makedirs(directory, exist_ok=True)
+
+    executable = os.path.join(bin_dir, "magicc")
+    shutil.copy(os.path.join(FAKE_MODELS_DIR, "magicc"), executable)
+    os.chmod(executable, os.stat(executable).st_mode | stat.S_IEXEC)
+
+    with open(os.path.join(run_dir, "MAGCFG_DEFAULTS.CFG"), "w") as file_handle:
+        file_handle.write(
+            "&nml_allcfgs\n"
+            "    startyear = {},\n"
+            "    endyear = {},\n"
+            "    stepsperyear = 12,\n"
+            "/\n".format(years[0], years[-1])
+        )
+
+    with open(os.path.join(run_dir, "MAGCFG_USER.CFG"), "w") as file_handle:
+        file_handle.write("&nml_allcfgs\n    file_tuningmodel_1 = 'PYMAGICC',\n/\n")
+
+    rng = np.random.default_rng(seed)
+    time_points = [dt.datetime(year, 1, 1) for year in years]
+    for variable in output_variables:
+        # the names used by pymagicc, as in the adapter
+        variable = _convert_to_pymagicc_var(variable)
+        magicc_variable = pymagicc.definitions.convert_magicc7_to_openscm_variables(
+            variable, inverse=True
+        )
+        writer = pymagicc.io.MAGICCData(
+            rng.random(len(time_points)),
+            index=time_points,
+            columns={
+                "model": "unspecified",
+                "scenario": "unspecified",
+                "region": "World",
+                "variable": variable,
+                "unit": _get_magicc_output_unit(variable),
+                "todo": "N/A",
+            },
+        )
+        writer.metadata = {
+            "header": "Output of the MAGICC7 stand-in",
+            "timeseriestype": "AVERAGE_YEAR_MID_YEAR",
+        }
+        writer.write(
+            os.path.join(bin_dir, "DAT_{}.MAG".format(magicc_variable)),
+            magicc_version=7,
+        )
+
+    return executable
+
+
+def get_fake_model_settings(climate_model, root_dir, output_variables, delay=0.0):
+    """
+    Get the settings needed to run a climate model with its stand-in
+
+    Parameters
+    ----------
+    climate_model : str
+        Climate model (FaIR doesn't have, or need, a stand-in)
+
+    root_dir : str
+        Directory in which to install the stand-in (and, for MAGICC7, create
+        the workers' copies of it)
+
+    output_variables : list[str]
+        Variables (OpenSCM names) which will be requested
+
+    delay : float
+        How long each run of the stand-in takes (seconds)
+
+    Returns
+    -------
+    dict[str: str]
+        Settings (to set as environment variables)
+    """
+    climate_model = climate_model.upper()
+    if climate_model == "MAGICC7":
+        workers_dir = os.path.join(root_dir, "workers")
+        os.makedirs(workers_dir, exist_ok=True)
+
+        return {
+            "MAGICC_EXECUTABLE_7": install_fake_magicc(
+                os.path.join(root_dir, "magicc"), output_variables
+            ),
+            "MAGICC_WORKER_ROOT_DIR": workers_dir,
+            "FAKE_MAGICC_DELAY": str(delay),
+        }
+
+    if climate_model == "CICEROSCM":
+        return {
+            "CICEROSCM_EXECUTABLE": FAKE_CICEROSCM_EXECUTABLE,
+            "CICEROSCM_WORKER_ROOT_DIR": root_dir,
+            "FAKE_CICEROSCM_DELAY": str(delay),
+        }
+
+    return {}
@@ -0,0 +1,411 @@
+"""
+Machinery shared by the benchmarks
+
+Each benchmark is a function which does any setup and returns a function
+taking no arguments which runs the code being benchmarked. Benchmarks are
+registered with :func:`benchmark` and run with :func:`main`, which times them,
+records their peak memory, writes the results to a JSON file and compares
+them against a baseline.
+"""
+import argparse
+import datetime as dt
+import fnmatch
+import gc
+import importlib
+import json
+import os
+import os.path
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+"""str: Default directory in which results and baselines are written"""
+
+DEFAULT_THRESHOLD = 1.25
+"""float: Ratio to the baseline above which a result is reported as a regression"""
+
+_VERSIONED_PACKAGES = (
+    "openscm_runner",
+    "scmdata",
+    "pyam",
+    "pandas",
+    "numpy",
+    "fair",
+    "pymagicc",
+    "openscm_units",
+)
+
+
+def benchmark(registry, name, params=(None,)):
+    """
+    Register a benchmark
+
+    Parameters
+    ----------
+    registry : dict
+        Registry to which to add the benchmark
+
+    name : str
+        Name of the benchmark
+
+    params : tuple
+        Parameters (e.g. problem sizes) with which to run the benchmark. The
+        benchmark function is called with each parameter (unless the only
+        parameter is ``None``) and each is recorded as a separate result
+        (``name[param]``).
+
+    Returns
+    -------
+    function
+        Decorator which registers the benchmark function
+    """
+
+    def _decorator(func):
+        for param in params:
+            if param is None:
+                registry[name] = func
+            else:
+                registry["{}[{}]".format(name, param)] = _bind(func, param)
+
+        return func
+
+    return _decorator
+
+
+def _bind(func, param):
+    def _setup():
+        return func(param)
+
+    return _setup
+
+
+def get_environment():
+    """
+    Get a description of the environment in which the benchmarks are run
+
+    Returns
+    -------
+    dict
+        Python version, platform, number of CPUs and versions of the packages
+        which matter for performance
+    """
+    versions = {}
+    for package in _VERSIONED_PACKAGES:
+        try:
+            versions[package] = importlib.import_module(package).__version__
+        except (ImportError, AttributeError):
+            versions[package] = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def measure(func, repeat=5, min_seconds=0.2):
+    """
+    Time a function and measure its peak memory
+
+    Parameters
+    ----------
+    func : function
+        Function to measure (takes no arguments)
+
+    repeat : int
+        Number of timing repeats
+
+    min_seconds : float
+        Each repeat calls ``func`` enough times to take at least this long
+
+    Returns
+    -------
+    dict
+        Fastest (``seconds``) and median (``median_seconds``) time per call
+        over the repeats, the number of calls per repeat (``number``), the
+        number of repeats (``repeat``) and the peak memory allocated by a
+        single call (``peak_memory``, bytes)
+    """
+    timer = timeit.Timer(func)
+
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_seconds:
+            break
+
+        number *= 2
+
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "median_seconds": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+        "peak_memory": peak - baseline,
+    }
+
+
+def run_benchmarks(registry, pattern="*", repeat=5):
+    """
+    Run benchmarks
+
+    Parameters
+    ----------
+    registry : dict
+        Benchmarks to run
+
+    pattern : str
+        Only run benchmarks whose names match this glob pattern
+
+    repeat : int
+        Number of timing repeats
+
+    Returns
+    -------
+    dict
+        Results of each benchmark (see :func:`measure`)
+    """
+    results = {}
+    for name, setup in registry.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+
+        print("Running {}".format(name), file=sys.stderr)
+        results[name] = measure(setup(), repeat=repeat)
+
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against a baseline
+
+    Parameters
+    ----------
+    results : dict
+        Results of each benchmark
+
+    baseline : dict
+        Baseline results of each benchmark
+
+    threshold : float
+        Results whose time or peak memory is more than this ratio of the
+        baseline's are regressions
+
+    Returns
+    -------
+    list[dict]
+        For each benchmark, its results, its ratio to the baseline (``None``
+        if it isn't in the baseline) and whether it has regressed
+    """
+    out = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        time_ratio = memory_ratio = None
+        if base is not None:
+            time_ratio = res["seconds"] / base["seconds"]
+            memory_ratio = (res["peak_memory"] + 1) / (base["peak_memory"] + 1)
+
+        out.append(
+            {
+                "name": name,
+                "seconds": res["seconds"],
+                "peak_memory": res["peak_memory"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regressed": any(
+                    ratio is not None and ratio > threshold
+                    for ratio in (time_ratio, memory_ratio)
+                ),
+            }
+        )
+
+    return out
+
+
+def _format_ratio(ratio):
+    return "-" if ratio is None else "{:.2f}".format(ratio)
+
+
+def format_comparison(comparison):
+    """
+    Format a comparison as a table
+
+    Parameters
+    ----------
+    comparison : list[dict]
+        Comparison (as returned by :func:`compare`)
+
+    Returns
+    -------
+    str
+        Table
+    """
+    name_width = max([len(c["name"]) for c in comparison] + [len("benchmark")])
+    row = "{:<%d}  {:>12}  {:>10}  {:>12}  {:>10}  {}" % name_width
+    lines = [
+        row.format("benchmark", "time (ms)", "vs base", "peak (MB)", "vs base", "")
+    ]
+    for res in comparison:
+        lines.append(
+            row.format(
+                res["name"],
+                "{:.3f}".format(res["seconds"] * 1e3),
+                _format_ratio(res["time_ratio"]),
+                "{:.2f}".format(res["peak_memory"] / 1024 ** 2),
+                _format_ratio(res["memory_ratio"]),
+                "REGRESSED" if res["regressed"] else "",
+            )
+        )
+
+    return "\n".join(lines)
+
+
+def write_results(path, results):
+    """
+    Write results, along with a description of the environment, to a file
+
+    Parameters
+    ----------
+    path : str
+        File to write
+
+    results : dict
+        Results of each benchmark
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file_handle:
+        json.dump(
+            {
+                "date": dt.datetime.now().isoformat(),
+                "environment": get_environment(),
+                "benchmarks": results,
+            },
+            file_handle,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def read_results(path):
+    """
+    Read results written by :func:`write_results`
+
+    Parameters
+    ----------
+    path : str
+        File to read
+
+    Returns
+    -------
+    dict
+        Results of each benchmark
+    """
+    with open(path) as file_handle:
+        return json.load(file_handle)["benchmarks"]
+
+
+def main(registry, suite, description, argv=None):
+    """
+    Run a suite of benchmarks from the command line
+
+    Parameters
+    ----------
+    registry : dict
+        Benchmarks in the suite
+
+    suite : str
+        Name of the suite (used to name the results files)
+
+    description : str
+        Description of the suite for the command-line help
+
+    argv : list[str]
+        Command-line arguments (if ``None``, ``sys.argv`` is used)
+
+    Returns
+    -------
+    int
+        Exit code, ``1`` if any benchmark regressed compared to the baseline
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="*",
+        help="only run benchmarks whose names match this glob pattern",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of timing repeats"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=os.path.join(RESULTS_DIR, "{}-baseline.json".format(suite)),
+        help="baseline file to compare against (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="save the results as the baseline (e.g. before upgrading a dependency)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="ratio to the baseline above which a result is a regression",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list the benchmarks and exit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(registry))
+        return 0
+
+    results = run_benchmarks(registry, pattern=args.filter, repeat=args.repeat)
+
+    results_file = os.path.join(
+        RESULTS_DIR,
+        "{}-{}.json".format(suite, dt.datetime.now().strftime("%Y%m%d-%H%M%S")),
+    )
+    write_results(results_file, results)
+    print("Results written to {}".format(results_file), file=sys.stderr)
+
+    baseline = {}
+    if args.save_baseline:
+        # keep the baseline results of any benchmarks which weren't run
+        if os.path.isfile(args.baseline):
+            baseline = read_results(args.baseline)
+
+        write_results(args.baseline, {**baseline, **results})
+        print("Baseline written to {}".format(args.baseline), file=sys.stderr)
+        baseline = {}
+    elif os.path.isfile(args.baseline):
+        baseline = read_results(args.baseline)
+    else:
+        print(
+            "No baseline found at {}, run with --save-baseline to create "
+            "one".format(args.baseline),
+            file=sys.stderr,
+        )
+
+    comparison = compare(results, baseline, threshold=args.threshold)
+    print(format_comparison(comparison))
+
+    return int(any(c["regressed"] for c in comparison))
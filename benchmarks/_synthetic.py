@@ -0,0 +1,214 @@
+"""
+Synthetic inputs and outputs for the benchmarks
+
+Everything is generated from data bundled with the repository so the
+benchmarks can be run offline.
+"""
+import csv
+import datetime as dt
+import os.path
+
+import numpy as np
+import pandas as pd
+import pyam
+import scmdata
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+BASE_SCENARIOS_FILE = os.path.join(
+    ROOT_DIR, "tests", "test-data", "rcmip_scen_ssp_world_emissions.csv"
+)
+"""str: Scenarios from which the synthetic scenarios are made"""
+
+CICEROSCM_TEMPLATES_DIR = os.path.join(
+    ROOT_DIR,
+    "src",
+    "openscm_runner",
+    "adapters",
+    "ciceroscm_adapter",
+    "utils_templates",
+)
+
+FAIR_N_GASES = 31
+FAIR_N_FORCINGS = 45
+
+
+def get_scenarios(n_scenarios, seed=0):
+    """
+    Make synthetic scenarios
+
+    Each scenario is one of the bundled SSP scenarios with each timeseries
+    scaled by a random factor (between 0.8 and 1.2).
+
+    Parameters
+    ----------
+    n_scenarios : int
+        Number of scenarios to make
+
+    seed : int
+        Seed for the random scaling
+
+    Returns
+    -------
+    :obj:`pyam.IamDataFrame`
+        Scenarios
+    """
+    base = pyam.IamDataFrame(BASE_SCENARIOS_FILE).timeseries()
+    base_scenarios = base.index.get_level_values("scenario").unique()
+
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n_scenarios):
+        base_scenario = base_scenarios[i % len(base_scenarios)]
+        scenario = base.xs(base_scenario, level="scenario", drop_level=False)
+        scenario = scenario.multiply(
+            rng.uniform(0.8, 1.2, size=scenario.shape[0]), axis="index"
+        )
+        scenario = scenario.rename(
+            index={base_scenario: "{}-synthetic-{}".format(base_scenario, i)},
+            level="scenario",
+        )
+        out.append(scenario)
+
+    return pyam.IamDataFrame(pd.concat(out))
+
+
+def get_fair_output(nt, seed=0):
+    """
+    Make synthetic FaIR output
+
+    Parameters
+    ----------
+    nt : int
+        Number of timesteps
+
+    seed : int
+        Seed for the random output
+
+    Returns
+    -------
+    tuple
+        Output in the same form as :func:`fair.forward.fair_scm`'s
+    """
+    rng = np.random.default_rng(seed)
+
+    return (
+        rng.random((nt, FAIR_N_GASES)),
+        rng.random((nt, FAIR_N_FORCINGS)),
+        rng.random(nt),
+        rng.random(nt),
+        rng.random(nt),
+        rng.random(nt),
+        rng.random(nt),
+    )
+
+
+def get_results(n_runs, n_variables=5, years=range(1750, 2101), seed=0):
+    """
+    Make synthetic results
+
+    Parameters
+    ----------
+    n_runs : int
+        Number of runs (each with its own ``run_id``)
+
+    n_variables : int
+        Number of variables in each run
+
+    years : range
+        Years of the results
+
+    seed : int
+        Seed for the random results
+
+    Returns
+    -------
+    list[:obj:`scmdata.ScmRun`]
+        Results of each run
+    """
+    rng = np.random.default_rng(seed)
+    time_points = [dt.datetime(y, 1, 1) for y in years]
+    variables = ["Synthetic Variable {}".format(i) for i in range(n_variables)]
+
+    return [
+        scmdata.ScmRun(
+            rng.random((len(time_points), n_variables)),
+            index=time_points,
+            columns={
+                "climate_model": "synthetic",
+                "model": "synthetic",
+                "scenario": "scenario-{}".format(i % 2),
+                "region": "World",
+                "variable": variables,
+                "unit": "K",
+                "run_id": i,
+            },
+        )
+        for i in range(n_runs)
+    ]
+
+
+def _get_ciceroscm_components():
+    with open(
+        os.path.join(CICEROSCM_TEMPLATES_DIR, "gases_v1RCMIP.txt")
+    ) as file_handle:
+        reader = csv.reader(file_handle, delimiter="\t")
+        next(reader)
+        return [row[0] for row in reader]
+
+
+_CICEROSCM_COMPONENTS = _get_ciceroscm_components()
+
+CICEROSCM_OUTPUT_COLUMNS = {
+    "temp_conc.txt": _CICEROSCM_COMPONENTS,
+    "temp_em.txt": _CICEROSCM_COMPONENTS,
+    "temp_forc.txt": _CICEROSCM_COMPONENTS + ["Total_forcing"],
+    "temp_temp.txt": [
+        "dT_glob",
+        "dT_NH",
+        "dT_SH",
+        "dT_glob_air",
+        "dT_NH_air",
+        "dT_SH_air",
+        "dT_glob_sea",
+        "dT_NH_sea",
+        "dT_SH_sea",
+        "dSL(m)",
+        "dSL_thermal(m)",
+        "dSL_ice(m)",
+    ],
+    "temp_ohc.txt": ["OHCTOT"],
+    "temp_rib.txt": ["RIB_glob", "RIB_N", "RIB_S"],
+}
+"""dict[str: list[str]]: Columns (other than ``Year``) of each CICERO-SCM output file"""
+
+
+def write_ciceroscm_output(folder, years, seed=0):
+    """
+    Write synthetic CICERO-SCM output files
+
+    Parameters
+    ----------
+    folder : str
+        Folder in which to write the files (the scenario's ``outputfiles``
+        folder)
+
+    years : range
+        Years of the output
+
+    seed : int
+        Seed for the random output
+    """
+    rng = np.random.default_rng(seed)
+    years = np.asarray(years)
+    for fname, columns in CICEROSCM_OUTPUT_COLUMNS.items():
+        values = rng.random((len(years), len(columns)))
+        with open(os.path.join(folder, fname), "w") as file_handle:
+            file_handle.write(" ".join(["Year"] + columns))
+            file_handle.write("\n")
+            np.savetxt(
+                file_handle,
+                np.column_stack([years, values]),
+                fmt=["%d"] + ["%.6e"] * len(columns),
+                delimiter=" ",
+            )
@@ -0,0 +1,288 @@
+"""
+Microbenchmarks of the adapters' hot paths
+
+Run from the root of the repository (see ``python benchmarks/microbenchmarks.py
+--help``). Everything runs offline using bundled data and synthetic scenarios,
+neither MAGICC nor CICERO-SCM is required (runs of the models use the stand-ins
+in ``fake_models``, which don't take any time, so only the cost of everything
+around the models is measured).
+
+Save a baseline before upgrading a dependency (or starting on a change)
+
+.. code:: sh
+
+    python benchmarks/microbenchmarks.py --save-baseline
+
+then run again afterwards. Any benchmark whose time or peak memory has grown
+by more than the threshold compared to the baseline is reported as a
+regression (and the exit code is non-zero).
+"""
+import os
+import os.path
+import shutil
+import sys
+import tempfile
+
+import pymagicc
+import scmdata
+
+from _fake_models import get_fake_model_settings
+from _harness import benchmark, main
+from _synthetic import (
+    CICEROSCM_TEMPLATES_DIR,
+    get_fair_output,
+    get_results,
+    get_scenarios,
+    write_ciceroscm_output,
+)
+from openscm_runner.adapters.ciceroscm_adapter._run_ciceroscm_parallel import (
+    _execute_run as _execute_ciceroscm_run,
+)
+from openscm_runner.adapters.ciceroscm_adapter.make_scenario_files import (
+    SCENARIOFILEWRITER,
+)
+from openscm_runner.adapters.ciceroscm_adapter.read_results import CSCMREADER
+from openscm_runner.adapters.fair_adapter import FAIR
+from openscm_runner.adapters.fair_adapter._run_fair import _process_output
+from openscm_runner.adapters.fair_adapter._scmdf_to_emissions import scmdf_to_emissions
+from openscm_runner.adapters.magicc7 import MAGICC7
+from openscm_runner.adapters.magicc7._run_magicc_parallel import (
+    _execute_run as _execute_magicc_run,
+)
+from openscm_runner.adapters.magicc7._run_magicc_parallel import (
+    _get_worker_instances,
+    _run_func,
+)
+from openscm_runner.adapters.magicc7.magicc7 import _convert_to_pymagicc_var
+from openscm_runner.utils import calculate_quantiles
+
+BENCHMARKS = {}
+
+FAIR_OUTPUT_VARIABLES = {
+    "temperature": ("Surface Air Temperature Change",),
+    "ar6": (
+        "Surface Air Temperature Change",
+        "Surface Air Ocean Blended Temperature Change",
+        "Atmospheric Concentrations|CO2",
+        "Atmospheric Concentrations|CH4",
+        "Effective Radiative Forcing",
+        "Effective Radiative Forcing|Anthropogenic",
+        "Effective Radiative Forcing|Aerosols",
+        "Effective Radiative Forcing|Greenhouse Gases",
+        "Effective Radiative Forcing|CO2",
+        "Heat Uptake|Ocean",
+    ),
+}
+
+CICEROSCM_OUTPUT_VARIABLES = (
+    "Surface Air Temperature Change",
+    "Effective Radiative Forcing",
+    "Effective Radiative Forcing|Aerosols",
+    "Effective Radiative Forcing|Greenhouse Gases",
+    "Emissions|CO2",
+    "Atmospheric Concentrations|CO2",
+    "Heat Uptake",
+    "Heat Content|Ocean",
+)
+
+_TMP_DIRS = []
+
+
+def _mkdtemp():
+    tmp_dir = tempfile.mkdtemp(prefix="openscm-runner-benchmark-")
+    _TMP_DIRS.append(tmp_dir)
+
+    return tmp_dir
+
+
+def _get_single_scenario():
+    return scmdata.ScmRun(get_scenarios(1).timeseries())
+
+
+@benchmark(BENCHMARKS, "scmdf_to_emissions")
+def _bench_scmdf_to_emissions():
+    scenario = _get_single_scenario()
+    years = scenario.time_points.years()
+
+    def _run():
+        scmdf_to_emissions(
+            scenario, startyear=1750, scen_startyear=years[0], endyear=years[-1]
+        )
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "FAIR._make_full_cfgs", params=(1, 10))
+def _bench_fair_make_full_cfgs(n_scenarios):
+    scenarios = scmdata.ScmRun(get_scenarios(n_scenarios).timeseries())
+    cfgs = [{"r0": 30.0 + 0.01 * i} for i in range(100)]
+    adapter = FAIR()
+
+    def _run():
+        adapter._make_full_cfgs(scenarios, cfgs)  # pylint:disable=protected-access
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "_process_output", params=tuple(FAIR_OUTPUT_VARIABLES))
+def _bench_process_output(output_variables):
+    fair_output = get_fair_output(351)
+    output_variables = FAIR_OUTPUT_VARIABLES[output_variables]
+    factors = {"gmst": 1 / 1.04, "ohu": 0.92}
+
+    def _run():
+        _process_output(fair_output, output_variables, factors)
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "SCENARIOFILEWRITER.write_scenario_data")
+def _bench_write_scenario_data():
+    scenario = get_scenarios(1).timeseries()
+    sfilewriter = SCENARIOFILEWRITER(CICEROSCM_TEMPLATES_DIR)
+    odir = _mkdtemp()
+    os.makedirs(os.path.join(odir, "inputfiles"))
+
+    def _run():
+        sfilewriter.write_scenario_data(scenario, odir)
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "CSCMREADER.read_variable_timeseries")
+def _bench_read_variable_timeseries():
+    scenario = "ssp126"
+    # copy into a new directory as ``dirs_exist_ok`` requires Python 3.8
+    rundir = os.path.join(_mkdtemp(), "run_dir")
+    shutil.copytree(os.path.join(CICEROSCM_TEMPLATES_DIR, "run_dir"), rundir)
+    outputfiles = os.path.join(rundir, scenario, "outputfiles")
+    os.makedirs(outputfiles)
+    write_ciceroscm_output(outputfiles, range(1750, 2101))
+
+    sfilewriter = SCENARIOFILEWRITER(CICEROSCM_TEMPLATES_DIR)
+    reader = CSCMREADER(rundir)
+
+    def _run():
+        for variable in CICEROSCM_OUTPUT_VARIABLES:
+            reader.read_variable_timeseries(scenario, variable, sfilewriter)
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "CICERO-SCM run", params=(1, 10))
+def _bench_ciceroscm_run(n_cfgs):
+    # copies the run directory, writes the input files, runs the stand-in
+    # for each config and reads the output
+    os.environ.update(
+        get_fake_model_settings(
+            "CICEROSCM", _mkdtemp(), list(CICEROSCM_OUTPUT_VARIABLES)
+        )
+    )
+    scenariodata = get_scenarios(1).timeseries()
+    cfgs = [{"model_end": 2100, "Index": i} for i in range(n_cfgs)]
+
+    def _run():
+        _execute_ciceroscm_run(cfgs, CICEROSCM_OUTPUT_VARIABLES, scenariodata)
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "MAGICC7 run")
+def _bench_magicc7_run():
+    # writes the config, runs the stand-in and reads the output (the worker's
+    # copy of MAGICC is made in the setup)
+    output_variables = ["Surface Air Temperature Change"]
+    os.environ.update(get_fake_model_settings("MAGICC7", _mkdtemp(), output_variables))
+    pymagicc_vars = [_convert_to_pymagicc_var(v) for v in output_variables]
+
+    scenarios = MAGICC7._convert_scenarios(  # pylint:disable=protected-access
+        get_scenarios(1)
+    )
+    full_cfgs = MAGICC7()._write_scen_files_and_make_full_cfgs(  # pylint:disable=protected-access
+        scenarios, [{"core_climatesensitivity": 3.0, "out_temperature": 1}]
+    )
+    cfg = {
+        **full_cfgs[0],
+        "only": pymagicc_vars,
+        "out_dynamic_vars": [
+            "DAT_{}".format(
+                pymagicc.definitions.convert_magicc7_to_openscm_variables(
+                    v, inverse=True
+                )
+            )
+            for v in pymagicc_vars
+        ],
+        "output_config": None,
+    }
+    _execute_magicc_run(cfg, _run_func)
+
+    def _run():
+        _execute_magicc_run(cfg, _run_func)
+
+    return _run
+
+
+class _OfflineMAGICC7(MAGICC7):
+    """
+    MAGICC7 adapter which doesn't need MAGICC
+
+    Only MAGICC's version and run directory are used when writing SCEN7 files.
+    """
+
+    run_dir = None
+
+    @classmethod
+    def get_version(cls):
+        return "v7.5.1"
+
+    @classmethod
+    def _run_dir(cls):
+        return cls.run_dir
+
+
+@benchmark(BENCHMARKS, "MAGICC7._write_scen_files_and_make_full_cfgs", params=(1, 10))
+def _bench_magicc7_write_scen_files(n_scenarios):
+    scenarios = MAGICC7._convert_scenarios(  # pylint:disable=protected-access
+        get_scenarios(n_scenarios)
+    )
+    cfgs = [{"core_climatesensitivity": 2.5 + 0.01 * i} for i in range(100)]
+    _OfflineMAGICC7.run_dir = _mkdtemp()
+    adapter = _OfflineMAGICC7()
+
+    def _run():
+        adapter._write_scen_files_and_make_full_cfgs(  # pylint:disable=protected-access
+            scenarios, cfgs
+        )
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "calculate_quantiles", params=(100, 600))
+def _bench_calculate_quantiles(n_runs):
+    res = scmdata.run_append(get_results(n_runs))
+
+    def _run():
+        calculate_quantiles(res, [0.05, 0.17, 0.5, 0.83, 0.95])
+
+    return _run
+
+
+@benchmark(BENCHMARKS, "run_append", params=(10, 100, 1000))
+def _bench_run_append(n_results):
+    results = get_results(n_results)
+
+    def _run():
+        scmdata.run_append(results)
+
+    return _run
+
+
+if __name__ == "__main__":
+    try:
+        EXIT_CODE = main(BENCHMARKS, "microbenchmarks", __doc__.strip().split("\n")[0])
+    finally:
+        _get_worker_instances().cleanup()
+        for tmp_dir in _TMP_DIRS:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    sys.exit(EXIT_CODE)
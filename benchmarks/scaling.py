@@ -0,0 +1,564 @@
+"""
+Scaling of :func:`openscm_runner.run.run` with the number of workers
+
+Sweeps the number of workers (via each adapter's ``*_WORKER_NUMBER``
+setting), the number of scenarios and the number of configs and records the
+wall time, CPU efficiency and peak memory of each run. Run from the root of
+the repository (see ``python benchmarks/scaling.py --help``), e.g.
+
+.. code:: sh
+
+    python benchmarks/scaling.py --climate-model FaIR --workers 1 2 4 8 \\
+        --scenarios 1 4 --configs 100 400
+
+By default this measures strong scaling (the same ensemble is run with each
+number of workers). With ``--weak``, the number of configs is per worker so
+each worker always has the same amount of work (weak scaling).
+
+Each run is made in a fresh process so that its peak memory isn't polluted by
+earlier runs. For each run, the table reports
+
+* ``wall (s)``: time taken by :func:`openscm_runner.run.run`
+* ``speedup``: wall time with the fewest workers divided by this wall time
+  (for weak scaling, this is scaled by the ratio of the amount of work)
+* ``par eff``: parallel efficiency, the speedup divided by the ratio of the
+  number of workers
+* ``cpu eff``: CPU time of this process and its workers divided by the wall
+  time multiplied by the number of workers (low values mean the workers are
+  waiting, e.g. on the main process to send them work or collect results)
+* ``busy``: time spent running jobs divided by the wall time multiplied by
+  the number of workers (the difference from ``cpu eff`` is time spent in
+  the main process or outside of jobs)
+* ``main (MB)`` and ``worker (MB)``: peak resident set size of the main
+  process and of the largest worker
+
+The results (including the time spent in each stage of each run) are written
+to ``benchmarks/results`` along with plots of the wall time, efficiency and
+peak memory against the number of workers.
+
+FaIR and NULL (which doesn't run a climate model so only measures
+OpenSCM-Runner's own overhead) run anywhere. MAGICC7 and CICERO-SCM need their
+binaries to be configured as usual (see :ref:`settings-reference`). With
+``--fake-models``, MAGICC7 and CICERO-SCM are replaced by stand-ins which
+take ``--fake-delay`` seconds per run (see ``_fake_models.py``) so the
+orchestration overhead can be measured offline.
+"""
+import argparse
+import datetime as dt
+import itertools
+import json
+import os
+import os.path
+import shutil
+import subprocess  # nosec # only used to run this script
+import sys
+import tempfile
+import time
+
+from _harness import RESULTS_DIR, write_results
+
+WORKER_NUMBER_SETTINGS = {
+    "FAIR": "FAIR_WORKER_NUMBER",
+    "MAGICC7": "MAGICC_WORKER_NUMBER",
+    "CICEROSCM": "CICEROSCM_WORKER_NUMBER",
+    "NULL": "NULL_WORKER_NUMBER",
+}
+"""dict[str: str]: Setting which controls the number of workers of each climate model"""
+
+JOB_SPAN_NAMES = {
+    "FAIR": "FaIR run",
+    "MAGICC7": "MAGICC7 run",
+    "CICEROSCM": "CICERO-SCM run",
+    "NULL": "NULL run",
+}
+"""dict[str: str]: Name of the span of each job of each climate model"""
+
+
+def get_configs(climate_model, n_configs):
+    """
+    Get configs with which to run a climate model
+
+    Parameters
+    ----------
+    climate_model : str
+        Climate model
+
+    n_configs : int
+        Number of configs
+
+    Returns
+    -------
+    list[dict]
+        Configs, each with slightly different parameters
+    """
+    climate_model = climate_model.upper()
+    if climate_model == "FAIR":
+        return [{"r0": 30.0 + 0.01 * i} for i in range(n_configs)]
+
+    if climate_model == "MAGICC7":
+        return [
+            {
+                "core_climatesensitivity": 2.5 + 0.01 * i,
+                "out_temperature": 1,
+                "out_ascii_binary": "BINARY",
+                "out_binary_format": 2,
+            }
+            for i in range(n_configs)
+        ]
+
+    if climate_model == "CICEROSCM":
+        return [
+            {
+                "model_end": 2100,
+                "Index": i,
+                "lambda": 0.540 + 0.0001 * i,
+                "akapa": 0.341,
+                "cpi": 0.556,
+                "W": 1.897,
+                "rlamdo": 16.618,
+                "beto": 3.225,
+                "mixed": 107.277,
+                "dirso2_forc": -0.457,
+                "indso2_forc": -0.514,
+                "bc_forc": 0.200,
+                "oc_forc": -0.103,
+            }
+            for i in range(n_configs)
+        ]
+
+    if climate_model == "NULL":
+        return [{} for _ in range(n_configs)]
+
+    raise NotImplementedError("No configs for {}".format(climate_model))
+
+
+def _get_usage():
+    # resource isn't available on Windows so only import it when needed
+    import resource  # pylint:disable=import-outside-toplevel
+
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    # only includes workers which have been shut down (and waited for)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # kilobytes everywhere except macOS
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+
+    return {
+        "cpu_seconds": sum(
+            getattr(usage, attr)
+            for usage in (usage_self, usage_children)
+            for attr in ("ru_utime", "ru_stime")
+        ),
+        "max_rss_main": usage_self.ru_maxrss * rss_unit,
+        "max_rss_worker": usage_children.ru_maxrss * rss_unit,
+    }
+
+
+def run_point(  # pylint:disable=too-many-arguments,too-many-locals
+    climate_model,
+    n_workers,
+    n_scenarios,
+    n_configs,
+    output_variables,
+    fake_models=False,
+    fake_delay=0.0,
+):
+    """
+    Run a single point of the sweep in this process
+
+    Parameters
+    ----------
+    climate_model : str
+        Climate model to run
+
+    n_workers : int
+        Number of workers
+
+    n_scenarios : int
+        Number of (synthetic) scenarios
+
+    n_configs : int
+        Number of configs
+
+    output_variables : list[str]
+        Variables to include in the output
+
+    fake_models : bool
+        Run MAGICC7 and CICERO-SCM with their stand-ins
+
+    fake_delay : float
+        How long each run of a stand-in takes (seconds)
+
+    Returns
+    -------
+    dict
+        Wall time (``seconds``), CPU time of this process and its workers
+        (``cpu_seconds``), time spent running jobs (``job_seconds``), peak
+        resident set size of this process (``max_rss_main``) and of the
+        largest worker (``max_rss_worker``) and the time spent in each stage
+        (``timings``)
+    """
+    # environment variables take precedence over any dotenv file
+    os.environ[WORKER_NUMBER_SETTINGS[climate_model.upper()]] = str(n_workers)
+
+    # pylint:disable=import-outside-toplevel
+    from _fake_models import get_fake_model_settings
+    from _synthetic import get_scenarios
+    from openscm_runner.run import run
+
+    fake_dir = tempfile.mkdtemp(prefix="openscm-runner-scaling-")
+    try:
+        if fake_models:
+            os.environ.update(
+                get_fake_model_settings(
+                    climate_model, fake_dir, output_variables, delay=fake_delay
+                )
+            )
+
+        scenarios = get_scenarios(n_scenarios)
+        cfgs = get_configs(climate_model, n_configs)
+
+        usage_start = _get_usage()
+        start = time.perf_counter()
+        res = run(
+            climate_models_cfgs={climate_model: cfgs},
+            scenarios=scenarios,
+            output_variables=output_variables,
+        )
+        seconds = time.perf_counter() - start
+        usage_end = _get_usage()
+    finally:
+        shutil.rmtree(fake_dir, ignore_errors=True)
+
+    timings = json.loads(res.metadata["timings"])
+    job_timings = timings.get(JOB_SPAN_NAMES[climate_model.upper()], {})
+
+    return {
+        "seconds": seconds,
+        "cpu_seconds": usage_end["cpu_seconds"] - usage_start["cpu_seconds"],
+        "job_seconds": job_timings.get("seconds", 0.0),
+        "max_rss_main": usage_end["max_rss_main"],
+        "max_rss_worker": usage_end["max_rss_worker"],
+        "timings": timings,
+    }
+
+
+def _run_point_in_subprocess(point):
+    out = subprocess.run(  # nosec # runs this script with the same interpreter
+        [sys.executable, os.path.abspath(__file__), "--point", json.dumps(point)],
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+
+    return json.loads(out.stdout.decode().strip().split("\n")[-1])
+
+
+def _get_points(args):
+    for n_scenarios, n_configs, n_workers in itertools.product(
+        args.scenarios, args.configs, args.workers
+    ):
+        yield {
+            "climate_model": args.climate_model,
+            "n_workers": n_workers,
+            "n_scenarios": n_scenarios,
+            "n_configs": n_configs * n_workers if args.weak else n_configs,
+            "output_variables": args.output_variables,
+            "fake_models": args.fake_models,
+            "fake_delay": args.fake_delay,
+        }
+
+
+def _get_problem(point):
+    return "{} scenarios x {} configs".format(point["n_scenarios"], point["n_configs"])
+
+
+def add_efficiencies(results, weak=False):
+    """
+    Add speedups and efficiencies to the results of a sweep
+
+    Parameters
+    ----------
+    results : list[dict]
+        Results of each point of the sweep (point and measurements). The
+        results are updated in place.
+
+    weak : bool
+        Whether the number of configs grows with the number of workers (weak
+        scaling), in which case speedups are adjusted for the amount of work
+    """
+    # compare against the point with the fewest workers for the same problem
+    # (or, for weak scaling, the same problem per worker)
+    def _get_group(res):
+        if weak:
+            return (res["n_scenarios"], res["n_configs"] // res["n_workers"])
+
+        return (res["n_scenarios"], res["n_configs"])
+
+    references = {}
+    for res in results:
+        group = _get_group(res)
+        if group not in references or res["n_workers"] < references[group]["n_workers"]:
+            references[group] = res
+
+    for res in results:
+        reference = references[_get_group(res)]
+        worker_ratio = res["n_workers"] / reference["n_workers"]
+        work_ratio = res["n_configs"] / reference["n_configs"]
+        capacity = res["seconds"] * res["n_workers"]
+
+        res["speedup"] = reference["seconds"] / res["seconds"] * work_ratio
+        res["parallel_efficiency"] = res["speedup"] / worker_ratio
+        res["cpu_efficiency"] = res["cpu_seconds"] / capacity
+        res["busy"] = res["job_seconds"] / capacity
+
+
+def format_table(results):
+    """
+    Format the results of a sweep as a table
+
+    Parameters
+    ----------
+    results : list[dict]
+        Results of each point of the sweep (with efficiencies, see
+        :func:`add_efficiencies`)
+
+    Returns
+    -------
+    str
+        Table
+    """
+    row = "{:>9}  {:>7}  {:>9}  {:>9}  {:>8}  {:>8}  {:>8}  {:>6}  {:>10}  {:>11}"
+    lines = [
+        row.format(
+            "scenarios",
+            "configs",
+            "workers",
+            "wall (s)",
+            "speedup",
+            "par eff",
+            "cpu eff",
+            "busy",
+            "main (MB)",
+            "worker (MB)",
+        )
+    ]
+    for res in results:
+        lines.append(
+            row.format(
+                res["n_scenarios"],
+                res["n_configs"],
+                res["n_workers"],
+                "{:.2f}".format(res["seconds"]),
+                "{:.2f}".format(res["speedup"]),
+                "{:.2f}".format(res["parallel_efficiency"]),
+                "{:.2f}".format(res["cpu_efficiency"]),
+                "{:.2f}".format(res["busy"]),
+                "{:.0f}".format(res["max_rss_main"] / 1024 ** 2),
+                # there are no workers if the model is run serially
+                "{:.0f}".format(res["max_rss_worker"] / 1024 ** 2)
+                if res["max_rss_worker"]
+                else "-",
+            )
+        )
+
+    return "\n".join(lines)
+
+
+def plot(results, path, title):
+    """
+    Plot the results of a sweep against the number of workers
+
+    Parameters
+    ----------
+    results : list[dict]
+        Results of each point of the sweep (with efficiencies, see
+        :func:`add_efficiencies`)
+
+    path : str
+        File in which to save the plot
+
+    title : str
+        Title of the plot
+    """
+    # pylint:disable=import-outside-toplevel
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4.5))
+    problems = {}
+    for res in results:
+        problems.setdefault(_get_problem(res), []).append(res)
+
+    for problem, problem_results in problems.items():
+        problem_results = sorted(problem_results, key=lambda r: r["n_workers"])
+        workers = [r["n_workers"] for r in problem_results]
+
+        axes[0].plot(workers, [r["seconds"] for r in problem_results], "o-")
+        axes[1].plot(
+            workers,
+            [r["parallel_efficiency"] for r in problem_results],
+            "o-",
+            label="{} (parallel)".format(problem),
+        )
+        axes[1].plot(
+            workers,
+            [r["cpu_efficiency"] for r in problem_results],
+            "x--",
+            color=axes[1].lines[-1].get_color(),
+            label="{} (CPU)".format(problem),
+        )
+        axes[2].plot(
+            workers,
+            [r["max_rss_main"] / 1024 ** 2 for r in problem_results],
+            "o-",
+            label="{} (main)".format(problem),
+        )
+        axes[2].plot(
+            workers,
+            [r["max_rss_worker"] / 1024 ** 2 for r in problem_results],
+            "x--",
+            color=axes[2].lines[-1].get_color(),
+            label="{} (largest worker)".format(problem),
+        )
+
+    for axis, ylabel in zip(
+        axes, ("Wall time (s)", "Efficiency", "Peak resident set size (MB)")
+    ):
+        axis.set_xscale("log", basex=2)
+        axis.set_xlabel("Workers")
+        axis.set_ylabel(ylabel)
+
+    axes[0].set_yscale("log")
+    axes[1].set_ylim(bottom=0)
+    axes[1].legend(fontsize="small")
+    axes[2].legend(fontsize="small")
+    fig.suptitle(title)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main(argv=None):
+    """
+    Run the sweep from the command line
+
+    Parameters
+    ----------
+    argv : list[str]
+        Command-line arguments (if ``None``, ``sys.argv`` is used)
+
+    Returns
+    -------
+    int
+        Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--climate-model",
+        default="FaIR",
+        help="climate model to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="numbers of workers (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="numbers of scenarios (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--configs",
+        type=int,
+        nargs="+",
+        default=[100],
+        help="numbers of configs, per worker with --weak (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--weak",
+        action="store_true",
+        help="scale the number of configs with the number of workers",
+    )
+    parser.add_argument(
+        "--output-variables",
+        nargs="+",
+        default=["Surface Air Temperature Change"],
+        help="variables to include in the output (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--fake-models",
+        action="store_true",
+        help="run MAGICC7 and CICERO-SCM with stand-ins rather than their binaries",
+    )
+    parser.add_argument(
+        "--fake-delay",
+        type=float,
+        default=0.0,
+        help="seconds each run of a stand-in takes (default: %(default)s)",
+    )
+    parser.add_argument("--point", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.point is not None:
+        # run a single point and report back to the sweep
+        print(json.dumps(run_point(**json.loads(args.point))))
+        return 0
+
+    if args.climate_model.upper() not in WORKER_NUMBER_SETTINGS:
+        parser.error(
+            "--climate-model must be one of {}".format(sorted(WORKER_NUMBER_SETTINGS))
+        )
+
+    results = []
+    for point in _get_points(args):
+        print(
+            "Running {} with {} workers".format(
+                _get_problem(point), point["n_workers"]
+            ),
+            file=sys.stderr,
+        )
+        results.append({**point, **_run_point_in_subprocess(point)})
+
+    add_efficiencies(results, weak=args.weak)
+
+    suite = "scaling-{}-{}-{}".format(
+        args.climate_model.lower(),
+        "weak" if args.weak else "strong",
+        dt.datetime.now().strftime("%Y%m%d-%H%M%S"),
+    )
+    results_file = os.path.join(RESULTS_DIR, "{}.json".format(suite))
+    write_results(
+        results_file,
+        {
+            "{}[workers={},scenarios={},configs={}]".format(
+                res["climate_model"],
+                res["n_workers"],
+                res["n_scenarios"],
+                res["n_configs"],
+            ): res
+            for res in results
+        },
+    )
+    print("Results written to {}".format(results_file), file=sys.stderr)
+
+    plot_file = os.path.join(RESULTS_DIR, "{}.png".format(suite))
+    plot(
+        results,
+        plot_file,
+        "{} {} scaling".format(args.climate_model, "weak" if args.weak else "strong"),
+    )
+    print("Plot written to {}".format(plot_file), file=sys.stderr)
+
+    print(format_table(results))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,7 @@ SOURCE_DIR = "src"
 REQUIREMENTS = [
     "click",
     "fair==1.6.2",
+    "importlib_metadata; python_version < '3.8'",
     "matplotlib==3.2.2",
     "pyam-iamc",
     "pymagicc>=2.0.0,<3",
@@ -39,6 +40,7 @@ REQUIREMENTS_NOTEBOOKS = [
 REQUIREMENTS_TESTS = [
     "codecov",
     "coverage",
+    "distributed",
     "nbval",
     "pytest-cov",
     "pytest>=4.0",
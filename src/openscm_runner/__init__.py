@@ -4,7 +4,7 @@ OpenSCM-Runner, a thin wrapper to run simple climate models with a unified inter
 See README and docs for more info.
 """
 from ._version import get_versions
-from .run import run  # noqa: F401
+from .run import run, run_iter  # noqa: F401
 
 __version__ = get_versions()["version"]
 del get_versions
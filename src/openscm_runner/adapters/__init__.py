@@ -1,6 +1,139 @@
 """
 Adapters for different climate models
+
+Adapters are only imported when they are first used so that e.g. running FaIR
+never imports pymagicc. As well as the adapters which ship with
+OpenSCM-Runner, adapters provided by other packages are found via the
+``openscm_runner.adapters`` entry point group. For example, a package could
+provide an adapter called ``MY-MODEL`` by including the following in its
+``setup.py``
+
+.. code:: python
+
+    entry_points={
+        "openscm_runner.adapters": [
+            "MY-MODEL = my_package.adapter:MyModelAdapter",
+        ],
+    }
+
+Adapters can also be registered at runtime with :func:`register_adapter`.
+Adapter names are case-insensitive.
 """
-from .ciceroscm_adapter import CICEROSCM  # noqa: F401
-from .fair_adapter import FAIR  # noqa: F401
-from .magicc7 import MAGICC7  # noqa: F401
+import importlib
+import logging
+
+LOGGER = logging.getLogger(__name__)
+
+_ENTRY_POINT_GROUP = "openscm_runner.adapters"
+
+_BUILTIN_ADAPTERS = {
+    "CICEROSCM": "openscm_runner.adapters.ciceroscm_adapter:CICEROSCM",
+    "FAIR": "openscm_runner.adapters.fair_adapter:FAIR",
+    "MAGICC7": "openscm_runner.adapters.magicc7:MAGICC7",
+    "NULL": "openscm_runner.adapters.null_adapter:NULL",
+}
+
+_registry = dict(_BUILTIN_ADAPTERS)
+_entry_points_loaded = False
+
+
+def _load_entry_points():
+    global _entry_points_loaded  # pylint:disable=global-statement
+
+    try:
+        from importlib.metadata import (  # pylint:disable=import-outside-toplevel
+            entry_points,
+        )
+    except ImportError:  # pragma: no cover # python < 3.8
+        from importlib_metadata import (  # pylint:disable=import-outside-toplevel
+            entry_points,
+        )
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        group = all_entry_points.select(group=_ENTRY_POINT_GROUP)
+    else:  # pragma: no cover # python < 3.10
+        group = all_entry_points.get(_ENTRY_POINT_GROUP, [])
+
+    for entry_point in group:
+        name = entry_point.name.upper()
+        if name in _registry:
+            LOGGER.warning(
+                "Ignoring entry point for %s (%s) as an adapter is already "
+                "registered with this name",
+                name,
+                entry_point.value,
+            )
+            continue
+
+        _registry[name] = entry_point.value
+
+    _entry_points_loaded = True
+
+
+def register_adapter(name, adapter):
+    """
+    Register an adapter
+
+    Parameters
+    ----------
+    name : str
+        Name of the climate model (as used in the keys of
+        ``climate_models_cfgs`` in :func:`openscm_runner.run.run`)
+
+    adapter : :obj:`openscm_runner.adapters.base._Adapter` or str
+        Adapter class or a string of the form ``"module:attribute"`` which
+        points to the adapter class. The latter means the module is only
+        imported once the adapter is used.
+    """
+    _registry[name.upper()] = adapter
+
+
+def get_adapter(name):
+    """
+    Get an adapter class
+
+    Parameters
+    ----------
+    name : str
+        Name of the climate model (case-insensitive)
+
+    Returns
+    -------
+    :obj:`openscm_runner.adapters.base._Adapter`
+        Adapter class (not an instance)
+
+    Raises
+    ------
+    NotImplementedError
+        No adapter is available for ``name``
+    """
+    key = name.upper()
+    if key not in _registry and not _entry_points_loaded:
+        _load_entry_points()
+
+    try:
+        adapter = _registry[key]
+    except KeyError:
+        raise NotImplementedError(  # pylint:disable=raise-missing-from
+            "No adapter available for {}".format(name)
+        )
+
+    if isinstance(adapter, str):
+        module_name, attribute = adapter.split(":")
+        LOGGER.debug("Importing adapter for %s from %s", name, module_name)
+        adapter = getattr(importlib.import_module(module_name), attribute)
+        _registry[key] = adapter
+
+    return adapter
+
+
+def __getattr__(name):
+    if name in _BUILTIN_ADAPTERS:
+        return get_adapter(name)
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_BUILTIN_ADAPTERS))
@@ -1,8 +1,22 @@
 """
 Base class for adapters
 """
+import functools
+import inspect
+import logging
 from abc import ABC, abstractmethod
 
+from .utils._result_store import _get_result_cache, _run_with_result_store
+
+LOGGER = logging.getLogger(__name__)
+
+
+@functools.lru_cache()
+def _takes_argument(func, name):
+    parameters = inspect.signature(func).parameters.values()
+
+    return any(p.name == name or p.kind == p.VAR_KEYWORD for p in parameters)
+
 
 class _Adapter(ABC):  # pylint: disable=too-few-public-methods
     """
@@ -23,6 +37,16 @@ class _Adapter(ABC):  # pylint: disable=too-few-public-methods
         """
         self._init_model(*args, **kwargs)
 
+    @classmethod
+    def _init_worker(cls):
+        """
+        Prepare a worker process to run the model
+
+        Called once in each worker of a
+        :class:`openscm_runner.executors.WorkerPool` so that any expensive
+        setup is done before the worker receives its first run.
+        """
+
     @abstractmethod
     def _init_model(self, *args, **kwargs):
         """
@@ -37,8 +61,25 @@ class _Adapter(ABC):  # pylint: disable=too-few-public-methods
             Keyword arguments used to initialise the model
         """
 
-    def run(self, scenarios, cfgs, output_variables, output_config):
+    def run(  # pylint:disable=too-many-arguments
+        self,
+        scenarios,
+        cfgs,
+        output_variables,
+        output_config,
+        pool=None,
+        sink=None,
+        journal=None,
+    ):
         """
+        Run the model
+
+        If ``OPENSCM_RUNNER_CACHE_DIR`` is set, results are cached there and
+        only (scenario, config) pairs which aren't already in the cache are
+        run. Cache entries are keyed by the scenario's data, the config, the
+        model version, ``output_variables`` and ``output_config`` so any
+        change to these results in a cache miss.
+
         Parameters
         ----------
         scenarios : :obj:`pyam.IamDataFrame`
@@ -53,17 +94,118 @@ class _Adapter(ABC):  # pylint: disable=too-few-public-methods
         output_config : tuple[str]
             Configuration to include in the output
 
+        pool : :obj:`concurrent.futures.Executor`
+            Pool in which to run the model. If ``None``, the adapter creates
+            (and shuts down) its own pool.
+
+        sink : :obj:`openscm_runner.sinks.ResultSink`
+            Sink to which results are written as soon as they are available.
+            If ``None``, all results are collected and returned.
+
+        journal : :obj:`openscm_runner.journal.RunJournal`
+            Journal in which to record completed runs. Runs which are already
+            recorded in the journal are not run again. If supplied, the result
+            cache is not used.
+
         Returns
         -------
         :obj:`ScmRun`
-            Model output
+            Model output (``None`` if ``sink`` is supplied)
+        """
+        store = journal if journal is not None else _get_result_cache()
+        if (
+            store is not None
+            and journal is None
+            and not _takes_argument(type(self)._run, "sink")
+        ):
+            LOGGER.warning(
+                "Not using the result cache for %s as its `_run` doesn't take "
+                "`sink`",
+                type(self).__name__,
+            )
+            store = None
+
+        if store is not None:
+            return _run_with_result_store(
+                self,
+                store,
+                scenarios,
+                cfgs,
+                output_variables,
+                output_config,
+                pool,
+                sink,
+            )
+
+        return self._call_run(
+            scenarios, cfgs, output_variables, output_config, pool=pool, sink=sink
+        )
+
+    def _call_run(  # pylint:disable=too-many-arguments
+        self, scenarios, cfgs, output_variables, output_config, pool=None, sink=None
+    ):
         """
-        return self._run(scenarios, cfgs, output_variables, output_config)
+        Call :meth:`_run`, only passing ``pool`` and ``sink`` if they are supplied
+
+        This means adapters whose :meth:`_run` doesn't take ``pool`` and
+        ``sink`` can still be run, as long as neither is needed.
+
+        Raises
+        ------
+        NotImplementedError
+            ``pool`` or ``sink`` is supplied but the adapter's :meth:`_run`
+            doesn't take it
+        """
+        kwargs = {}
+        for name, value in (("pool", pool), ("sink", sink)):
+            if value is None:
+                continue
+
+            if not _takes_argument(type(self)._run, name):
+                raise NotImplementedError(
+                    "{}'s `_run` doesn't take `{}`".format(type(self).__name__, name)
+                )
+
+            kwargs[name] = value
+
+        return self._run(scenarios, cfgs, output_variables, output_config, **kwargs)
 
     @abstractmethod
-    def _run(self, scenarios, cfgs, output_variables, output_config):
+    def _run(  # pylint:disable=too-many-arguments
+        self, scenarios, cfgs, output_variables, output_config, pool=None, sink=None
+    ):
         """
         Run the model.
 
-        This method is the internal implementation of the :meth:`run` interface
+        This method is the internal implementation of the :meth:`run` interface.
+        ``pool`` and ``sink`` are only passed if they are supplied, so
+        adapters which don't support them can leave them out.
+        """
+
+    @staticmethod
+    def _get_run_id(
+        scenario_index, cfg_index, n_cfgs, cfg
+    ):  # pylint:disable=unused-argument
+        """
+        Get the ``run_id`` which :meth:`_run` assigns to a run
+
+        Parameters
+        ----------
+        scenario_index : int
+            Index of the scenario (when sorted by scenario then model)
+
+        cfg_index : int
+            Index of the config
+
+        n_cfgs : int
+            Number of configs which are being run
+
+        cfg : dict
+            Config
+
+        Returns
+        -------
+        int
+            ``run_id`` of the run
         """
+        return scenario_index * n_cfgs + cfg_index
@@ -3,12 +3,15 @@ Module for running CICEROSCM in parallel
 """
 import logging
 import os
-from concurrent.futures import ProcessPoolExecutor
 
 import scmdata
 
 from ...settings import config
-from ..utils._parallel_process import _parallel_process
+from ...tracing import span
+from ..utils._combine import _run_append_successful
+from ..utils._parallel_process import _owned_pool, _parallel_process
+from ..utils._runtimes import _RUNTIME_HISTORY
+from ._utils import _get_unique_index_values
 from .ciceroscm_wrapper import CiceroSCMWrapper
 
 LOGGER = logging.getLogger(__name__)
@@ -20,18 +23,81 @@ FRONT_SERIAL = 0
 FRONT_PARALLEL = 0
 """int: Number of front parallel runs to do before starting full parallel runs"""
 
+_MIN_RUN_TIMEOUT = 10.0
+"""float: Shortest timeout of a CICERO-SCM run derived from previous runtimes"""
 
-def _execute_run(cfgs, output_variables, scenariodata):
+
+def _execute_run(cfgs, output_variables, scenariodata, run_timeout=None):
     cscm = CiceroSCMWrapper(scenariodata)
     try:
-        out = cscm.run_over_cfgs(cfgs, output_variables)
+        out = cscm.run_over_cfgs(cfgs, output_variables, run_timeout=run_timeout)
     finally:
         cscm.cleanup_tempdirs()
 
     return out
 
 
-def run_ciceroscm_parallel(scenarios, cfgs, output_vars):
+def _get_n_years(scenariodata):
+    # other scenarios' times may be in the columns too
+    years = [
+        getattr(t, "year", t)
+        for t in scenariodata.dropna(axis="columns", how="all").columns
+    ]
+
+    return max(years) - min(years) + 1
+
+
+def _estimate_cost(run):
+    # CICERO-SCM runs every config for the scenario in one job
+    return len(run["cfgs"]) * _get_n_years(run["scenariodata"])
+
+
+def _get_runtime_key(run):
+    scenario = _get_unique_index_values(run["scenariodata"], "scenario")
+    model = _get_unique_index_values(run["scenariodata"], "model")
+
+    return "{}|{}|{}".format(model, scenario, len(run["cfgs"]))
+
+
+def _get_run_timeout(run):
+    """
+    Get how long each CICERO-SCM run of a job can take before it is killed
+
+    If ``CICEROSCM_RUN_TIMEOUT`` is set, it is used. Otherwise, if
+    ``OPENSCM_RUNNER_STRAGGLER_FACTOR`` is set, the timeout is this factor
+    times the runtime per config of previous equivalent jobs (see
+    :mod:`openscm_runner.adapters.utils._runtimes`).
+
+    Parameters
+    ----------
+    run : dict
+        The job (as passed to :func:`_execute_run`)
+
+    Returns
+    -------
+    float
+        Timeout in seconds, ``None`` if there is no timeout
+    """
+    run_timeout = config.get("CICEROSCM_RUN_TIMEOUT", None) or None
+    if run_timeout is not None:
+        return float(run_timeout)
+
+    straggler_factor = config.get("OPENSCM_RUNNER_STRAGGLER_FACTOR", None) or None
+    if straggler_factor is None:
+        return None
+
+    job_seconds = _RUNTIME_HISTORY.mean_estimate(
+        _execute_run, [_estimate_cost(run)], [_get_runtime_key(run)]
+    )
+    if job_seconds is None:
+        return None
+
+    return max(
+        float(straggler_factor) * job_seconds / len(run["cfgs"]), _MIN_RUN_TIMEOUT
+    )
+
+
+def run_ciceroscm_parallel(scenarios, cfgs, output_vars, pool=None, callback=None):
     """
     Run CICEROSCM in parallel
 
@@ -47,6 +113,15 @@ def run_ciceroscm_parallel(scenarios, cfgs, output_vars):
         Variables to output (may require some fiddling with ``out_x``
         variables in ``cfgs`` to get this right)
 
+    pool : :obj:`concurrent.futures.Executor`
+        Pool in which to run CICERO-SCM. If ``None``, a pool with
+        ``CICEROSCM_WORKER_NUMBER`` workers is created.
+
+    callback : function
+        Function to call with the results of each scenario as soon as they are
+        available. If supplied, results are not collected and ``None`` is
+        returned.
+
     Returns
     -------
     :obj:`ScmRun`
@@ -57,23 +132,48 @@ def run_ciceroscm_parallel(scenarios, cfgs, output_vars):
         {"cfgs": cfgs, "output_variables": output_vars, "scenariodata": smdf}
         for (scen, model), smdf in scenarios.timeseries().groupby(["scenario", "model"])
     ]
-
-    max_workers = int(config.get("CICEROSCM_WORKER_NUMBER", os.cpu_count()))
-    LOGGER.info("Running in parallel with up to %d workers", max_workers)
-
-    with ProcessPoolExecutor(max_workers=max_workers) as pool:
-        result = _parallel_process(
-            func=_execute_run,
-            configuration=runs,
-            pool=pool,
-            config_are_kwargs=True,
-            # no front runs as these defeat the purpose with CICERO-SCM (because
-            # it is only parallel on scenarios, not configs)
-            front_serial=FRONT_SERIAL,
-            front_parallel=FRONT_PARALLEL,
-        )
+    for run in runs:
+        run["run_timeout"] = _get_run_timeout(run)
+
+    if callback is not None:
+
+        def _callback_successful_runs(res):
+            if res is not None:
+                callback(res)
+
+    else:
+        _callback_successful_runs = None
+
+    parallel_process_kwargs = dict(
+        func=_execute_run,
+        configuration=runs,
+        config_are_kwargs=True,
+        # no front runs as these defeat the purpose with CICERO-SCM (because
+        # it is only parallel on scenarios, not configs)
+        front_serial=FRONT_SERIAL,
+        front_parallel=FRONT_PARALLEL,
+        callback=_callback_successful_runs,
+        cost=_estimate_cost,
+        runtime_key=_get_runtime_key,
+        chunksize=config.get("CICEROSCM_CHUNKSIZE", 1),
+        combine=_run_append_successful,
+        name="CICERO-SCM run",
+    )
+    if pool is not None:
+        LOGGER.info("Running in the provided pool")
+        result = _parallel_process(**parallel_process_kwargs, pool=pool)
+    else:
+        max_workers = int(config.get("CICEROSCM_WORKER_NUMBER", os.cpu_count()))
+        LOGGER.info("Running in parallel with up to %d workers", max_workers)
+
+        with _owned_pool(max_workers) as owned_pool:
+            result = _parallel_process(**parallel_process_kwargs, pool=owned_pool)
+
+    if callback is not None:
+        return None
 
     LOGGER.info("Appending CICERO-SCM results into a single ScmRun")
-    result = scmdata.run_append([r for r in result if r is not None])
+    with span("CICERO-SCM: run_append"):
+        result = scmdata.run_append([r for r in result if r is not None])
 
     return result
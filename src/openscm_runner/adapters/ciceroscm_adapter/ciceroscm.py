@@ -26,7 +26,9 @@ class CICEROSCM(_Adapter):  # pylint: disable=too-few-public-methods
     def _init_model(self):  # pylint: disable=arguments-differ
         pass
 
-    def _run(self, scenarios, cfgs, output_variables, output_config):
+    def _run(  # pylint:disable=too-many-arguments
+        self, scenarios, cfgs, output_variables, output_config, pool=None, sink=None
+    ):
         """
         Run the model.
 
@@ -37,9 +39,21 @@ class CICEROSCM(_Adapter):  # pylint: disable=too-few-public-methods
         if output_config is not None:
             raise NotImplementedError("`output_config` not implemented for CICERO-SCM")
 
-        runs = run_ciceroscm_parallel(scenarios, cfgs, output_variables)
+        runs = run_ciceroscm_parallel(
+            scenarios,
+            cfgs,
+            output_variables,
+            pool=pool,
+            callback=None if sink is None else sink.write,
+        )
         return runs
 
+    @staticmethod
+    def _get_run_id(
+        scenario_index, cfg_index, n_cfgs, cfg
+    ):  # pylint:disable=unused-argument
+        return cfg.get("Index", cfg_index)
+
     @classmethod
     def get_version(cls):
         """
@@ -13,6 +13,7 @@ import pandas as pd
 from scmdata import ScmRun, run_append
 
 from ...settings import config
+from ...tracing import span
 from ._utils import _get_unique_index_values
 from .make_scenario_files import SCENARIOFILEWRITER
 from .read_results import CSCMREADER
@@ -40,7 +41,8 @@ class CiceroSCMWrapper:  # pylint: disable=too-few-public-methods
         self.model = _get_unique_index_values(scenariodata, "model")
         self._make_dir_structure(re.sub("[^a-zA-Z0-9_-]", "", self.scen))
 
-        self._call_sfilewriter(scenariodata)
+        with span("CICERO-SCM: write scenario files"):
+            self._call_sfilewriter(scenariodata)
 
     def _call_sfilewriter(self, scenarios):
         """
@@ -51,39 +53,48 @@ class CiceroSCMWrapper:  # pylint: disable=too-few-public-methods
             os.path.join(self.rundir, re.sub("[^a-zA-Z0-9_-]", "", self.scen)),
         )
 
-    def run_over_cfgs(self, cfgs, output_variables):
+    def run_over_cfgs(self, cfgs, output_variables, run_timeout=None):
         """
         Run over each configuration parameter set
         write parameterfiles, run, read results
         and make an ScmRun with results
+
+        Each run is killed and re-run if it takes longer than ``run_timeout``
+        seconds (see :meth:`_call_binary`).
         """
+        executable = config.get("CICEROSCM_EXECUTABLE", None) or os.path.join(
+            self.rundir, "scm_vCH4fb"
+        )
         runs = []
         for i, pamset in enumerate(cfgs):
             self.pamfilewriter.write_parameterfile(
                 pamset,
                 os.path.join(self.rundir, re.sub("[^a-zA-Z0-9_-]", "", self.scen)),
             )
-            call = "{executable} {pamfile}".format(
-                executable=os.path.join(self.rundir, "scm_vCH4fb"),
-                pamfile=os.path.join(
+            # not run via a shell so a timeout kills the binary itself
+            call = [
+                executable,
+                os.path.join(
                     self.rundir,
                     re.sub("[^a-zA-Z0-9_-]", "", self.scen),
                     "inputfiles",
                     "pam_current.scm",
                 ),
-            )
+            ]
             LOGGER.debug("Call, %s", call)
-            subprocess.check_call(
-                call, cwd=self.rundir, shell=True,  # nosec # have to use subprocess
-            )
+            with span("CICERO-SCM: model binary"):
+                self._call_binary(call, run_timeout)
+
             for variable in output_variables:
-                (
-                    years,
-                    timeseries,
-                    unit,
-                ) = self.resultsreader.read_variable_timeseries(
-                    self.scen, variable, self.sfilewriter
-                )
+                with span("CICERO-SCM: read output"):
+                    (
+                        years,
+                        timeseries,
+                        unit,
+                    ) = self.resultsreader.read_variable_timeseries(
+                        self.scen, variable, self.sfilewriter
+                    )
+
                 if years.empty:  # pragma: no cover
                     continue  # pragma: no cover
 
@@ -104,6 +115,43 @@ class CiceroSCMWrapper:  # pylint: disable=too-few-public-methods
 
         return run_append(runs)
 
+    def _call_binary(self, call, timeout=None):
+        """
+        Call the CICERO-SCM binary, killing and re-running it if it hangs
+
+        The binary is re-run up to ``CICEROSCM_RUN_RETRIES`` times.
+
+        Parameters
+        ----------
+        call : list[str]
+            The executable and its arguments
+
+        timeout : float
+            Seconds after which the binary is killed. If ``None``, there is
+            no timeout.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            The last re-run also timed out
+        """
+        retries = int(config.get("CICEROSCM_RUN_RETRIES", 1))
+        for attempt in range(retries + 1):
+            try:
+                subprocess.check_call(  # nosec # have to use subprocess
+                    call, cwd=self.rundir, timeout=timeout,
+                )
+                return
+            except subprocess.TimeoutExpired:
+                if attempt == retries:
+                    raise
+
+                LOGGER.warning(
+                    "CICERO-SCM run did not complete within %ss, re-running: %s",
+                    timeout,
+                    " ".join(call),
+                )
+
     def _setup_tempdirs(self):
         """
         Set up temporary directories to run and make output in
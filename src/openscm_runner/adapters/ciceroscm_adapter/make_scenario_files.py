@@ -5,6 +5,7 @@ Module with functionality to make emission input files
 # TODO: optimise to speed up reading and writing
 
 import csv
+import functools
 import logging
 import os
 import re
@@ -18,6 +19,7 @@ from ._utils import _get_unique_index_values
 LOGGER = logging.getLogger(__name__)
 
 
+@functools.lru_cache()
 def _read_ssp245_em(ssp245_em_file):
     """
     Get default data from ssp245_RCMIP
@@ -32,6 +34,7 @@ def _read_ssp245_em(ssp245_em_file):
     return ssp245df
 
 
+@functools.lru_cache()
 def _unit_conv_factor(unit, cicero_unit):
     with openscm_units.unit_registry.context("NOx_conversions"):
         conv_factor = openscm_units.unit_registry(unit).to(cicero_unit).magnitude
@@ -1,9 +1,9 @@
 """
 Module for running FaIR
 """
+import functools
 import logging
 import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from fair.constants.general import EARTH_RADIUS, SECONDS_PER_YEAR
@@ -11,16 +11,198 @@ from fair.forward import fair_scm
 from scmdata import ScmRun, run_append
 
 from ...settings import config
-from ..utils._parallel_process import _parallel_process
+from ...tracing import span
+from ..utils._parallel_process import _owned_pool, _parallel_process
 
 LOGGER = logging.getLogger(__name__)
 toa_to_joule = 4 * np.pi * EARTH_RADIUS ** 2 * SECONDS_PER_YEAR
 
+_DEFAULT_CFG = {
+    "efficacy": np.ones(45),
+    "diagnostics": "AR6",
+    "gir_carbon_cycle": True,
+    "temperature_function": "Geoffroy",
+    "aerosol_forcing": "aerocom+ghan2",
+    "fixPre1850RCP": False,
+    "b_tro3": np.array(
+        [1.77871043e-04, 5.80173377e-05, 1.94458719e-04, 2.09151270e-03]
+    ),
+    "tropO3_forcing": "cmip6",
+    "aCO2land": 0.0006394631886297174,
+    "b_aero": np.array([-0.00503, 0.0, 0.0, 0.0, 0.0385, -0.0104, 0.0]),
+    "ghan_params": np.array([1.232, 73.9, 63.0]),
+    "gmst_factor": 1 / 1.04,
+    "ohu_factor": 0.92,
+}
+"""dict: Configuration used for every run unless overridden"""
+
+_SCENARIO_INPUTS = {}
+"""
+dict[tuple[str, str], dict]: Inputs of each (scenario, model) in this process
+
+Set by :func:`_set_scenario_inputs`, which is the initializer of the workers
+started by :func:`run_fair`. :func:`run_fair` also sets it in the calling
+process whilst it runs, as some jobs may be run there.
+"""
+
+_FAIR_OUTPUTS = (
+    "concentrations",
+    "forcing",
+    "temperature",
+    "lambda_eff",
+    "ohc",
+    "heatflux",
+    "airborne_emissions",
+)
+"""tuple[str]: Names of the outputs of :func:`fair.forward.fair_scm`, in order"""
+
+_GASES = (
+    "CO2",
+    "CH4",
+    "N2O",
+    "CF4",
+    "C2F6",
+    "C6F14",
+    "HFC23",
+    "HFC32",
+    "HFC125",
+    "HFC134a",
+    "HFC143a",
+    "HFC227ea",
+    "HFC245fa",
+    "HFC4310mee",
+    "SF6",
+    "CFC11",
+    "CFC12",
+    "CFC113",
+    "CFC114",
+    "CFC115",
+    "CCl4",
+    "CH3CCl3",
+    "HCFC22",
+    "HCFC141b",
+    "HCFC142b",
+    "Halon1211",
+    "Halon1202",
+    "Halon1301",
+    "Halon2402",
+    "CH3Br",
+    "CH3Cl",
+)
+"""tuple[str]: Gases in FaIR's concentrations (and first forcings), in order"""
+
+_FORCINGS = _GASES + (
+    "Tropospheric Ozone",
+    "Stratospheric Ozone",
+    "CH4 Oxidation Stratospheric H2O",
+    "Contrails",
+    "Aerosols|Direct Effect|SOx",
+    "Aerosols|Direct Effect|Secondary Organic Aerosol",
+    "Aerosols|Direct Effect|Nitrate",
+    "Aerosols|Direct Effect|BC",
+    "Aerosols|Direct Effect|OC",
+    "Aerosols|Indirect Effect",
+    "Black Carbon on Snow",
+    "Land-use Change",
+    "Volcanic",
+    "Solar",
+)
+"""tuple[str]: FaIR's forcings, in order"""
+
+_FORCING_AGGREGATES = (
+    ("", slice(None)),
+    ("|Anthropogenic", slice(None, 43)),
+    ("|Greenhouse Gases", slice(None, 31)),
+    # This definition does not include ozone and H2O from CH4 oxidation
+    ("|Kyoto Gases", slice(None, 15)),
+    ("|CO2, CH4 and N2O", slice(None, 3)),
+    # What is the rigorous definition here? CFCs are not included but contain F
+    ("|F-Gases", slice(3, 15)),
+    ("|Montreal Protocol Halogen Gases", slice(15, 31)),
+    ("|Aerosols|Direct Effect", slice(35, 40)),
+    ("|Aerosols", slice(35, 41)),
+    ("|Ozone", slice(31, 33)),
+)
+"""tuple[tuple[str, slice]]: Aggregate forcings and the forcings they sum"""
+
+_CONCENTRATION_UNITS = {"CO2": "ppm", "CH4": "ppb", "N2O": "ppb"}
+
+
+def _get_forcing_weight(index):
+    weight = np.zeros(len(_FORCINGS))
+    weight[index] = 1
+
+    return weight
+
+
+_OUTPUT_VARIABLES = {
+    **{
+        "Atmospheric Concentrations|{}".format(gas): (
+            "concentrations",
+            i,
+            _CONCENTRATION_UNITS.get(gas, "ppt"),
+            None,
+        )
+        for i, gas in enumerate(_GASES)
+    },
+    **{
+        "Effective Radiative Forcing|{}".format(forcing): (
+            "forcing",
+            _get_forcing_weight(i),
+            "W/m**2",
+            None,
+        )
+        for i, forcing in enumerate(_FORCINGS)
+    },
+    **{
+        "Effective Radiative Forcing{}".format(suffix): (
+            "forcing",
+            _get_forcing_weight(index),
+            "W/m**2",
+            None,
+        )
+        for suffix, index in _FORCING_AGGREGATES
+    },
+    "Surface Air Temperature Change": ("temperature", None, "K", None),
+    "Surface Air Ocean Blended Temperature Change": ("temperature", None, "K", "gmst"),
+    "Airborne Fraction": ("airborne_emissions", None, "dimensionless", None),
+    "Effective Climate Feedback": ("lambda_eff", None, "W/m**2/K", None),
+    "Heat Content": ("ohc", None, "J", None),
+    "Heat Content|Ocean": ("ohc", None, "J", "ohu"),
+    "Net Energy Imbalance": ("heatflux", None, "W/m**2", None),
+    "Heat Uptake": ("heatflux", None, "W/m**2", None),
+    "Heat Uptake|Ocean": ("heatflux", None, "W/m**2", "ohu"),
+}
+"""
+dict[str, tuple]: FaIR's output variables
 
-def run_fair(cfgs, output_vars):  # pylint: disable=R0914
+For each variable: the output of :func:`fair.forward.fair_scm` it comes from
+(see ``_FAIR_OUTPUTS``), its index in that output (``None`` if the output has
+one value per timestep) or, for forcings, the weight of each of FaIR's
+forcings in it, its unit and the factor (see :func:`_process_output`), if
+any, by which it is multiplied.
+"""
+
+
+def _set_scenario_inputs(scenario_inputs):
+    _SCENARIO_INPUTS.clear()
+    _SCENARIO_INPUTS.update(scenario_inputs)
+
+
+def run_fair(  # pylint: disable=R0914
+    cfgs, output_vars, scenario_inputs, pool=None, callback=None
+):
     """
     Run FaIR
 
+    Each configuration only holds its scenario, model, run id and the
+    parameters which differ from the defaults. The inputs which are the same
+    for all runs of a scenario (e.g. its emissions) are in
+    ``scenario_inputs``. If FaIR is run in a pool started here, these are
+    sent to each worker once, when it starts. In a provided pool, whose
+    workers may be shared, they are sent with the work items instead (once
+    per chunk as work items of the same scenario share them).
+
     Parameters
     ----------
     cfgs : list[dict]
@@ -29,6 +211,19 @@ def run_fair(cfgs, output_vars):  # pylint: disable=R0914
     output_vars : list[str]
         Variables to output
 
+    scenario_inputs : dict[tuple[str, str], dict]
+        Inputs shared by all runs of each (scenario, model)
+
+    pool : :obj:`concurrent.futures.Executor`
+        Pool in which to run FaIR. If ``None``, a pool with
+        ``FAIR_WORKER_NUMBER`` workers is created (or FaIR is run serially
+        if only one worker is requested).
+
+    callback : function
+        Function to call with the results of each run as soon as they are
+        available. If supplied, results are not collected and ``None`` is
+        returned.
+
     Returns
     -------
     :obj:`ScmRun`
@@ -45,27 +240,91 @@ def run_fair(cfgs, output_vars):  # pylint: disable=R0914
                 updated_config[i][key] = value
         updated_config[i]["output_vars"] = output_vars
 
-    ncpu = int(config.get("FAIR_WORKER_NUMBER", multiprocessing.cpu_count()))
-    LOGGER.info("Running FaIR with %s workers", ncpu)
+    if pool is not None:
+        for cfg in updated_config:
+            cfg["scenario_inputs"] = scenario_inputs[(cfg["scenario"], cfg["model"])]
 
     parallel_process_kwargs = dict(
         func=_single_fair_iteration,
         configuration=updated_config,
         config_are_kwargs=False,
+        callback=callback,
+        cost=functools.partial(_estimate_cost, scenario_inputs=scenario_inputs),
+        chunksize=config.get("FAIR_CHUNKSIZE", "auto"),
+        combine=run_append,
+        name="FaIR run",
     )
-    if ncpu > 1:
-
-        with ProcessPoolExecutor(ncpu) as pool:
-            res = _parallel_process(**parallel_process_kwargs, pool=pool,)
+    if pool is not None:
+        LOGGER.info("Running FaIR in the provided pool")
+        res = _parallel_process(**parallel_process_kwargs, pool=pool)
     else:
-        res = _parallel_process(**parallel_process_kwargs)
+        ncpu = int(config.get("FAIR_WORKER_NUMBER", multiprocessing.cpu_count()))
+        LOGGER.info("Running FaIR with %s workers", ncpu)
+
+        # the first jobs are run in this process (see ``_parallel_process``)
+        # so it needs the scenario inputs too
+        _set_scenario_inputs(scenario_inputs)
+        try:
+            if ncpu > 1:
+                with _owned_pool(
+                    ncpu, initializer=_set_scenario_inputs, initargs=(scenario_inputs,),
+                ) as owned_pool:
+                    res = _parallel_process(**parallel_process_kwargs, pool=owned_pool)
+            else:
+                res = _parallel_process(**parallel_process_kwargs)
+        finally:
+            _set_scenario_inputs({})
+
+    if callback is not None:
+        return None
 
-    res = run_append(res)
+    with span("FaIR: run_append"):
+        res = run_append(res)
 
     return res
 
 
+def _estimate_cost(cfg, scenario_inputs):
+    # runtime scales with the number of timesteps
+    emissions = cfg.get(
+        "emissions", scenario_inputs[(cfg["scenario"], cfg["model"])]["emissions"]
+    )
+    return len(emissions)
+
+
+def _get_full_cfg(cfg):
+    """
+    Get the full configuration of a run
+
+    Parameters
+    ----------
+    cfg : dict
+        Configuration of the run (as made by :func:`run_fair`). If it doesn't
+        include its scenario's inputs (``scenario_inputs``), these are taken
+        from those set in this process by :func:`_set_scenario_inputs`.
+
+    Returns
+    -------
+    dict
+        The defaults, updated with the scenario's inputs and then the run's
+        configuration. This is a new dictionary so ``cfg`` is untouched (and
+        can be re-run) and it has its own copy of the default arrays.
+    """
+    cfg = dict(cfg)
+    scenario_inputs = cfg.pop("scenario_inputs", None)
+    if scenario_inputs is None:
+        scenario_inputs = _SCENARIO_INPUTS[(cfg["scenario"], cfg["model"])]
+
+    # copy the default arrays so a run can't change the next run's inputs
+    defaults = {
+        k: v.copy() if isinstance(v, np.ndarray) else v for k, v in _DEFAULT_CFG.items()
+    }
+
+    return {**defaults, **scenario_inputs, **cfg}
+
+
 def _single_fair_iteration(cfg):  # pylint: disable=R0914
+    cfg = _get_full_cfg(cfg)
     scenario = cfg.pop("scenario")
     model = cfg.pop("model")
     run_id = cfg.pop("run_id")
@@ -75,7 +334,11 @@ def _single_fair_iteration(cfg):  # pylint: disable=R0914
     startyear = cfg.pop("startyear")
     output_vars = cfg.pop("output_vars")
 
-    data, unit, nt = _process_output(fair_scm(**cfg), output_vars, factors)
+    with span("FaIR: fair_scm"):
+        fair_out = fair_scm(**cfg)
+
+    with span("FaIR: process output"):
+        data, unit, nt = _process_output(fair_out, output_vars, factors)
 
     data_scmrun = []
     variables = []
@@ -101,10 +364,32 @@ def _single_fair_iteration(cfg):  # pylint: disable=R0914
     return tempres
 
 
-def _process_output(fair_output, output_vars, factors):  # pylint: disable=R0915
+@functools.lru_cache()
+def _get_forcing_weights(variables):
+    """
+    Get the weights of each of FaIR's forcings in forcing output variables
+
+    Parameters
+    ----------
+    variables : tuple[str]
+        Forcing output variables
+
+    Returns
+    -------
+    np.ndarray
+        (45, len(``variables``)) array of weights
+    """
+    return np.stack([_OUTPUT_VARIABLES[v][1] for v in variables], axis=-1)
+
+
+def _process_output(fair_output, output_vars, factors):
     """
     Make sense of FaIR1.6 output
 
+    Only the requested variables are computed. All the forcing variables
+    are computed with a single matrix product of FaIR's forcings and their
+    weights (see ``_OUTPUT_VARIABLES``).
+
     Parameters
     ----------
     fair_output : tuple
@@ -112,7 +397,7 @@ def _process_output(fair_output, output_vars, factors):  # pylint: disable=R0915
             c : np.ndarray
                 (nt, 31) array of greenhouse gas concentrations
             f : np.ndarray
-                (nt, 41) array of effective radiative forcings
+                (nt, 45) array of effective radiative forcings
             t : np.ndarray
                 (nt,) array of temperature
             lambda_eff: np.ndarray
@@ -140,234 +425,39 @@ def _process_output(fair_output, output_vars, factors):  # pylint: disable=R0915
     nt : int
         number of timesteps modelled
     """
-    (
-        concentrations,
-        forcing,
-        temperature,
-        lambda_eff,
-        ohc,
-        heatflux,
-        airborne_emissions,
-    ) = fair_output
+    outputs = dict(zip(_FAIR_OUTPUTS, fair_output))
 
     data = {}
     unit = {}
-
-    data["Atmospheric Concentrations|CO2"] = concentrations[:, 0]
-    data["Atmospheric Concentrations|CH4"] = concentrations[:, 1]
-    data["Atmospheric Concentrations|N2O"] = concentrations[:, 2]
-    data["Atmospheric Concentrations|CF4"] = concentrations[:, 3]
-    data["Atmospheric Concentrations|C2F6"] = concentrations[:, 4]
-    data["Atmospheric Concentrations|C6F14"] = concentrations[:, 5]
-    data["Atmospheric Concentrations|HFC23"] = concentrations[:, 6]
-    data["Atmospheric Concentrations|HFC32"] = concentrations[:, 7]
-    data["Atmospheric Concentrations|HFC125"] = concentrations[:, 8]
-    data["Atmospheric Concentrations|HFC134a"] = concentrations[:, 9]
-    data["Atmospheric Concentrations|HFC143a"] = concentrations[:, 10]
-    data["Atmospheric Concentrations|HFC227ea"] = concentrations[:, 11]
-    data["Atmospheric Concentrations|HFC245fa"] = concentrations[:, 12]
-    data["Atmospheric Concentrations|HFC4310mee"] = concentrations[:, 13]
-    data["Atmospheric Concentrations|SF6"] = concentrations[:, 14]
-    data["Atmospheric Concentrations|CFC11"] = concentrations[:, 15]
-    data["Atmospheric Concentrations|CFC12"] = concentrations[:, 16]
-    data["Atmospheric Concentrations|CFC113"] = concentrations[:, 17]
-    data["Atmospheric Concentrations|CFC114"] = concentrations[:, 18]
-    data["Atmospheric Concentrations|CFC115"] = concentrations[:, 19]
-    data["Atmospheric Concentrations|CCl4"] = concentrations[:, 20]
-    data["Atmospheric Concentrations|CH3CCl3"] = concentrations[:, 21]
-    data["Atmospheric Concentrations|HCFC22"] = concentrations[:, 22]
-    data["Atmospheric Concentrations|HCFC141b"] = concentrations[:, 23]
-    data["Atmospheric Concentrations|HCFC142b"] = concentrations[:, 24]
-    data["Atmospheric Concentrations|Halon1211"] = concentrations[:, 25]
-    data["Atmospheric Concentrations|Halon1202"] = concentrations[:, 26]
-    data["Atmospheric Concentrations|Halon1301"] = concentrations[:, 27]
-    data["Atmospheric Concentrations|Halon2402"] = concentrations[:, 28]
-    data["Atmospheric Concentrations|CH3Br"] = concentrations[:, 29]
-    data["Atmospheric Concentrations|CH3Cl"] = concentrations[:, 30]
-    data["Effective Radiative Forcing|CO2"] = forcing[:, 0]
-    data["Effective Radiative Forcing|CH4"] = forcing[:, 1]
-    data["Effective Radiative Forcing|N2O"] = forcing[:, 2]
-    data["Effective Radiative Forcing|CF4"] = forcing[:, 3]
-    data["Effective Radiative Forcing|C2F6"] = forcing[:, 4]
-    data["Effective Radiative Forcing|C6F14"] = forcing[:, 5]
-    data["Effective Radiative Forcing|HFC23"] = forcing[:, 6]
-    data["Effective Radiative Forcing|HFC32"] = forcing[:, 7]
-    data["Effective Radiative Forcing|HFC125"] = forcing[:, 8]
-    data["Effective Radiative Forcing|HFC134a"] = forcing[:, 9]
-    data["Effective Radiative Forcing|HFC143a"] = forcing[:, 10]
-    data["Effective Radiative Forcing|HFC227ea"] = forcing[:, 11]
-    data["Effective Radiative Forcing|HFC245fa"] = forcing[:, 12]
-    data["Effective Radiative Forcing|HFC4310mee"] = forcing[:, 13]
-    data["Effective Radiative Forcing|SF6"] = forcing[:, 14]
-    data["Effective Radiative Forcing|CFC11"] = forcing[:, 15]
-    data["Effective Radiative Forcing|CFC12"] = forcing[:, 16]
-    data["Effective Radiative Forcing|CFC113"] = forcing[:, 17]
-    data["Effective Radiative Forcing|CFC114"] = forcing[:, 18]
-    data["Effective Radiative Forcing|CFC115"] = forcing[:, 19]
-    data["Effective Radiative Forcing|CCl4"] = forcing[:, 20]
-    data["Effective Radiative Forcing|CH3CCl3"] = forcing[:, 21]
-    data["Effective Radiative Forcing|HCFC22"] = forcing[:, 22]
-    data["Effective Radiative Forcing|HCFC141b"] = forcing[:, 23]
-    data["Effective Radiative Forcing|HCFC142b"] = forcing[:, 24]
-    data["Effective Radiative Forcing|Halon1211"] = forcing[:, 25]
-    data["Effective Radiative Forcing|Halon1202"] = forcing[:, 26]
-    data["Effective Radiative Forcing|Halon1301"] = forcing[:, 27]
-    data["Effective Radiative Forcing|Halon2402"] = forcing[:, 28]
-    data["Effective Radiative Forcing|CH3Br"] = forcing[:, 29]
-    data["Effective Radiative Forcing|CH3Cl"] = forcing[:, 30]
-    data["Effective Radiative Forcing|Tropospheric Ozone"] = forcing[:, 31]
-    data["Effective Radiative Forcing|Stratospheric Ozone"] = forcing[:, 32]
-    data["Effective Radiative Forcing|CH4 Oxidation Stratospheric H2O"] = forcing[:, 33]
-    data["Effective Radiative Forcing|Contrails"] = forcing[:, 34]
-    data["Effective Radiative Forcing|Aerosols|Direct Effect|SOx"] = forcing[:, 35]
-    data[
-        "Effective Radiative Forcing|Aerosols|Direct Effect|Secondary Organic Aerosol"
-    ] = forcing[:, 36]
-    data["Effective Radiative Forcing|Aerosols|Direct Effect|Nitrate"] = forcing[:, 37]
-    data["Effective Radiative Forcing|Aerosols|Direct Effect|BC"] = forcing[:, 38]
-    data["Effective Radiative Forcing|Aerosols|Direct Effect|OC"] = forcing[:, 39]
-    data["Effective Radiative Forcing|Aerosols|Indirect Effect"] = forcing[:, 40]
-    data["Effective Radiative Forcing|Black Carbon on Snow"] = forcing[:, 41]
-    data["Effective Radiative Forcing|Land-use Change"] = forcing[:, 42]
-    data["Effective Radiative Forcing|Volcanic"] = forcing[:, 43]
-    data["Effective Radiative Forcing|Solar"] = forcing[:, 44]
-    data["Effective Radiative Forcing"] = np.sum(forcing, axis=1)
-    data["Effective Radiative Forcing|Anthropogenic"] = np.sum(forcing[:, :43], axis=1)
-    data["Effective Radiative Forcing|Greenhouse Gases"] = np.sum(
-        forcing[:, :31], axis=1
-    )
-    # This definition does not include ozone and H2O from CH4 oxidation
-    data["Effective Radiative Forcing|Kyoto Gases"] = np.sum(forcing[:, :15], axis=1)
-    data["Effective Radiative Forcing|CO2, CH4 and N2O"] = np.sum(
-        forcing[:, :3], axis=1
-    )
-    # What is the rigorous definition here? CFCs are not included but contain F
-    data["Effective Radiative Forcing|F-Gases"] = np.sum(forcing[:, 3:15], axis=1)
-    data["Effective Radiative Forcing|Montreal Protocol Halogen Gases"] = np.sum(
-        forcing[:, 15:31], axis=1
-    )
-    data["Effective Radiative Forcing|Aerosols|Direct Effect"] = np.sum(
-        forcing[:, 35:40], axis=1
-    )
-    data["Effective Radiative Forcing|Aerosols"] = np.sum(forcing[:, 35:41], axis=1)
-    data["Effective Radiative Forcing|Ozone"] = np.sum(forcing[:, 31:33], axis=1)
-    data["Surface Air Temperature Change"] = temperature
-    data["Surface Air Ocean Blended Temperature Change"] = temperature * factors["gmst"]
-    data["Airborne Fraction"] = airborne_emissions
-    data["Effective Climate Feedback"] = lambda_eff
-    data["Heat Content"] = ohc
-    data["Heat Content|Ocean"] = ohc * factors["ohu"]
-    data["Net Energy Imbalance"] = heatflux
-    data["Heat Uptake"] = heatflux
-    data["Heat Uptake|Ocean"] = heatflux * factors["ohu"]
-
-    unit["Atmospheric Concentrations|CO2"] = "ppm"
-    unit["Atmospheric Concentrations|CH4"] = "ppb"
-    unit["Atmospheric Concentrations|N2O"] = "ppb"
-    unit["Atmospheric Concentrations|CF4"] = "ppt"
-    unit["Atmospheric Concentrations|C2F6"] = "ppt"
-    unit["Atmospheric Concentrations|C6F14"] = "ppt"
-    unit["Atmospheric Concentrations|HFC23"] = "ppt"
-    unit["Atmospheric Concentrations|HFC32"] = "ppt"
-    unit["Atmospheric Concentrations|HFC125"] = "ppt"
-    unit["Atmospheric Concentrations|HFC134a"] = "ppt"
-    unit["Atmospheric Concentrations|HFC143a"] = "ppt"
-    unit["Atmospheric Concentrations|HFC227ea"] = "ppt"
-    unit["Atmospheric Concentrations|HFC245fa"] = "ppt"
-    unit["Atmospheric Concentrations|HFC4310mee"] = "ppt"
-    unit["Atmospheric Concentrations|SF6"] = "ppt"
-    unit["Atmospheric Concentrations|CFC11"] = "ppt"
-    unit["Atmospheric Concentrations|CFC12"] = "ppt"
-    unit["Atmospheric Concentrations|CFC113"] = "ppt"
-    unit["Atmospheric Concentrations|CFC114"] = "ppt"
-    unit["Atmospheric Concentrations|CFC115"] = "ppt"
-    unit["Atmospheric Concentrations|CCl4"] = "ppt"
-    unit["Atmospheric Concentrations|CH3CCl3"] = "ppt"
-    unit["Atmospheric Concentrations|HCFC22"] = "ppt"
-    unit["Atmospheric Concentrations|HCFC141b"] = "ppt"
-    unit["Atmospheric Concentrations|HCFC142b"] = "ppt"
-    unit["Atmospheric Concentrations|Halon1211"] = "ppt"
-    unit["Atmospheric Concentrations|Halon1202"] = "ppt"
-    unit["Atmospheric Concentrations|Halon1301"] = "ppt"
-    unit["Atmospheric Concentrations|Halon2402"] = "ppt"
-    unit["Atmospheric Concentrations|CH3Br"] = "ppt"
-    unit["Atmospheric Concentrations|CH3Cl"] = "ppt"
-    unit["Effective Radiative Forcing|CO2"] = "W/m**2"
-    unit["Effective Radiative Forcing|CH4"] = "W/m**2"
-    unit["Effective Radiative Forcing|N2O"] = "W/m**2"
-    unit["Effective Radiative Forcing|CF4"] = "W/m**2"
-    unit["Effective Radiative Forcing|C2F6"] = "W/m**2"
-    unit["Effective Radiative Forcing|C6F14"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC23"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC32"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC125"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC134a"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC143a"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC227ea"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC245fa"] = "W/m**2"
-    unit["Effective Radiative Forcing|HFC4310mee"] = "W/m**2"
-    unit["Effective Radiative Forcing|SF6"] = "W/m**2"
-    unit["Effective Radiative Forcing|CFC11"] = "W/m**2"
-    unit["Effective Radiative Forcing|CFC12"] = "W/m**2"
-    unit["Effective Radiative Forcing|CFC113"] = "W/m**2"
-    unit["Effective Radiative Forcing|CFC114"] = "W/m**2"
-    unit["Effective Radiative Forcing|CFC115"] = "W/m**2"
-    unit["Effective Radiative Forcing|CCl4"] = "W/m**2"
-    unit["Effective Radiative Forcing|CH3CCl3"] = "W/m**2"
-    unit["Effective Radiative Forcing|HCFC22"] = "W/m**2"
-    unit["Effective Radiative Forcing|HCFC141b"] = "W/m**2"
-    unit["Effective Radiative Forcing|HCFC142b"] = "W/m**2"
-    unit["Effective Radiative Forcing|Halon1211"] = "W/m**2"
-    unit["Effective Radiative Forcing|Halon1202"] = "W/m**2"
-    unit["Effective Radiative Forcing|Halon1301"] = "W/m**2"
-    unit["Effective Radiative Forcing|Halon2402"] = "W/m**2"
-    unit["Effective Radiative Forcing|CH3Br"] = "W/m**2"
-    unit["Effective Radiative Forcing|CH3Cl"] = "W/m**2"
-    unit["Effective Radiative Forcing|Tropospheric Ozone"] = "W/m**2"
-    unit["Effective Radiative Forcing|Stratospheric Ozone"] = "W/m**2"
-    unit["Effective Radiative Forcing|CH4 Oxidation Stratospheric H2O"] = "W/m**2"
-    unit["Effective Radiative Forcing|Contrails"] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols|Direct Effect|SOx"] = "W/m**2"
-    unit[
-        "Effective Radiative Forcing|Aerosols|Direct Effect|Secondary Organic Aerosol"
-    ] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols|Direct Effect|Nitrate"] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols|Direct Effect|BC"] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols|Direct Effect|OC"] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols|Indirect Effect"] = "W/m**2"
-    unit["Effective Radiative Forcing|Black Carbon on Snow"] = "W/m**2"
-    unit["Effective Radiative Forcing|Land-use Change"] = "W/m**2"
-    unit["Effective Radiative Forcing|Volcanic"] = "W/m**2"
-    unit["Effective Radiative Forcing|Solar"] = "W/m**2"
-    unit["Effective Radiative Forcing"] = "W/m**2"
-    unit["Effective Radiative Forcing|Anthropogenic"] = "W/m**2"
-    unit["Effective Radiative Forcing|Greenhouse Gases"] = "W/m**2"
-    unit["Effective Radiative Forcing|Kyoto Gases"] = "W/m**2"
-    unit["Effective Radiative Forcing|CO2, CH4 and N2O"] = "W/m**2"
-    unit["Effective Radiative Forcing|F-Gases"] = "W/m**2"
-    unit["Effective Radiative Forcing|Montreal Protocol Halogen Gases"] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols|Direct Effect"] = "W/m**2"
-    unit["Effective Radiative Forcing|Aerosols"] = "W/m**2"
-    unit["Effective Radiative Forcing|Ozone"] = "W/m**2"
-    unit["Surface Air Temperature Change"] = "K"
-    unit["Surface Air Ocean Blended Temperature Change"] = "K"
-    unit["Airborne Fraction"] = "dimensionless"
-    unit["Effective Climate Feedback"] = "W/m**2/K"
-    unit["Heat Content"] = "J"
-    unit["Heat Content|Ocean"] = "J"
-    unit["Net Energy Imbalance"] = "W/m**2"
-    unit["Heat Uptake"] = "W/m**2"
-    unit["Heat Uptake|Ocean"] = "W/m**2"
-
-    nt = len(temperature)
-
-    out = ({}, {}, nt)
+    forcing_vars = []
     for key in output_vars:
-        if key not in data:
+        if key not in _OUTPUT_VARIABLES:
             LOGGER.warning("%s not available from FaIR", key)
             continue
 
-        out[0][key] = data[key]
-        out[1][key] = unit[key]
+        source, index, unit[key], factor = _OUTPUT_VARIABLES[key]
+        if source == "forcing":
+            # filled below, here so the output is in the requested order
+            data[key] = None
+            forcing_vars.append(key)
+            continue
+
+        values = outputs[source]
+        if index is not None:
+            values = values[:, index]
+
+        if factor is not None:
+            values = values * factors[factor]
+
+        data[key] = values
+
+    if forcing_vars:
+        forcing_vars = tuple(forcing_vars)
+        # (time, variable)
+        forcing = np.tensordot(
+            outputs["forcing"], _get_forcing_weights(forcing_vars), axes=([1], [0])
+        )
+        for i, key in enumerate(forcing_vars):
+            data[key] = forcing[:, i]
 
-    return out
+    return data, unit, len(outputs["temperature"])
@@ -2,9 +2,11 @@
 Conversion of :obj:`scmdata.ScmRun` into FaIR emissions :obj:`np.ndarray`.
 """
 import datetime as dt
+import functools
 import os
 
 import numpy as np
+import openscm_units
 import pandas as pd
 from scmdata import ScmRun
 
@@ -125,7 +127,10 @@ EMISSIONS_SPECIES_UNITS_CONTEXT = pd.DataFrame(
     columns=["species", "in_unit", "context"],
 )
 
+_FAIR_SPECIES = frozenset(EMISSIONS_SPECIES_UNITS_CONTEXT["species"])
 
+
+@functools.lru_cache(maxsize=None)
 def _get_fair_col_unit_context(variable):
     row = EMISSIONS_SPECIES_UNITS_CONTEXT["species"].apply(
         lambda x: variable.endswith(x)  # pylint: disable=W0108
@@ -141,36 +146,38 @@ def _get_fair_col_unit_context(variable):
     return fair_col, in_unit, context
 
 
-def scmdf_to_emissions(
-    scmrun, startyear=1750, endyear=2100, scen_startyear=2015
-):  # pylint: disable=R0914
-    """
-    Convert an :obj:`scmdata.ScmRun` into a FaIR emissions :obj:`np.ndarray`
+@functools.lru_cache()
+def _unit_conv_factor(unit, fair_unit, context):
+    if unit == fair_unit:
+        return 1.0
 
-    Interpolates linearly if required and fills in montreal gases based on ssp245.
-    between non-consecutive years in the SCEN file. Fills in Montreal gases
-    from SSP2-4.5.
+    if context is None:
+        return openscm_units.unit_registry(unit).to(fair_unit).magnitude
+
+    with openscm_units.unit_registry.context(context):
+        return openscm_units.unit_registry(unit).to(fair_unit).magnitude
+
+
+@functools.lru_cache()
+def _get_history(startyear, scen_startyear, endyear):
+    """
+    Get FaIR emissions for species which aren't in a scenario
 
     Parameters
     ----------
-    scmrun : :obj:`ScmRun`
-        :obj:`ScmRun` instance to convert to FaIR emissions array.
     startyear : int
         First year of output array to produce.
+    scen_startyear : int
+        First year of the future scenario.
     endyear : int
         Last year of output array to produce.
-    scen_startyear : int
-        First year of the future scenario corresponding to :obj:`ScmRun`.
 
     Returns
     -------
     np.ndarray
-        FaIR emissions array of size (nt, 40).
-
-    Raises
-    ------
-    AssertionError
-        If there is more than one model-scenario pair in the provided :obj:`ScmRun`.
+        (nt, 40) array of historical emissions up to ``scen_startyear`` and
+        SSP2-4.5 emissions from then on. It is shared by every caller so
+        can't be written to.
     """
     n_cols = 40
     nt = endyear - startyear + 1
@@ -178,18 +185,8 @@ def scmdf_to_emissions(
     data_out = np.ones((nt, n_cols)) * np.nan
     data_out[:, 0] = np.arange(startyear, endyear + 1)
 
-    if scmrun.meta[["model", "scenario"]].drop_duplicates().shape[0] != 1:
-        raise AssertionError("Should only have one model-scenario pair")
-
-    scmrun = scmrun.interpolate(
-        [dt.datetime(y, 1, 1) for y in range(scen_startyear, endyear + 1)]
-    )
+    first_scen_row = int(scen_startyear - startyear)
 
-    years = scmrun["year"].values
-    first_scenyear = years[0]
-    first_scen_row = int(first_scenyear - startyear)
-
-    # if correct units and interpolation were guaranteed we could do this for scenario too which is quicker
     hist_df = historical_world_emms_holder.values_fair_units.filter(
         year=range(startyear, scen_startyear)
     ).timeseries()
@@ -210,25 +207,117 @@ def scmdf_to_emissions(
         )
         data_out[first_scen_row:, fair_col] = future_df[future_df_row].values.squeeze()
 
-    for var_df in scmrun.groupby("variable"):
-        variable = var_df.get_unique_meta("variable", no_duplicates=True)
+    data_out.flags.writeable = False
+
+    return data_out
+
+
+def scmdf_to_emissions_cube(
+    scmrun, startyear=1750, endyear=2100, scen_startyear=2015
+):  # pylint: disable=R0914
+    """
+    Convert an :obj:`scmdata.ScmRun` of many scenarios into FaIR emissions
+
+    Gives the same emissions as calling :func:`scmdf_to_emissions` for each
+    model-scenario pair but all the scenarios are interpolated, converted to
+    FaIR's units and written into a single array at once.
+
+    Parameters
+    ----------
+    scmrun : :obj:`ScmRun`
+        :obj:`ScmRun` instance to convert to FaIR emissions.
+    startyear : int
+        First year of output array to produce.
+    endyear : int
+        Last year of output array to produce.
+    scen_startyear : int
+        First year of the future scenarios corresponding to :obj:`ScmRun`.
 
+    Returns
+    -------
+    list[tuple[str, str]]
+        Sorted (scenario, model) of each entry along the first axis of the
+        emissions
+
+    np.ndarray
+        FaIR emissions array of size (n_scenarios, nt, 40).
+    """
+    scmrun = scmrun.interpolate(
+        [dt.datetime(y, 1, 1) for y in range(scen_startyear, endyear + 1)]
+    )
+    timeseries = scmrun.timeseries()
+    meta = {
+        name: timeseries.index.get_level_values(name)
+        for name in ("scenario", "model", "variable", "unit")
+    }
+
+    scenario_models = list(zip(meta["scenario"], meta["model"]))
+    scenarios = sorted(set(scenario_models))
+    scenario_idx = {scenario: i for i, scenario in enumerate(scenarios)}
+
+    history = _get_history(startyear, scen_startyear, endyear)
+    emissions = np.repeat(history[np.newaxis, :, :], len(scenarios), axis=0)
+
+    rows = []
+    cols = []
+    factors = []
+    for i, (variable, unit) in enumerate(zip(meta["variable"], meta["unit"])):
         # Skip aggregate emissions and emissons not handled by FaIR
-        if (
-            variable.split("Emissions")[1]
-            not in EMISSIONS_SPECIES_UNITS_CONTEXT.species.values
-        ):
+        if variable.split("Emissions")[1] not in _FAIR_SPECIES:
             continue
 
-        in_unit = var_df.get_unique_meta("unit", no_duplicates=True)
-
         fair_col, fair_unit, context = _get_fair_col_unit_context(variable)
+        rows.append(i)
+        cols.append(fair_col)
+        factors.append(_unit_conv_factor(unit, fair_unit, context))
 
-        if in_unit != fair_unit:
-            var_df_fair_unit = var_df.convert_unit(fair_unit, context=context)
-        else:
-            var_df_fair_unit = var_df
+    if rows:
+        first_scen_row = int(scen_startyear - startyear)
+        emissions[
+            np.array([scenario_idx[scenario_models[i]] for i in rows])[:, np.newaxis],
+            np.arange(first_scen_row, history.shape[0])[np.newaxis, :],
+            np.array(cols)[:, np.newaxis],
+        ] = (timeseries.values[rows] * np.array(factors)[:, np.newaxis])
 
-        data_out[first_scen_row:, fair_col] = var_df_fair_unit.values.squeeze()
+    return scenarios, emissions
 
-    return data_out
+
+def scmdf_to_emissions(
+    scmrun, startyear=1750, endyear=2100, scen_startyear=2015
+):  # pylint: disable=R0914
+    """
+    Convert an :obj:`scmdata.ScmRun` into a FaIR emissions :obj:`np.ndarray`
+
+    Interpolates linearly if required and fills in montreal gases based on ssp245.
+    between non-consecutive years in the SCEN file. Fills in Montreal gases
+    from SSP2-4.5.
+
+    Parameters
+    ----------
+    scmrun : :obj:`ScmRun`
+        :obj:`ScmRun` instance to convert to FaIR emissions array.
+    startyear : int
+        First year of output array to produce.
+    endyear : int
+        Last year of output array to produce.
+    scen_startyear : int
+        First year of the future scenario corresponding to :obj:`ScmRun`.
+
+    Returns
+    -------
+    np.ndarray
+        FaIR emissions array of size (nt, 40).
+
+    Raises
+    ------
+    AssertionError
+        If there is more than one model-scenario pair in the provided :obj:`ScmRun`.
+    """
+    if scmrun.meta[["model", "scenario"]].drop_duplicates().shape[0] != 1:
+        raise AssertionError("Should only have one model-scenario pair")
+
+    _, emissions = scmdf_to_emissions_cube(
+        scmrun, startyear=startyear, endyear=endyear, scen_startyear=scen_startyear
+    )
+
+    return emissions[0]
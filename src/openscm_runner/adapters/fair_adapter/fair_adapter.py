@@ -5,14 +5,14 @@ import functools
 import os
 
 import fair
-import numpy as np
 import pandas as pd
 from scmdata import ScmRun
 
 from ...progress import progress
+from ...tracing import span
 from ..base import _Adapter
 from ._run_fair import run_fair
-from ._scmdf_to_emissions import scmdf_to_emissions
+from ._scmdf_to_emissions import scmdf_to_emissions_cube
 
 
 @functools.lru_cache()
@@ -44,79 +44,93 @@ class FAIR(_Adapter):
     def _init_model(self, *args, **kwargs):
         pass
 
-    def _run(self, scenarios, cfgs, output_variables, output_config):
+    def _run(  # pylint:disable=too-many-arguments
+        self, scenarios, cfgs, output_variables, output_config, pool=None, sink=None
+    ):
         if output_config is not None:
             raise NotImplementedError("`output_config` not implemented for FaIR")
 
-        fair_df = ScmRun(scenarios.timeseries())
-        full_cfgs = self._make_full_cfgs(fair_df, cfgs)
+        with span("FaIR: convert scenarios"):
+            fair_df = ScmRun(scenarios.timeseries())
 
-        res = run_fair(full_cfgs, output_variables)
-        res["climate_model"] = "FaIRv{}".format(self.get_version())
+        full_cfgs, scenario_inputs = self._make_full_cfgs(fair_df, cfgs)
 
-        return res
+        climate_model = "FaIRv{}".format(self.get_version())
+
+        def _set_climate_model(res):
+            res["climate_model"] = climate_model
+            return res
+
+        if sink is not None:
+            run_fair(
+                full_cfgs,
+                output_variables,
+                scenario_inputs,
+                pool=pool,
+                callback=lambda res: sink.write(_set_climate_model(res)),
+            )
+            return None
+
+        res = run_fair(full_cfgs, output_variables, scenario_inputs, pool=pool)
+
+        return _set_climate_model(res)
 
     def _make_full_cfgs(self, scenarios, cfgs):  # pylint: disable=R0201,R0914
         full_cfgs = []
+        scenario_inputs = {}
         run_id_block = 0
+        _check_no_restarts(cfgs)
         startyear = _check_startyear(cfgs)
 
-        for (scenario, model), smdf in progress(
-            scenarios.timeseries().groupby(["scenario", "model"]),
-            desc="Creating FaIR emissions inputs",
-        ):
-            smdf_in = ScmRun(smdf)
-            scen_startyear = smdf_in.time_points.years()[0]
-            endyear = smdf_in.time_points.years()[-1]
+        # every scenario has the same time points
+        years = scenarios.time_points.years()
+        scen_startyear = years[0]
+        endyear = years[-1]
 
-            if startyear < 1750:
-                raise ValueError(
-                    "startyear must be 1750 or later (%d specified)" % startyear
-                )
-            if endyear > 2500:
-                raise ValueError(
-                    "endyear must be 2500 or earlier (%d implied by scenario data)"
-                    % endyear
-                )
-            emissions = scmdf_to_emissions(
-                smdf_in,
+        if startyear < 1750:
+            raise ValueError(
+                "startyear must be 1750 or later (%d specified)" % startyear
+            )
+        if endyear > 2500:
+            raise ValueError(
+                "endyear must be 2500 or earlier (%d implied by scenario data)"
+                % endyear
+            )
+        with span("FaIR: scmdf_to_emissions"):
+            scenario_models, emissions = scmdf_to_emissions_cube(
+                scenarios,
                 startyear=startyear,
                 scen_startyear=scen_startyear,
                 endyear=endyear,
             )
-            nt = emissions.shape[0]
+        nt = emissions.shape[1]
 
-            natural_components = _get_natural_emissions_and_forcing(startyear, nt)
-            ch4_n2o = natural_components["ch4_n2o"]
-            solar_forcing = natural_components["solar_forcing"]
-            volcanic_forcing = natural_components["volcanic_forcing"]
+        natural_components = _get_natural_emissions_and_forcing(startyear, nt)
+        ch4_n2o = natural_components["ch4_n2o"]
+        solar_forcing = natural_components["solar_forcing"]
+        volcanic_forcing = natural_components["volcanic_forcing"]
 
+        for (scenario, model), scenario_emissions in progress(
+            zip(scenario_models, emissions),
+            total=len(scenario_models),
+            desc="Creating FaIR inputs",
+        ):
+            # shared by all of the scenario's runs so only sent to each worker
+            # once (see ``run_fair``)
+            scenario_inputs[(scenario, model)] = {
+                "emissions": scenario_emissions,
+                "natural": ch4_n2o,
+                "F_volcanic": volcanic_forcing,
+                "F_solar": solar_forcing,
+                "startyear": startyear,
+            }
             scenario_cfg = [
                 {
                     "scenario": scenario,
                     "model": model,
                     "run_id": run_id_block + i,
-                    "emissions": emissions,
-                    "natural": ch4_n2o,
-                    "F_volcanic": volcanic_forcing,
-                    "F_solar": solar_forcing,
-                    "efficacy": np.ones(45),
-                    "diagnostics": "AR6",
-                    "gir_carbon_cycle": True,
-                    "temperature_function": "Geoffroy",
-                    "aerosol_forcing": "aerocom+ghan2",
-                    "fixPre1850RCP": False,
-                    "b_tro3": np.array(
-                        [1.77871043e-04, 5.80173377e-05, 1.94458719e-04, 2.09151270e-03]
-                    ),
-                    "tropO3_forcing": "cmip6",
-                    "aCO2land": 0.0006394631886297174,
-                    "b_aero": np.array([-0.00503, 0.0, 0.0, 0.0, 0.0385, -0.0104, 0.0]),
-                    "ghan_params": np.array([1.232, 73.9, 63.0]),
-                    "gmst_factor": 1 / 1.04,
-                    "ohu_factor": 0.92,
-                    "startyear": startyear,
-                    **cfg,
+                    # the start year is a scenario input
+                    **{k: v for k, v in cfg.items() if k != "startyear"},
                 }
                 for i, cfg in enumerate(cfgs)
             ]
@@ -124,7 +138,7 @@ class FAIR(_Adapter):
 
             full_cfgs += scenario_cfg
 
-        return full_cfgs
+        return full_cfgs, scenario_inputs
 
     @staticmethod
     def get_version():
@@ -138,6 +152,29 @@ class FAIR(_Adapter):
         return fair.__version__
 
 
+def _check_no_restarts(cfgs):
+    """
+    Check that no config asks FaIR to start from, or output, a restart
+
+    FaIR 1.6's restarts can't be used with the GIR carbon cycle (which this
+    adapter uses) and only carry the state of the CO2 cycle and the
+    temperature response, so runs can't be split into (e.g. a shared
+    historical and a scenario) parts without changing their output.
+
+    Raises
+    ------
+    ValueError
+        if any config sets ``restart_in`` or ``restart_out``
+    """
+    for cfg in cfgs:
+        for key in ("restart_in", "restart_out"):
+            if cfg.get(key, False) is not False:
+                raise ValueError(
+                    "FaIR restarts (`{}`) are not supported by the FaIR "
+                    "adapter".format(key)
+                )
+
+
 def _check_startyear(cfgs):
     """
     Check to see that at most one startyear is defined in the config
@@ -151,10 +188,10 @@ def _check_startyear(cfgs):
     ValueError
         if more that one startyear is defined
     """
-    first_startyear = cfgs[0].pop("startyear", 1750)
+    first_startyear = cfgs[0].get("startyear", 1750)
     if len(cfgs) > 1:
         for cfg in cfgs[1:]:
-            this_startyear = cfg.pop("startyear", 1750)
+            this_startyear = cfg.get("startyear", 1750)
             if this_startyear != first_startyear:
                 raise ValueError("Can only handle one startyear per scenario ensemble")
 
@@ -5,6 +5,7 @@ import logging
 import multiprocessing
 import shutil
 import tempfile
+import threading
 
 import pymagicc
 
@@ -20,8 +21,8 @@ class _MagiccInstances:
 
         Parameters
         ----------
-        existing_instances : :obj:`multiprocessing.managers.DictProxy`
-            Dictionary which can store new/existing instances across parallel processes
+        existing_instances : dict
+            Dictionary in which to store new/existing instances
         """
         self.instances = existing_instances
 
@@ -51,7 +52,9 @@ class _MagiccInstances:
 
     @staticmethod
     def _get_key():
-        return multiprocessing.current_process().name
+        # threads in the same process (e.g. when running in a thread pool or
+        # on a multi-threaded dask worker) must not share an instance either
+        return multiprocessing.current_process().name, threading.get_ident()
 
     @staticmethod
     def _generate_magicc_root(root_dir):
@@ -62,8 +65,8 @@ class _MagiccInstances:
         Get a MAGICC object which is ready to run (always uses ``strict=False``)
 
         This caches the magicc instance used to minimise overhead from copying files.
-        Each process gets a unique copy of MAGICC to ensure that each process has
-        exclusive access to the magicc instance.
+        Each thread of each process gets a unique copy of MAGICC to ensure that
+        it has exclusive access to the magicc instance.
 
         Parameters
         ----------
@@ -3,7 +3,10 @@ Module for running MAGICC in parallel
 """
 import logging
 import multiprocessing
+import multiprocessing.util
+import os
 import os.path
+import shutil
 from concurrent.futures import ProcessPoolExecutor
 from subprocess import CalledProcessError  # nosec
 
@@ -12,11 +15,39 @@ import pymagicc
 import scmdata
 
 from ...settings import config
-from ..utils._parallel_process import _parallel_process
+from ...tracing import span
+from ..utils._combine import _run_append_successful
+from ..utils._parallel_process import _parallel_process, _shutdown_pool
 from ._magicc_instances import _MagiccInstances
 
 LOGGER = logging.getLogger(__name__)
 
+_DEFAULT_STARTYEAR = 1750
+"""int: MAGICC's start year if not specified in the config"""
+
+_DEFAULT_ENDYEAR = 2100
+"""int: MAGICC's end year if not specified in the config"""
+
+_WORKER_INSTANCES = None
+"""
+:obj:`_MagiccInstances`: MAGICC instances of this process
+
+These are kept for the lifetime of the process so that a pool which is
+re-used across runs does not have to create a new copy of MAGICC each time.
+"""
+
+_WORKER_INSTANCES_PID = None
+"""int: ID of the process which created ``_WORKER_INSTANCES``"""
+
+_CREATED_ROOTS = None
+"""
+list: Shared list to which workers of an adapter-owned pool add the root
+directory of each copy of MAGICC they create
+
+The parent removes any of these which are left once the pool is shut down
+(e.g. because a worker crashed before it could remove its copies).
+"""
+
 
 def _inject_pymagicc_compatible_magcfg_user(magicc):
     """
@@ -37,26 +68,74 @@ def _setup_func(magicc):
         "Setting up MAGICC worker in %s", magicc.root_dir,
     )
 
+    if _CREATED_ROOTS is not None:
+        _CREATED_ROOTS.append(magicc.root_dir)
+
     magicc.set_config()
 
     _inject_pymagicc_compatible_magcfg_user(magicc)
 
 
-def _init_magicc_worker(dict_shared_instances):
-    LOGGER.debug("Initialising process %s", multiprocessing.current_process())
-    LOGGER.debug("Existing instances %s", dict_shared_instances)
-    magicc_instances = _MagiccInstances(  # noqa: F841 # pylint:disable=unused-variable
-        dict_shared_instances
+def _get_worker_instances():
+    global _WORKER_INSTANCES  # pylint:disable=global-statement
+    global _WORKER_INSTANCES_PID  # pylint:disable=global-statement
+
+    # forked processes inherit their parent's instances, which they must not
+    # use (or clean up)
+    if _WORKER_INSTANCES is None or _WORKER_INSTANCES_PID != os.getpid():
+        LOGGER.debug(
+            "Initialising MAGICC instances in %s", multiprocessing.current_process()
+        )
+        _WORKER_INSTANCES = _MagiccInstances(existing_instances={})
+        _WORKER_INSTANCES_PID = os.getpid()
+        # remove this process' copies of MAGICC when it exits
+        multiprocessing.util.Finalize(None, _WORKER_INSTANCES.cleanup, exitpriority=10)
+
+    return _WORKER_INSTANCES
+
+
+def _get_magicc():
+    return _get_worker_instances().get(
+        root_dir=config["MAGICC_WORKER_ROOT_DIR"],
+        init_callback=_setup_func,
+        init_callback_kwargs={},
     )
 
 
+def _init_magicc_worker():
+    """
+    Create this process' copy of MAGICC so it is ready before any runs arrive
+    """
+    _get_magicc()
+
+
+def _set_created_roots(created_roots):
+    """
+    Set the list in which to record the copies of MAGICC made by this process
+    """
+    global _CREATED_ROOTS  # pylint:disable=global-statement
+
+    _CREATED_ROOTS = created_roots
+
+
+def _remove_created_roots(created_roots):
+    for root_dir in created_roots:
+        if os.path.exists(root_dir):
+            LOGGER.info("removing %s", root_dir)
+            shutil.rmtree(root_dir)
+
+
 def _run_func(magicc, cfg):
+    # copy so the caller's config is untouched if the job has to be re-run
+    cfg = dict(cfg)
     try:
         scenario = cfg.pop("scenario")
         model = cfg.pop("model")
         output_config = cfg.pop("output_config")
 
-        res = magicc.run(**cfg)
+        with span("MAGICC7: magicc.run"):
+            res = magicc.run(**cfg)
+
         if res.metadata["stderr"]:
             LOGGER.info("magicc run stderr: %s", res.metadata["stderr"])
             LOGGER.info("cfg: %s", cfg)
@@ -88,17 +167,24 @@ def _run_func(magicc, cfg):
         return None
 
 
-def _execute_run(cfg, run_func, setup_func, instances):
-    magicc = instances.get(
-        root_dir=config["MAGICC_WORKER_ROOT_DIR"],
-        init_callback=setup_func,
-        init_callback_kwargs={},
+def _estimate_cost(run):
+    # runtime scales with the number of years simulated
+    return run["cfg"].get("endyear", _DEFAULT_ENDYEAR) - run["cfg"].get(
+        "startyear", _DEFAULT_STARTYEAR
     )
 
+
+def _execute_run(cfg, run_func):
+    # includes copying MAGICC the first time each worker is used
+    with span("MAGICC7: get worker copy"):
+        magicc = _get_magicc()
+
     return run_func(magicc, cfg)
 
 
-def run_magicc_parallel(cfgs, output_vars, output_config):
+def run_magicc_parallel(  # pylint:disable=too-many-locals
+    cfgs, output_vars, output_config, pool=None, callback=None
+):
     """
     Run MAGICC in parallel using compact out files
 
@@ -113,15 +199,25 @@ def run_magicc_parallel(cfgs, output_vars, output_config):
     output_config : tuple[str]
         Configuration to include in the output
 
+    pool : :obj:`concurrent.futures.Executor`
+        Pool in which to run MAGICC. Each worker keeps its copy of MAGICC
+        until it exits so re-using a pool (e.g.
+        :class:`openscm_runner.executors.WorkerPool`) across runs avoids
+        copying MAGICC every time. If ``None``, a pool with
+        ``MAGICC_WORKER_NUMBER`` workers is created and shut down once all the
+        runs are complete.
+
+    callback : function
+        Function to call with the results of each successful run as soon as
+        they are available. If supplied, results are not collected and
+        ``None`` is returned.
+
     Returns
     -------
     :obj:`ScmRun`
         :obj:`ScmRun` instance with all results.
     """
     LOGGER.info("Entered _parallel_magicc_compact_out")
-    shared_manager = multiprocessing.Manager()
-    shared_dict = shared_manager.dict()
-    instances = _MagiccInstances(existing_instances=shared_dict)
     magicc_internal_vars = [
         "DAT_{}".format(
             pymagicc.definitions.convert_magicc7_to_openscm_variables(v, inverse=True)
@@ -138,22 +234,37 @@ def run_magicc_parallel(cfgs, output_vars, output_config):
                 "output_config": output_config,
             },
             "run_func": _run_func,
-            "setup_func": _setup_func,
-            "instances": instances,
         }
         for cfg in cfgs
     ]
 
+    if callback is not None:
+
+        def _callback_successful_runs(res):
+            if res is not None:
+                callback(res)
+
+    else:
+        _callback_successful_runs = None
+
+    own_pool = pool is None
+    manager = None
+    created_roots = None
     try:
-        max_workers = int(
-            config.get("MAGICC_WORKER_NUMBER", multiprocessing.cpu_count())
-        )
-        LOGGER.info("Running in parallel with up to %d workers", max_workers)
-        pool = ProcessPoolExecutor(  # pylint:disable=consider-using-with # need to handle shared_manager too
-            max_workers=max_workers,
-            initializer=_init_magicc_worker,
-            initargs=(shared_dict,),
-        )
+        if own_pool:
+            max_workers = int(
+                config.get("MAGICC_WORKER_NUMBER", multiprocessing.cpu_count())
+            )
+            LOGGER.info("Running in parallel with up to %d workers", max_workers)
+            manager = multiprocessing.Manager()  # pylint:disable=consider-using-with
+            created_roots = manager.list()
+            pool = ProcessPoolExecutor(  # pylint:disable=consider-using-with # need to clean up this process' instances too
+                max_workers=max_workers,
+                initializer=_set_created_roots,
+                initargs=(created_roots,),
+            )
+        else:
+            LOGGER.info("Running in the provided pool")
 
         res = _parallel_process(
             func=_execute_run,
@@ -162,15 +273,33 @@ def run_magicc_parallel(cfgs, output_vars, output_config):
             config_are_kwargs=True,
             front_serial=2,
             front_parallel=2,
+            callback=_callback_successful_runs,
+            cost=_estimate_cost,
+            chunksize=config.get("MAGICC_CHUNKSIZE", 1),
+            combine=_run_append_successful,
+            name="MAGICC7 run",
         )
 
-        LOGGER.info("Appending results into a single ScmRun")
-        res = scmdata.run_append([r for r in res if r is not None])
+        if callback is None:
+            LOGGER.info("Appending results into a single ScmRun")
+            res = scmdata.run_append([r for r in res if r is not None])
+        else:
+            res = None
 
     finally:
-        instances.cleanup()
-        LOGGER.info("Shutting down parallel pool")
-        shared_manager.shutdown()
-        pool.shutdown()
+        if own_pool:
+            # workers remove their copies of MAGICC as they exit
+            if pool is not None:
+                LOGGER.info("Shutting down parallel pool")
+                _shutdown_pool(pool)
+
+            # remove any copies left by workers which didn't exit cleanly
+            if created_roots is not None:
+                _remove_created_roots(list(created_roots))
+
+            if manager is not None:
+                manager.shutdown()
+
+            _get_worker_instances().cleanup()
 
     return res
@@ -10,8 +10,9 @@ from scmdata import ScmRun, run_append
 
 from ...progress import progress
 from ...settings import config
+from ...tracing import span
 from ..base import _Adapter
-from ._run_magicc_parallel import run_magicc_parallel
+from ._run_magicc_parallel import _init_magicc_worker, run_magicc_parallel
 
 LOGGER = logging.getLogger(__name__)
 
@@ -69,10 +70,58 @@ class MAGICC7(_Adapter):
     def _init_model(self):  # pylint:disable=arguments-differ
         pass
 
-    def _run(self, scenarios, cfgs, output_variables, output_config):
+    @classmethod
+    def _init_worker(cls):
+        # copying MAGICC is slow so do it before the first run arrives
+        _init_magicc_worker()
+
+    def _run(  # pylint:disable=too-many-arguments
+        self, scenarios, cfgs, output_variables, output_config, pool=None, sink=None
+    ):
         # TODO: add use of historical data properly  # pylint:disable=fixme
         LOGGER.warning("Historical data has not been checked")
 
+        with span("MAGICC7: convert units"):
+            magicc_scmdf = self._convert_scenarios(scenarios)
+
+        with span("MAGICC7: write SCEN7 files"):
+            full_cfgs = self._write_scen_files_and_make_full_cfgs(magicc_scmdf, cfgs)
+
+        pymagicc_vars = [_convert_to_pymagicc_var(v) for v in output_variables]
+        climate_model = "MAGICC{}".format(self.get_version())
+
+        # post-process results as they arrive so this overlaps with the runs
+        # which are still going
+        if sink is not None:
+            write = sink.write
+        else:
+            res = []
+            write = res.append
+
+        def _postprocess_and_write(out):
+            with span("MAGICC7: post-process"):
+                out = self._postprocess_results(out, climate_model)
+
+            write(out)
+
+        run_magicc_parallel(
+            full_cfgs,
+            pymagicc_vars,
+            output_config,
+            pool=pool,
+            callback=_postprocess_and_write,
+        )
+        if sink is not None:
+            return None
+
+        with span("MAGICC7: run_append"):
+            return run_append(res)
+
+    @staticmethod
+    def _convert_scenarios(scenarios):
+        """
+        Convert scenarios to MAGICC's variable names and units
+        """
         magicc_df = scenarios.timeseries().reset_index()
         magicc_df["variable"] = magicc_df["variable"].apply(
             lambda x: x.replace("Sulfur", "SOx")
@@ -94,16 +143,15 @@ class MAGICC7(_Adapter):
                 magicc_unit, variable=variable, context="NOx_conversions"
             )
 
-        full_cfgs = self._write_scen_files_and_make_full_cfgs(magicc_scmdf, cfgs)
-
-        pymagicc_vars = [_convert_to_pymagicc_var(v) for v in output_variables]
-        res = run_magicc_parallel(full_cfgs, pymagicc_vars, output_config)
+        return magicc_scmdf
 
+    @classmethod
+    def _postprocess_results(cls, res, climate_model):
         LOGGER.debug("Dropping todo metadata")
         res = res.drop_meta("todo")
-        res["climate_model"] = "MAGICC{}".format(self.get_version())
+        res["climate_model"] = climate_model
 
-        res = self._fix_pint_incompatible_units(res)
+        res = cls._fix_pint_incompatible_units(res)
         LOGGER.debug("Mapping variables to OpenSCM conventions")
         inverse_map = {v: k for k, v in _VARIABLE_MAP.items()}
         res["variable"] = res["variable"].apply(
@@ -0,0 +1,4 @@
+"""
+Module supporting the NULL adapter
+"""
+from .null_adapter import NULL  # noqa: F401
@@ -0,0 +1,194 @@
+"""
+NULL adapter
+
+The NULL adapter doesn't run a climate model. Each run returns zeros for the
+requested output variables, with one value per year of the scenario, so
+running :func:`openscm_runner.run.run` with it measures the overhead of
+OpenSCM-Runner itself (converting the scenarios, building the configs,
+starting the workers, sending the runs to them and getting the results back,
+appending the results and checking their metadata).
+
+.. code:: python
+
+    >>> res = run({"NULL": [{}] * 600}, scenarios)
+    >>> json.loads(res.metadata["timings"])
+"""
+import logging
+import multiprocessing
+
+import numpy as np
+from scmdata import ScmRun, run_append
+
+from ... import __version__
+from ...progress import progress
+from ...settings import config
+from ...tracing import span
+from ..base import _Adapter
+from ..utils._parallel_process import _owned_pool, _parallel_process
+
+LOGGER = logging.getLogger(__name__)
+
+_UNITS = (
+    ("Temperature", "K"),
+    ("Radiative Forcing", "W/m^2"),
+    ("Atmospheric Concentrations|CO2", "ppm"),
+    ("Atmospheric Concentrations", "ppb"),
+    ("Heat Content", "ZJ"),
+    ("Heat Uptake", "W/m^2"),
+    ("Flux", "GtC / yr"),
+)
+"""tuple[tuple[str, str]]: Unit of output variables which contain each string"""
+
+
+def _get_unit(variable):
+    for contains, unit in _UNITS:
+        if contains in variable:
+            return unit
+
+    return "dimensionless"
+
+
+class NULL(_Adapter):
+    """
+    Adapter which doesn't run a climate model (for measuring overhead)
+    """
+
+    def _init_model(self, *args, **kwargs):
+        pass
+
+    def _run(  # pylint:disable=too-many-arguments
+        self, scenarios, cfgs, output_variables, output_config, pool=None, sink=None
+    ):
+        with span("NULL: convert scenarios"):
+            null_df = ScmRun(scenarios.timeseries())
+
+        full_cfgs = self._make_full_cfgs(null_df, cfgs, output_variables, output_config)
+
+        def _set_climate_model(res):
+            res["climate_model"] = "NULL"
+            return res
+
+        if sink is not None:
+            run_null(
+                full_cfgs,
+                pool=pool,
+                callback=lambda res: sink.write(_set_climate_model(res)),
+            )
+            return None
+
+        res = run_null(full_cfgs, pool=pool)
+
+        return _set_climate_model(res)
+
+    @staticmethod
+    def _make_full_cfgs(scenarios, cfgs, output_variables, output_config):
+        full_cfgs = []
+        run_id_block = 0
+        for (scenario, model), smdf in progress(
+            scenarios.timeseries().groupby(["scenario", "model"]),
+            desc="Creating NULL inputs",
+        ):
+            years = ScmRun(smdf).time_points.years()
+            scenario_cfg = [
+                {
+                    "scenario": scenario,
+                    "model": model,
+                    "run_id": run_id_block + i,
+                    "years": np.arange(years[0], years[-1] + 1),
+                    "output_variables": output_variables,
+                    "output_config": {k: cfg[k] for k in output_config or ()},
+                }
+                for i, cfg in enumerate(cfgs)
+            ]
+            run_id_block += len(scenario_cfg)
+
+            full_cfgs += scenario_cfg
+
+        return full_cfgs
+
+    @staticmethod
+    def get_version():
+        """
+        Get the version of the NULL adapter
+
+        Returns
+        -------
+        str
+            The OpenSCM-Runner version (the NULL adapter is part of
+            OpenSCM-Runner)
+        """
+        return __version__
+
+
+def run_null(cfgs, pool=None, callback=None):
+    """
+    Run the NULL model
+
+    Parameters
+    ----------
+    cfgs : list[dict]
+        List of configurations (as made by the adapter)
+
+    pool : :obj:`concurrent.futures.Executor`
+        Pool in which to do the runs. If ``None``, a pool with
+        ``NULL_WORKER_NUMBER`` workers is created (or the runs are done
+        serially if only one worker is requested).
+
+    callback : function
+        Function to call with the results of each run as soon as they are
+        available. If supplied, results are not collected and ``None`` is
+        returned.
+
+    Returns
+    -------
+    :obj:`ScmRun`
+        :obj:`ScmRun` instance with all results.
+    """
+    parallel_process_kwargs = dict(
+        func=_single_null_run,
+        configuration=cfgs,
+        config_are_kwargs=False,
+        callback=callback,
+        chunksize=config.get("NULL_CHUNKSIZE", "auto"),
+        combine=run_append,
+        name="NULL run",
+    )
+    if pool is not None:
+        LOGGER.info("Running NULL in the provided pool")
+        res = _parallel_process(**parallel_process_kwargs, pool=pool)
+    else:
+        ncpu = int(config.get("NULL_WORKER_NUMBER", multiprocessing.cpu_count()))
+        LOGGER.info("Running NULL with %s workers", ncpu)
+
+        if ncpu > 1:
+            with _owned_pool(ncpu) as owned_pool:
+                res = _parallel_process(**parallel_process_kwargs, pool=owned_pool)
+        else:
+            res = _parallel_process(**parallel_process_kwargs)
+
+    if callback is not None:
+        return None
+
+    with span("NULL: run_append"):
+        res = run_append(res)
+
+    return res
+
+
+def _single_null_run(cfg):
+    output_variables = cfg["output_variables"]
+    years = cfg["years"]
+
+    return ScmRun(
+        np.zeros((len(years), len(output_variables))),
+        index=years,
+        columns={
+            "scenario": cfg["scenario"],
+            "model": cfg["model"],
+            "region": "World",
+            "variable": list(output_variables),
+            "unit": [_get_unit(v) for v in output_variables],
+            "run_id": cfg["run_id"],
+            **cfg["output_config"],
+        },
+    )
@@ -0,0 +1,25 @@
+"""
+Functions to combine the results of several work items into one
+"""
+import scmdata
+
+
+def _run_append_successful(results):
+    """
+    Append results, ignoring work items which failed
+
+    Parameters
+    ----------
+    results : list[:obj:`scmdata.ScmRun`]
+        Results to append (failed work items are ``None``)
+
+    Returns
+    -------
+    :obj:`scmdata.ScmRun`
+        Appended results, ``None`` if every work item failed
+    """
+    successful = [r for r in results if r is not None]
+    if not successful:
+        return None
+
+    return scmdata.run_append(successful)
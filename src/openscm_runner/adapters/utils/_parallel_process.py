@@ -1,71 +1,537 @@
 """
 Code to support running in parallel
 """
+import contextlib
 import logging
+import math
+import os
+import sys
+import threading
 import time
-from concurrent.futures import as_completed
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
+from ...events import emit
+from ...memory import (
+    _get_max_rss,
+    _get_track_memory,
+    _measure_peak_memory,
+    tracking_memory,
+)
+from ...profiling import _get_profile_dir, _profile_job, _write_worker_profile
 from ...progress import progress
+from ...settings import config
+from ...tracing import (
+    Tracer,
+    _is_tracing,
+    _is_tracing_job_stages,
+    _only_tracing,
+    add_span,
+    span,
+)
+from ._runtimes import _RUNTIME_HISTORY, _get_submission_order
 
 LOGGER = logging.getLogger(__name__)
 
+_TARGET_CHUNK_SECONDS = 0.5
+"""float: How long each chunk should take to run when chunk size is ``"auto"``"""
 
-def _run_serial(func, configs, config_are_kwargs, desc):
+_MIN_CHUNKS_PER_WORKER = 4
+"""
+int: Minimum number of chunks per worker when chunk size is ``"auto"``
+
+Ensures that all the workers are kept busy even if some chunks take longer
+than expected.
+"""
+
+_STRAGGLER_PERCENTILE = 0.95
+"""float: Percentile of completed chunks' runtimes used to set deadlines"""
+
+_STRAGGLER_MIN_COMPLETED = 5
+"""int: Number of chunks which must complete before deadlines are set"""
+
+_STRAGGLER_MIN_SECONDS = 1.0
+"""float: Shortest deadline, stops quick chunks being duplicated because of noise"""
+
+_STRAGGLER_POLL_SECONDS = 1.0
+"""float: How often to check for stragglers"""
+
+_NO_RESULT = object()
+"""Placeholder for work items whose result was combined with another's"""
+
+_ABANDONED_FUTURES = weakref.WeakKeyDictionary()
+"""
+dict: For each pool, copies of chunks which lost to their duplicate after they
+had started running (so could not be cancelled)
+"""
+
+_ABANDONED_FUTURES_LOCK = threading.Lock()
+
+
+def _execute_work_item(func, cfg, config_are_kwargs, profile_dir=None, trace=True):
+    """
+    Run a single work item, timing how long it takes
+
+    If ``profile_dir`` is supplied, the work item is profiled (see
+    :mod:`openscm_runner.profiling`). If ``trace`` is ``False``, no spans are
+    collected whilst running the work item.
+
+    Returns
+    -------
+    tuple
+        Result of calling ``func`` with ``cfg`` and statistics about the
+        work item (its start time, runtime in seconds, the process and thread
+        in which it ran, any spans recorded whilst running it and, if memory
+        is being tracked, its peak memory and the worker's peak resident set
+        size)
+    """
+    tracer = Tracer() if trace else None
+    start = time.time()
+    start_perf = time.perf_counter()
+    with _only_tracing(tracer), _profile_job(profile_dir):
+        with _measure_peak_memory() as memory:
+            if config_are_kwargs:
+                res = func(**cfg)
+            else:
+                res = func(cfg)
+
+    stats = {
+        "start": start,
+        "runtime": time.perf_counter() - start_perf,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "spans": [] if tracer is None else tracer.spans,
+        "peak_memory": memory["peak"],
+        "max_rss": None if memory["peak"] is None else _get_max_rss(),
+    }
+
+    return res, stats
+
+
+def _execute_work_items(  # pylint:disable=too-many-arguments
+    func,
+    configs,
+    config_are_kwargs,
+    combine,
+    profile_dir=None,
+    track_memory=False,
+    trace=True,
+):
+    """
+    Run a chunk of work items
+
+    If ``profile_dir`` is supplied, the work items are profiled and the
+    worker's profile is written to ``profile_dir`` once they are complete. If
+    ``track_memory`` is ``True``, the memory used by each work item is
+    tracked (see :mod:`openscm_runner.memory`). If ``trace`` is ``False``, no
+    spans are collected (so none have to be sent back).
+
+    Returns
+    -------
+    list[tuple] or tuple
+        If ``combine`` is ``None``, the result and statistics of each work
+        item. Otherwise, the results combined with ``combine`` and the
+        statistics of each work item.
+    """
+    with tracking_memory(track_memory):
+        res_stats = [
+            _execute_work_item(func, c, config_are_kwargs, profile_dir, trace)
+            for c in configs
+        ]
+
+    _write_worker_profile(profile_dir)
+    if combine is None:
+        return res_stats
+
+    return (
+        combine([res for res, _ in res_stats]),
+        [stats for _, stats in res_stats],
+    )
+
+
+def _run_serial(  # pylint:disable=too-many-arguments
+    func,
+    items,
+    config_are_kwargs,
+    desc,
+    on_result,
+    name,
+    profile_dir=None,
+    track_memory=False,
+    trace=True,
+):
     LOGGER.debug("Entering _run_serial")
 
-    if config_are_kwargs:
-        LOGGER.debug("Treating config as kwargs")
-        res = [func(**a) for a in progress(configs, desc=desc)]
-    else:
-        LOGGER.debug("Treating config as args")
-        res = [func(a) for a in progress(configs, desc=desc)]
+    for idx, cfg in progress(items, desc=desc):
+        emit("submitted", name, 1)
+        try:
+            with tracking_memory(track_memory):
+                res_stats = _execute_work_item(
+                    func, cfg, config_are_kwargs, profile_dir, trace
+                )
+        except Exception as exc:
+            emit("failed", name, 1, error=repr(exc))
+            raise
+
+        on_result(idx, res_stats)
+
+    _write_worker_profile(profile_dir)
 
     LOGGER.debug("Exiting _run_serial")
-    return res
 
 
-def _run_parallel(  # pylint:disable=too-many-arguments
-    pool, timeout, func, configs, config_are_kwargs, desc, bar_start
+def _raise_if_failed(future):
+    if future.exception() is not None:
+        time.sleep(2)  # let buffer flush out
+        print(
+            "One of the processes failed, see error below (was something "
+            "unable to be pickled?)"
+        )
+        raise future.exception()
+
+
+def _get_chunk_runtime(chunk_res):
+    """
+    Get the total runtime of a chunk from the output of ``_execute_work_items``
+    """
+    if isinstance(chunk_res, tuple):
+        return sum(stats["runtime"] for stats in chunk_res[1])
+
+    return sum(stats["runtime"] for _, stats in chunk_res)
+
+
+def _percentile(values, quantile):
+    ordered = sorted(values)
+    return ordered[
+        min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))
+    ]
+
+
+class _StragglerMonitor:
+    """
+    Spot chunks which are taking much longer than the chunks completed so far
+
+    A chunk's deadline is ``factor`` times the ``_STRAGGLER_PERCENTILE``
+    percentile of the runtimes of the chunks completed so far. Running chunks
+    are timed from when they are first seen running (rather than when they
+    were submitted) so that time spent queueing doesn't count.
+    """
+
+    def __init__(self, factor):
+        self.factor = factor
+        self._durations = []
+        self._started = {}
+
+    def observe(self, futures, now):
+        """
+        Record the start time of any futures which have started running
+        """
+        for future in futures:
+            if future not in self._started and future.running():
+                self._started[future] = now
+
+    def completed(self, future, runtime):
+        """
+        Record the runtime of a completed future
+        """
+        self._started.pop(future, None)
+        self._durations.append(runtime)
+
+    def forget(self, future):
+        """
+        Stop tracking a future without recording its runtime
+        """
+        self._started.pop(future, None)
+
+    def get_stragglers(self, futures, now):
+        """
+        Get the futures which have been running for longer than the deadline
+        """
+        if len(self._durations) < _STRAGGLER_MIN_COMPLETED:
+            return []
+
+        deadline = max(
+            self.factor * _percentile(self._durations, _STRAGGLER_PERCENTILE),
+            _STRAGGLER_MIN_SECONDS,
+        )
+
+        return [
+            future
+            for future in futures
+            if future in self._started and now - self._started[future] > deadline
+        ]
+
+
+def _stream_results(  # pylint:disable=too-many-locals,too-many-branches,too-many-arguments
+    futures,
+    timeout,
+    on_chunk,
+    desc,
+    resubmit=None,
+    straggler_factor=None,
+    on_failure=None,
+    on_abandoned=None,
 ):
-    LOGGER.debug("Entering _run_parallel")
+    """
+    Pass results to ``on_chunk`` as soon as they are available
+
+    Each future is dropped as soon as its result has been handed on so its
+    result can be garbage collected before the other jobs are complete. If a
+    chunk fails, ``on_failure`` (if supplied) is called with the chunk's
+    indices and the exception.
 
-    if config_are_kwargs:
-        LOGGER.debug("Treating config as kwargs")
-        futures = [pool.submit(func, **a) for a in configs]
-    else:
-        LOGGER.debug("Treating config as args")
-        futures = [pool.submit(func, a) for a in configs]
-
-    LOGGER.debug("Waiting for jobs to complete")
-    for i, future in progress(
-        enumerate(as_completed(futures, timeout=timeout)), total=len(futures), desc=desc
-    ):
-        if future.exception() is not None:
-            time.sleep(2)  # let buffer flush out
-            print(
-                "One of the processes failed, see error below (was something "
-                "unable to be pickled?)"
+    If ``straggler_factor`` is supplied, a duplicate of any chunk which runs
+    for longer than its deadline (see :class:`_StragglerMonitor`) is
+    submitted with ``resubmit``. Whichever copy finishes first is used and the
+    other is cancelled. If the other copy has already started, it is handed
+    to ``on_abandoned`` (if supplied) so that it can be killed (see
+    :func:`_shutdown_pool`).
+    """
+    pending = set(futures)
+    copies = {}
+    for future, idxs in futures.items():
+        copies[tuple(idxs)] = {future}
+
+    n_items = sum(len(idxs) for idxs in futures.values())
+    monitor = None if straggler_factor is None else _StragglerMonitor(straggler_factor)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with progress(total=n_items, desc=desc) as pbar:
+        while pending:
+            wait_time = None if deadline is None else deadline - time.monotonic()
+            if monitor is not None:
+                wait_time = (
+                    _STRAGGLER_POLL_SECONDS
+                    if wait_time is None
+                    else min(wait_time, _STRAGGLER_POLL_SECONDS)
+                )
+
+            done, pending = wait(
+                pending, timeout=wait_time, return_when=FIRST_COMPLETED
             )
-            raise future.exception()
+            now = time.monotonic()
+            if not done and deadline is not None and now >= deadline:
+                raise TimeoutError(
+                    "{} (of {}) jobs did not complete".format(
+                        sum(len(chunk) for chunk in copies), n_items
+                    )
+                )
 
-        LOGGER.debug("Job %s completed", i + bar_start)
+            while done:
+                future = done.pop()
+                idxs = futures.pop(future)
+                chunk = tuple(idxs)
+                copies[chunk].discard(future)
+                if monitor is not None:
+                    monitor.forget(future)
 
-    res = []
+                if future.exception() is not None and on_failure is not None:
+                    on_failure(idxs, future.exception())
 
-    LOGGER.debug("Collecting results")
-    for i, future in enumerate(futures):
-        try:
-            res.append(future.result())
-            LOGGER.debug("Retrived result %s", i + bar_start)
-        except Exception as exc:  # pylint:disable=broad-except
-            LOGGER.debug("Retrieving result %s failed", i + bar_start)
-            res.append(exc)
+                if future.exception() is not None and copies[chunk]:
+                    LOGGER.warning(
+                        "Jobs %s failed, waiting for their duplicate: %s",
+                        idxs,
+                        future.exception(),
+                    )
+                    continue
+
+                _raise_if_failed(future)
+                for duplicate in copies.pop(chunk):
+                    # can only cancel if the duplicate hasn't started
+                    if (
+                        not duplicate.cancel()
+                        and not duplicate.done()
+                        and on_abandoned is not None
+                    ):
+                        on_abandoned(duplicate)
+
+                    pending.discard(duplicate)
+                    done.discard(duplicate)
+                    futures.pop(duplicate)
+                    if monitor is not None:
+                        monitor.forget(duplicate)
+
+                LOGGER.debug("Jobs %s completed", idxs)
+                if monitor is not None:
+                    monitor.completed(future, _get_chunk_runtime(future.result()))
+
+                on_chunk(idxs, future.result())
+                pbar.update(len(idxs))
+
+            if monitor is None:
+                continue
+
+            monitor.observe(pending, now)
+            for straggler in monitor.get_stragglers(pending, now):
+                chunk = tuple(futures[straggler])
+                if len(copies[chunk]) > 1:
+                    # already running a duplicate
+                    continue
+
+                LOGGER.warning("Jobs %s are straggling, submitting a duplicate", chunk)
+                duplicate = resubmit(list(chunk))
+                futures[duplicate] = list(chunk)
+                copies[chunk].add(duplicate)
+                pending.add(duplicate)
+
+
+def _run_parallel(  # pylint:disable=too-many-arguments,too-many-locals
+    pool,
+    timeout,
+    func,
+    items,
+    config_are_kwargs,
+    desc,
+    on_chunk,
+    chunksize=1,
+    combine=None,
+    straggler_factor=None,
+    name=None,
+    profile_dir=None,
+    track_memory=False,
+    trace=True,
+):
+    LOGGER.debug("Entering _run_parallel")
+
+    configs = dict(items)
+
+    def _submit(idxs):
+        return pool.submit(
+            _execute_work_items,
+            func,
+            [configs[idx] for idx in idxs],
+            config_are_kwargs,
+            combine,
+            profile_dir,
+            track_memory,
+            trace,
+        )
+
+    def _resubmit(idxs):
+        emit("resubmitted", name, len(idxs))
+        return _submit(idxs)
+
+    def _on_failure(idxs, exc):
+        emit("failed", name, len(idxs), error=repr(exc))
+
+    def _on_abandoned(future):
+        with _ABANDONED_FUTURES_LOCK:
+            _ABANDONED_FUTURES.setdefault(pool, set()).add(future)
+
+    futures = {}
+    for i in range(0, len(items), chunksize):
+        idxs = [idx for idx, _ in items[i : i + chunksize]]
+        futures[_submit(idxs)] = idxs
+        emit("submitted", name, len(idxs))
+
+    _stream_results(
+        futures,
+        timeout,
+        on_chunk,
+        desc,
+        resubmit=_resubmit,
+        straggler_factor=straggler_factor,
+        on_failure=_on_failure,
+        on_abandoned=_on_abandoned,
+    )
 
     LOGGER.debug("Exiting _run_parallel")
-    return res
 
 
-def _parallel_process(  # pylint:disable=too-many-arguments
+def _shutdown_pool(pool):
+    """
+    Shut down a pool owned by an adapter
+
+    If any copies of straggling chunks lost to their duplicate after they had
+    started (see :func:`_stream_results`), they may never finish (e.g. a hung
+    model binary). In this case, the pool's workers are terminated rather
+    than waiting for them.
+
+    Parameters
+    ----------
+    pool : :obj:`concurrent.futures.ProcessPoolExecutor`
+        Pool to shut down
+    """
+    with _ABANDONED_FUTURES_LOCK:
+        abandoned = [f for f in _ABANDONED_FUTURES.pop(pool, ()) if not f.done()]
+
+    if not abandoned:
+        pool.shutdown()
+        return
+
+    LOGGER.warning(
+        "Terminating workers rather than waiting for %d abandoned jobs", len(abandoned),
+    )
+    # shutting down forgets the workers so get them first
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    if sys.version_info >= (3, 9):
+        pool.shutdown(  # pylint:disable=unexpected-keyword-arg
+            wait=False, cancel_futures=True
+        )
+    else:  # pragma: no cover
+        pool.shutdown(wait=False)
+
+    # the results of any other jobs are no longer needed (they are complete
+    # or the run failed)
+    for process in processes:
+        process.terminate()
+
+    for process in processes:
+        process.join()
+
+
+@contextlib.contextmanager
+def _owned_pool(max_workers, **kwargs):
+    """
+    Create a process pool which is shut down with :func:`_shutdown_pool`
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of workers
+
+    **kwargs
+        Passed to :class:`concurrent.futures.ProcessPoolExecutor`
+
+    Yields
+    ------
+    :obj:`concurrent.futures.ProcessPoolExecutor`
+        The pool
+    """
+    pool = ProcessPoolExecutor(max_workers, **kwargs)
+    try:
+        yield pool
+    finally:
+        _shutdown_pool(pool)
+
+
+def _get_auto_chunksize(pool, n_items, item_seconds):
+    """
+    Get chunk size such that each chunk takes roughly ``_TARGET_CHUNK_SECONDS``
+
+    The chunk size is also limited so there are at least
+    ``_MIN_CHUNKS_PER_WORKER`` chunks per worker.
+    """
+    if item_seconds is None:
+        LOGGER.debug("No runtime information, not chunking")
+        return 1
+
+    n_workers = getattr(pool, "_max_workers", None) or os.cpu_count() or 1
+
+    by_time = max(1, int(_TARGET_CHUNK_SECONDS / max(item_seconds, 1e-9)))
+    by_balance = max(1, math.ceil(n_items / (n_workers * _MIN_CHUNKS_PER_WORKER)))
+    chunksize = min(by_time, by_balance)
+    LOGGER.debug(
+        "Using chunk size of %d (expected runtime per item: %fs)",
+        chunksize,
+        item_seconds,
+    )
+
+    return chunksize
+
+
+def _parallel_process(  # pylint:disable=too-many-arguments,too-many-locals,too-many-statements,too-many-branches
     func,
     configuration,
     pool=None,
@@ -73,6 +539,13 @@ def _parallel_process(  # pylint:disable=too-many-arguments
     front_serial=3,
     front_parallel=2,
     timeout=None,
+    callback=None,
+    cost=None,
+    runtime_key=None,
+    chunksize=1,
+    combine=None,
+    straggler_factor=None,
+    name=None,
 ):
     """
     Run a process in parallel with a progress bar.
@@ -87,9 +560,11 @@ def _parallel_process(  # pylint:disable=too-many-arguments
     configuration : sequence
         An array of configuration with which to run ``func``.
 
-    pool : :obj:`concurrent.futures.ProcessPoolExecutor`
-        Pool in which to execute the jobs. If ``None``, the jobs will be executed
-        serially in a single process (useful for debugging and benchmarking).
+    pool : :obj:`concurrent.futures.Executor`
+        Pool in which to execute the jobs (any executor whose futures are
+        :class:`concurrent.futures.Future` instances can be used). If
+        ``None``, the jobs will be executed serially in a single process
+        (useful for debugging and benchmarking).
 
     config_are_kwargs : bool
         Are the elements of ``configuration`` intended to be used as keyword arguments
@@ -108,54 +583,253 @@ def _parallel_process(  # pylint:disable=too-many-arguments
         How long to wait for processes to complete before timing out. If
         ``None``, there is no timeout limit.
 
+    callback : function
+        Function to call with each result as soon as it is available. If
+        supplied, results are handed to ``callback`` rather than being
+        collected (which keeps memory use bounded) and an empty list is
+        returned.
+
+    cost : function
+        Function which estimates the cost of a job given its configuration
+        (e.g. the number of years to simulate). If supplied, jobs are run in
+        order of decreasing estimated cost so that long jobs don't end up at
+        the end of the queue, leaving all but one worker idle.
+
+    runtime_key : function
+        Function which returns a key identifying equivalent jobs given a
+        job's configuration. Equivalent jobs are assumed to take as long as
+        each other so the runtimes of previous jobs with the same key are
+        used in preference to ``cost``.
+
+    chunksize : int or str
+        Number of jobs to send to a worker at once (after the front serial and
+        front parallel jobs). Sending jobs in chunks reduces the overhead of
+        communicating with the workers, which matters if each job is quick.
+        If ``"auto"``, the chunk size is chosen based on the runtimes of the
+        jobs run so far (or previous runtimes if no jobs have been run yet).
+
+    combine : function
+        Function which combines a list of results into a single result. If
+        supplied, each chunk's results are combined in the worker before
+        being sent back, so only one result is sent per chunk. In this case,
+        ``callback`` receives (and the return value contains) the combined
+        results rather than the result of each job.
+
+    straggler_factor : float
+        If supplied, any chunk of jobs which is still running after
+        ``straggler_factor`` times the 95th percentile of the runtimes of the
+        chunks completed so far is run again in duplicate. Whichever copy
+        finishes first is used. This stops a single hung job from stalling
+        the entire batch. If ``None``, the value of the
+        ``OPENSCM_RUNNER_STRAGGLER_FACTOR`` setting is used (if this isn't
+        set, no duplicates are run).
+
+    name : str
+        Name used for the spans which record each job (see
+        :mod:`openscm_runner.tracing`). If ``None``, the name of ``func`` is
+        used.
+
     Returns
     -------
     sequence
         Results of calling ``func`` with each configuration in ``configuration``
+        (empty if ``callback`` is supplied)
+
+    Raises
+    ------
+    ValueError
+        ``chunksize`` is not ``"auto"`` or a positive integer
     """
-    front_serial_res = []
-    if front_serial > 0:
-        LOGGER.debug("Running front serial jobs")
-        front_serial_res = _run_serial(
-            func=func,
-            configs=configuration[:front_serial],
-            config_are_kwargs=config_are_kwargs,
-            desc="Front serial",
-        )
+    if str(chunksize).lower() != "auto":
+        chunksize = int(chunksize)
+        if chunksize < 1:
+            raise ValueError(
+                "`chunksize` must be 'auto' or at least 1, received: {}".format(
+                    chunksize
+                )
+            )
 
-    if pool is None:
-        LOGGER.info("No pool provided, running rest of the jobs serially and returning")
-        rest = _run_serial(
-            func=func,
-            configs=configuration[front_serial:],
-            config_are_kwargs=config_are_kwargs,
-            desc="Serial runs",
-        )
+    if straggler_factor is None:
+        straggler_factor = config.get("OPENSCM_RUNNER_STRAGGLER_FACTOR", None) or None
+
+    if straggler_factor is not None:
+        straggler_factor = float(straggler_factor)
+
+    costs = None if cost is None else [cost(c) for c in configuration]
+    runtime_keys = (
+        None if runtime_key is None else [runtime_key(c) for c in configuration]
+    )
+    order = _get_submission_order(func, len(configuration), costs, runtime_keys)
+    items = [(idx, configuration[idx]) for idx in order]
+
+    results = [None] * len(configuration) if callback is None else None
+    observed_runtimes = []
+    name = func.__name__ if name is None else name
+    profile_dir = _get_profile_dir()
+    # spans and memory use are only reported via the active tracers so there
+    # is no point collecting them (and sending them back from the workers)
+    # if nothing will record them
+    trace = _is_tracing_job_stages()
+    track_memory = _is_tracing() and _get_track_memory()
 
-        return rest + front_serial_res
-
-    front_parallel_res = []
-    if front_parallel > 0:
-        LOGGER.debug("Running front parallel jobs")
-        front_parallel_res = _run_parallel(
-            pool=pool,
-            timeout=timeout,
-            func=func,
-            configs=configuration[front_serial : front_serial + front_parallel],
-            config_are_kwargs=config_are_kwargs,
-            desc="Front parallel",
-            bar_start=front_serial,
+    def _record_stats(idx, stats):
+        observed_runtimes.append(stats["runtime"])
+        if costs is not None or runtime_keys is not None:
+            _RUNTIME_HISTORY.record(
+                func,
+                None if costs is None else costs[idx],
+                None if runtime_keys is None else runtime_keys[idx],
+                stats["runtime"],
+            )
+
+        add_span(
+            name,
+            stats["start"],
+            stats["runtime"],
+            category="job",
+            pid=stats["pid"],
+            tid=stats["tid"],
+            args={"index": idx}
+            if stats["max_rss"] is None
+            else {"index": idx, "max_rss": stats["max_rss"]},
+            peak_memory=stats["peak_memory"],
         )
+        for job_span in stats["spans"]:
+            add_span(**job_span)
+
+        emit("completed", name, 1, busy_seconds=stats["runtime"])
 
-    LOGGER.debug("Running rest of parallel jobs")
-    rest = _run_parallel(
-        pool=pool,
-        timeout=timeout,
-        func=func,
-        configs=configuration[front_serial + front_parallel :],
-        config_are_kwargs=config_are_kwargs,
-        desc="Parallel runs",
-        bar_start=front_serial + front_parallel,
+    def _on_result(idx, res_stats):
+        res, stats = res_stats
+        _record_stats(idx, stats)
+
+        if callback is None:
+            results[idx] = res
+        else:
+            callback(res)
+
+    def _on_chunk(idxs, chunk_res):
+        if combine is None:
+            for idx, res_stats in zip(idxs, chunk_res):
+                _on_result(idx, res_stats)
+
+            return
+
+        combined, all_stats = chunk_res
+        for idx, stats in zip(idxs, all_stats):
+            _record_stats(idx, stats)
+
+        if callback is None:
+            results[idxs[0]] = combined
+            for idx in idxs[1:]:
+                results[idx] = _NO_RESULT
+        else:
+            callback(combined)
+
+    def _on_chunk_traced(idxs, chunk_res):
+        # results have been received from the worker by the time we get here
+        with span("{}: collect results".format(name)):
+            _on_chunk(idxs, chunk_res)
+
+    emit(
+        "started",
+        name,
+        len(configuration),
+        n_workers=1 if pool is None else getattr(pool, "_max_workers", None),
     )
+    try:
+        if front_serial > 0:
+            LOGGER.debug("Running front serial jobs")
+            _run_serial(
+                func=func,
+                items=items[:front_serial],
+                config_are_kwargs=config_are_kwargs,
+                desc="Front serial",
+                on_result=_on_result,
+                name=name,
+                profile_dir=profile_dir,
+                track_memory=track_memory,
+                trace=trace,
+            )
+
+        if pool is None:
+            LOGGER.info(
+                "No pool provided, running rest of the jobs serially and returning"
+            )
+            _run_serial(
+                func=func,
+                items=items[front_serial:],
+                config_are_kwargs=config_are_kwargs,
+                desc="Serial runs",
+                on_result=_on_result,
+                name=name,
+                profile_dir=profile_dir,
+                track_memory=track_memory,
+                trace=trace,
+            )
+
+        else:
+            if front_parallel > 0:
+                LOGGER.debug("Running front parallel jobs")
+                _run_parallel(
+                    pool=pool,
+                    timeout=timeout,
+                    func=func,
+                    items=items[front_serial : front_serial + front_parallel],
+                    config_are_kwargs=config_are_kwargs,
+                    desc="Front parallel",
+                    on_chunk=_on_chunk_traced,
+                    combine=combine,
+                    straggler_factor=straggler_factor,
+                    name=name,
+                    profile_dir=profile_dir,
+                    track_memory=track_memory,
+                    trace=trace,
+                )
+
+            rest = items[front_serial + front_parallel :]
+            if chunksize == "auto":
+                if observed_runtimes:
+                    item_seconds = sum(observed_runtimes) / len(observed_runtimes)
+                else:
+                    item_seconds = _RUNTIME_HISTORY.mean_estimate(
+                        func,
+                        None if costs is None else [costs[idx] for idx, _ in rest],
+                        None
+                        if runtime_keys is None
+                        else [runtime_keys[idx] for idx, _ in rest],
+                    )
+
+                chunksize = _get_auto_chunksize(pool, len(rest), item_seconds)
+
+            LOGGER.debug("Running rest of parallel jobs")
+            _run_parallel(
+                pool=pool,
+                timeout=timeout,
+                func=func,
+                items=rest,
+                config_are_kwargs=config_are_kwargs,
+                desc="Parallel runs",
+                on_chunk=_on_chunk_traced,
+                chunksize=chunksize,
+                combine=combine,
+                straggler_factor=straggler_factor,
+                name=name,
+                profile_dir=profile_dir,
+                track_memory=track_memory,
+                trace=trace,
+            )
+
+    finally:
+        emit("finished", name, len(configuration))
+
+    if costs is not None or runtime_keys is not None:
+        _RUNTIME_HISTORY.save()
+
+    if callback is not None:
+        return []
+
+    if combine is not None:
+        return [r for r in results if r is not _NO_RESULT]
 
-    return front_serial_res + front_parallel_res + rest
+    return results
@@ -0,0 +1,509 @@
+"""
+On-disk storage of results for individual work items
+
+A work item is a single (scenario, configuration) pair. Results are stored
+per work item, keyed by a hash of everything which determines the result, so
+that only work items without a stored result have to be run.
+"""
+import hashlib
+import json
+import logging
+import os
+import os.path
+import pickle  # nosec # only used to load files we wrote ourselves
+import tempfile
+import threading
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import scmdata
+
+from ...settings import config
+from ...tracing import span
+
+LOGGER = logging.getLogger(__name__)
+
+_EVICT_TO_FRACTION = 0.9
+"""
+float: Fraction of the maximum size the result cache is reduced to when full
+
+Evicting to below the maximum size means the cache directory only has to be
+walked every so often, rather than every time a result is added to a full
+cache.
+"""
+
+# one cache per directory so the size of the cache is only calculated once
+_RESULT_CACHES = {}
+_RESULT_CACHES_LOCK = threading.Lock()
+
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return {"__ndarray__": obj.tolist(), "dtype": str(obj.dtype)}
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    return repr(obj)
+
+
+def _hash_cfg(cfg):
+    """
+    Hash a configuration
+
+    Parameters
+    ----------
+    cfg : dict
+        Configuration to hash
+
+    Returns
+    -------
+    str
+        Hex digest of the configuration
+    """
+    cfg_json = json.dumps(cfg, sort_keys=True, default=_json_default)
+
+    return hashlib.sha256(cfg_json.encode("utf-8")).hexdigest()
+
+
+def _hash_timeseries(timeseries):
+    """
+    Hash the timeseries of a single scenario
+
+    Times which are nan for every timeseries are ignored so that the hash
+    does not depend on which other scenarios were in the same input.
+
+    Parameters
+    ----------
+    timeseries : :obj:`pd.DataFrame`
+        Timeseries to hash (as returned by :meth:`scmdata.ScmRun.timeseries`)
+
+    Returns
+    -------
+    str
+        Hex digest of the timeseries
+    """
+    timeseries = timeseries.dropna(axis="columns", how="all").sort_index()
+
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([str(c) for c in timeseries.columns]).encode("utf-8"))
+    hasher.update(pd.util.hash_pandas_object(timeseries, index=True).values.tobytes())
+
+    return hasher.hexdigest()
+
+
+class _ResultStore:
+    """
+    Store of work item results in a directory
+    """
+
+    def __init__(self, path):
+        """
+        Initialise
+
+        Parameters
+        ----------
+        path : str
+            Directory in which to store results
+        """
+        self.path = os.path.expanduser(path)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _get_file(self, key):
+        return os.path.join(self.path, key[:2], "{}.pkl".format(key))
+
+    def get(self, key):
+        """
+        Get a result
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        Returns
+        -------
+        :obj:`scmdata.ScmRun`
+            Result, ``None`` if no result is stored for ``key``
+        """
+        try:
+            with open(self._get_file(key), "rb") as file_handle:
+                return pickle.load(file_handle)  # nosec
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, res):
+        """
+        Store a result
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        res : :obj:`scmdata.ScmRun`
+            Result to store
+
+        Returns
+        -------
+        int
+            Size of the stored result in bytes
+        """
+        out_file = self._get_file(key)
+        out_dir = os.path.dirname(out_file)
+        os.makedirs(out_dir, exist_ok=True)
+
+        # write then rename so readers never see partially written files
+        file_descriptor, tmp_file = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as file_handle:
+            pickle.dump(res, file_handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_file, out_file)
+
+        return os.path.getsize(out_file)
+
+
+class _ResultCache(_ResultStore):
+    """
+    Size-bounded store of work item results, evicting the least recently used
+
+    The size of the cache is tracked per process. It is worked out from the
+    files in the cache when the cache is created and whenever results are
+    evicted, so results added by other processes in the meantime are only
+    accounted for then.
+    """
+
+    def __init__(self, path, max_size):
+        """
+        Initialise
+
+        Parameters
+        ----------
+        path : str
+            Directory in which to store results
+
+        max_size : int
+            Maximum size of the cache in bytes
+        """
+        super().__init__(path)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._size = sum(size for _, size, _ in self._get_entries())
+
+    def _get_entries(self):
+        for root, _, files in os.walk(self.path):
+            for fname in files:
+                if not fname.endswith(".pkl"):
+                    continue
+
+                fpath = os.path.join(root, fname)
+                try:
+                    stat = os.stat(fpath)
+                except FileNotFoundError:  # pragma: no cover # removed by someone else
+                    continue
+
+                yield stat.st_mtime, stat.st_size, fpath
+
+    def get(self, key):
+        """
+        Get a result, marking it as recently used
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        Returns
+        -------
+        :obj:`scmdata.ScmRun`
+            Result, ``None`` if no result is cached for ``key``
+        """
+        res = super().get(key)
+        if res is not None:
+            try:
+                os.utime(self._get_file(key))
+            except FileNotFoundError:  # pragma: no cover # evicted in the meantime
+                pass
+
+        return res
+
+    def put(self, key, res):
+        """
+        Cache a result, evicting the least recently used results if the cache
+        is too big
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        res : :obj:`scmdata.ScmRun`
+            Result to cache
+
+        Returns
+        -------
+        int
+            Size of the cached result in bytes
+        """
+        size = super().put(key, res)
+        with self._lock:
+            self._size += size
+            if self._size > self.max_size:
+                self._evict()
+
+        return size
+
+    def _evict(self):
+        entries = sorted(self._get_entries())
+        self._size = sum(size for _, size, _ in entries)
+        target_size = _EVICT_TO_FRACTION * self.max_size
+
+        for _, size, fpath in entries:
+            if self._size <= target_size:
+                break
+
+            LOGGER.debug("Evicting %s from the result cache", fpath)
+            try:
+                os.remove(fpath)
+            except FileNotFoundError:  # pragma: no cover # removed by someone else
+                pass
+
+            self._size -= size
+
+
+def _get_result_cache():
+    """
+    Get the result cache configured via ``OPENSCM_RUNNER_CACHE_DIR``
+
+    The same instance is returned for the same directory so the (potentially
+    large) cache directory is only walked the first time it is used.
+
+    Returns
+    -------
+    :obj:`_ResultCache`
+        Result cache, ``None`` if no cache is configured
+    """
+    cache_dir = config.get("OPENSCM_RUNNER_CACHE_DIR", None)
+    if not cache_dir:
+        return None
+
+    max_size_mb = float(config.get("OPENSCM_RUNNER_CACHE_MAX_SIZE_MB", 5000))
+    max_size = int(max_size_mb * 1024 ** 2)
+
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    with _RESULT_CACHES_LOCK:
+        try:
+            cache = _RESULT_CACHES[cache_dir]
+        except KeyError:
+            cache = _RESULT_CACHES[cache_dir] = _ResultCache(cache_dir, max_size)
+
+    cache.max_size = max_size
+
+    return cache
+
+
+class _StoringSink:  # pylint:disable=too-few-public-methods
+    """
+    Sink which splits results into work items, stores them and passes them on
+
+    The ``run_id`` of each result is updated from the value assigned by the
+    adapter when running a subset of the work items to the value it would
+    have had if all the work items had been run together.
+    """
+
+    def __init__(self, store, keys, run_ids, callback):
+        """
+        Initialise
+
+        Parameters
+        ----------
+        store : :obj:`_ResultStore`
+            Store in which to put the results
+
+        keys : dict[tuple, str]
+            Map from (scenario, model, ``run_id`` assigned by the adapter) to
+            the key of the work item
+
+        run_ids : dict[tuple, int]
+            Map from (scenario, model, ``run_id`` assigned by the adapter) to
+            the ``run_id`` to put in the output
+
+        callback : function
+            Function to call with each work item's result once it is stored
+        """
+        self.store = store
+        self.keys = keys
+        self.run_ids = run_ids
+        self.callback = callback
+
+    def write(self, scmrun):
+        """
+        Store results and pass them on
+
+        Parameters
+        ----------
+        scmrun : :obj:`scmdata.ScmRun`
+            Results to store
+        """
+        out = []
+        for work_item_res in scmrun.groupby("scenario", "model", "run_id"):
+            item_id = (
+                work_item_res.get_unique_meta("scenario", no_duplicates=True),
+                work_item_res.get_unique_meta("model", no_duplicates=True),
+                work_item_res.get_unique_meta("run_id", no_duplicates=True),
+            )
+            self.store.put(self.keys[item_id], work_item_res)
+
+            work_item_res["run_id"] = self.run_ids[item_id]
+            out.append(work_item_res)
+
+        self.callback(scmdata.run_append(out))
+
+
+def _run_with_result_store(  # pylint:disable=too-many-arguments,too-many-locals
+    adapter, store, scenarios, cfgs, output_variables, output_config, pool, sink
+):
+    """
+    Run an adapter, only running work items which aren't in ``store``
+
+    Parameters
+    ----------
+    adapter : :obj:`openscm_runner.adapters.base._Adapter`
+        Adapter to run
+
+    store : :obj:`_ResultStore`
+        Store of previously calculated results. New results are added to the
+        store as they are calculated.
+
+    scenarios : :obj:`pyam.IamDataFrame`
+        Scenarios to run
+
+    cfgs : list[dict]
+        The config with which to run the model
+
+    output_variables : list[str]
+        Variables to include in the output
+
+    output_config : tuple[str]
+        Configuration to include in the output
+
+    pool : :obj:`concurrent.futures.Executor`
+        Pool in which to run the model
+
+    sink : :obj:`openscm_runner.sinks.ResultSink`
+        Sink to which results are written, if ``None`` results are returned
+
+    Returns
+    -------
+    :obj:`scmdata.ScmRun`
+        Model output (``None`` if ``sink`` is supplied)
+    """
+    common_hash = _hash_cfg(
+        {
+            "adapter": type(adapter).__name__,
+            "version": adapter.get_version(),
+            "output_variables": sorted(output_variables),
+            "output_config": output_config,
+        }
+    )
+    cfg_hashes = [_hash_cfg(cfg) for cfg in cfgs]
+
+    # same ordering as the adapters use
+    scenario_timeseries = [
+        (scenario, model, ts)
+        for (scenario, model), ts in scmdata.ScmRun(scenarios.timeseries())
+        .timeseries()
+        .groupby(["scenario", "model"])
+    ]
+
+    results = []
+    if sink is None:
+        callback = results.append
+    else:
+        callback = sink.write
+
+    n_hits = 0
+    keys = []
+    misses = defaultdict(list)
+    with span("result store: lookup"):
+        for scenario_idx, (_, _, ts) in enumerate(scenario_timeseries):
+            scenario_hash = _hash_timeseries(ts)
+            scenario_keys = [
+                hashlib.sha256(
+                    "{}{}{}".format(common_hash, scenario_hash, cfg_hash).encode(
+                        "utf-8"
+                    )
+                ).hexdigest()
+                for cfg_hash in cfg_hashes
+            ]
+            keys.append(scenario_keys)
+
+            scenario_hits = []
+            scenario_misses = []
+            for cfg_idx, key in enumerate(scenario_keys):
+                res = store.get(key)
+                if res is None:
+                    scenario_misses.append(cfg_idx)
+                    continue
+
+                res["run_id"] = adapter._get_run_id(  # pylint:disable=protected-access
+                    scenario_idx, cfg_idx, len(cfgs), cfgs[cfg_idx]
+                )
+                scenario_hits.append(res)
+
+            if scenario_hits:
+                n_hits += len(scenario_hits)
+                callback(scmdata.run_append(scenario_hits))
+
+            if scenario_misses:
+                # group scenarios which are missing the same configs so they can be
+                # run together
+                misses[tuple(scenario_misses)].append(scenario_idx)
+
+    LOGGER.info(
+        "Found %d of %d results in %s",
+        n_hits,
+        len(scenario_timeseries) * len(cfgs),
+        store.path,
+    )
+
+    for cfg_idxs, scenario_idxs in misses.items():
+        run_keys = {}
+        run_ids = {}
+        for local_scenario_idx, scenario_idx in enumerate(scenario_idxs):
+            scenario, model, _ = scenario_timeseries[scenario_idx]
+            for local_cfg_idx, cfg_idx in enumerate(cfg_idxs):
+                item_id = (
+                    scenario,
+                    model,
+                    adapter._get_run_id(  # pylint:disable=protected-access
+                        local_scenario_idx, local_cfg_idx, len(cfg_idxs), cfgs[cfg_idx],
+                    ),
+                )
+                run_keys[item_id] = keys[scenario_idx][cfg_idx]
+                run_ids[
+                    item_id
+                ] = adapter._get_run_id(  # pylint:disable=protected-access
+                    scenario_idx, cfg_idx, len(cfgs), cfgs[cfg_idx]
+                )
+
+        LOGGER.debug(
+            "Running %d configs for %d scenarios", len(cfg_idxs), len(scenario_idxs)
+        )
+        adapter._call_run(  # pylint:disable=protected-access
+            scmdata.ScmRun(
+                pd.concat([scenario_timeseries[i][2] for i in scenario_idxs])
+            ),
+            # copy as some adapters alter the configs in place
+            [dict(cfgs[i]) for i in cfg_idxs],
+            output_variables,
+            output_config,
+            pool=pool,
+            sink=_StoringSink(store, run_keys, run_ids, callback),
+        )
+
+    if sink is not None:
+        return None
+
+    return scmdata.run_append(results)
@@ -0,0 +1,250 @@
+"""
+Estimation of how long work items will take to run
+
+Estimates are used to submit the most expensive work items first, which stops
+a few long jobs at the end of a batch from leaving all but one worker idle.
+Each adapter provides a cheap a priori estimate of each work item's cost (e.g.
+number of years simulated). As work items run, their runtimes are recorded so
+that later estimates can use measured runtimes instead.
+
+If ``OPENSCM_RUNNER_RUNTIME_HISTORY_FILE`` is set, the recorded runtimes are
+also loaded from and saved to this file so they are available to later
+sessions.
+"""
+import json
+import logging
+import os
+import os.path
+import tempfile
+import threading
+
+from ...settings import config
+
+LOGGER = logging.getLogger(__name__)
+
+_SMOOTHING = 0.5
+"""float: Weight given to the newest runtime when updating a runtime estimate"""
+
+
+def _update(old, new):
+    if old is None:
+        return new
+
+    return _SMOOTHING * new + (1 - _SMOOTHING) * old
+
+
+def _get_func_name(func):
+    return "{}.{}".format(func.__module__, func.__qualname__)
+
+
+class _RuntimeHistory:
+    """
+    Runtimes of previously run work items
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seconds_per_cost = {}
+        self._runtimes = {}
+        self._loaded_from = None
+
+    def _load(self):
+        history_file = config.get("OPENSCM_RUNNER_RUNTIME_HISTORY_FILE", None)
+        if not history_file or history_file == self._loaded_from:
+            return
+
+        history_file = os.path.expanduser(history_file)
+        try:
+            with open(history_file) as file_handle:
+                history = json.load(file_handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            history = {}
+
+        # anything recorded in this session is newer so takes precedence
+        self._seconds_per_cost = {
+            **history.get("seconds_per_cost", {}),
+            **self._seconds_per_cost,
+        }
+        self._runtimes = {**history.get("runtimes", {}), **self._runtimes}
+        self._loaded_from = history_file
+
+    def save(self):
+        """
+        Save the history to ``OPENSCM_RUNNER_RUNTIME_HISTORY_FILE`` (if set)
+        """
+        history_file = config.get("OPENSCM_RUNNER_RUNTIME_HISTORY_FILE", None)
+        if not history_file:
+            return
+
+        history_file = os.path.expanduser(history_file)
+        with self._lock:
+            self._load()
+            history = {
+                "seconds_per_cost": self._seconds_per_cost,
+                "runtimes": self._runtimes,
+            }
+
+        out_dir = os.path.dirname(os.path.abspath(history_file))
+        os.makedirs(out_dir, exist_ok=True)
+        file_descriptor, tmp_file = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as file_handle:
+            json.dump(history, file_handle)
+
+        os.replace(tmp_file, history_file)
+
+    def record(self, func, cost, runtime_key, runtime):
+        """
+        Record the runtime of a work item
+
+        Parameters
+        ----------
+        func : function
+            Function which ran the work item
+
+        cost : float
+            A priori estimate of the work item's cost
+
+        runtime_key : str
+            Key which identifies equivalent work items (``None`` if there is
+            no such key)
+
+        runtime : float
+            Runtime of the work item in seconds
+        """
+        func_name = _get_func_name(func)
+        with self._lock:
+            self._load()
+            if cost:
+                self._seconds_per_cost[func_name] = _update(
+                    self._seconds_per_cost.get(func_name), runtime / cost
+                )
+
+            if runtime_key is not None:
+                key = "{}|{}".format(func_name, runtime_key)
+                self._runtimes[key] = _update(self._runtimes.get(key), runtime)
+
+    def estimate(self, func, cost, runtime_key):
+        """
+        Estimate the runtime of a work item
+
+        Parameters
+        ----------
+        func : function
+            Function which will run the work item
+
+        cost : float
+            A priori estimate of the work item's cost
+
+        runtime_key : str
+            Key which identifies equivalent work items (``None`` if there is
+            no such key)
+
+        Returns
+        -------
+        float
+            Estimated runtime. Estimates for work items run by the same
+            ``func`` can be compared with each other but are not necessarily
+            in seconds.
+        """
+        func_name = _get_func_name(func)
+        with self._lock:
+            self._load()
+            if runtime_key is not None:
+                key = "{}|{}".format(func_name, runtime_key)
+                if key in self._runtimes:
+                    return self._runtimes[key]
+
+            return cost * self._seconds_per_cost.get(func_name, 1)
+
+    def mean_estimate(self, func, costs, runtime_keys):
+        """
+        Estimate the mean runtime of work items in seconds
+
+        Parameters
+        ----------
+        func : function
+            Function which will run the work items
+
+        costs : list[float]
+            A priori estimate of each work item's cost (``None`` if not
+            known)
+
+        runtime_keys : list[str]
+            Key which identifies equivalent work items for each work item
+            (``None`` if there are no such keys)
+
+        Returns
+        -------
+        float
+            Mean estimated runtime of the work items for which an estimate in
+            seconds is possible, ``None`` if no estimates are possible
+        """
+        func_name = _get_func_name(func)
+        n_items = len(costs) if costs is not None else len(runtime_keys or [])
+
+        estimates = []
+        with self._lock:
+            self._load()
+            seconds_per_cost = self._seconds_per_cost.get(func_name)
+            for i in range(n_items):
+                if runtime_keys is not None:
+                    key = "{}|{}".format(func_name, runtime_keys[i])
+                    if key in self._runtimes:
+                        estimates.append(self._runtimes[key])
+                        continue
+
+                if costs is not None and seconds_per_cost is not None:
+                    estimates.append(costs[i] * seconds_per_cost)
+
+        if not estimates:
+            return None
+
+        return sum(estimates) / len(estimates)
+
+
+_RUNTIME_HISTORY = _RuntimeHistory()
+
+
+def _get_submission_order(func, n_items, costs, runtime_keys):
+    """
+    Get the order in which to submit work items, most expensive first
+
+    Parameters
+    ----------
+    func : function
+        Function which will run the work items
+
+    n_items : int
+        Number of work items
+
+    costs : list[float]
+        A priori estimate of each work item's cost. If ``None``, all work
+        items are assumed to have the same a priori cost.
+
+    runtime_keys : list[str]
+        Key which identifies equivalent work items for each work item.
+        Equivalent work items have the same runtime so measured runtimes are
+        used in preference to ``costs`` where available.
+
+    Returns
+    -------
+    list[int]
+        Indices of the work items in the order in which they should be
+        submitted
+    """
+    if costs is None and runtime_keys is None:
+        return list(range(n_items))
+
+    estimates = [
+        _RUNTIME_HISTORY.estimate(
+            func,
+            1 if costs is None else costs[i],
+            None if runtime_keys is None else runtime_keys[i],
+        )
+        for i in range(n_items)
+    ]
+    # sort is stable so equal estimates keep their original order
+    order = sorted(range(n_items), key=lambda i: estimates[i], reverse=True)
+    LOGGER.debug("Submission order: %s", order)
+
+    return order
@@ -0,0 +1,386 @@
+"""
+Events describing the progress of running jobs
+
+Whilst a run is going, events are sent to any active listeners each time jobs
+are submitted to, completed by or fail in the workers. A listener is any
+function which takes a single event. To receive events, activate a listener
+with :func:`listening` and run as normal.
+
+.. code:: python
+
+    >>> from openscm_runner import run
+    >>> from openscm_runner.events import listening
+    >>> with listening(print):
+    ...     res = run(climate_models_cfgs, scenarios)
+    {'event': 'started', 'stage': 'FaIR run', 'n_jobs': 600, 'n_workers': 4, 'time': ...}
+    {'event': 'submitted', 'stage': 'FaIR run', 'n_jobs': 1, 'time': ...}
+    ...
+
+Each event is a :obj:`dict` with the keys ``event`` (the type of event, see
+below), ``stage`` (the name of the set of jobs, e.g. ``"FaIR run"``),
+``n_jobs`` (the number of jobs the event applies to) and ``time`` (seconds
+since the epoch). The types of event are
+
+- ``started``: a set of jobs is about to be submitted (also includes
+  ``n_workers``, the number of workers which will run them)
+- ``submitted``: jobs have been submitted to a worker
+- ``resubmitted``: jobs which are straggling have been submitted again (see
+  ``OPENSCM_RUNNER_STRAGGLER_FACTOR``)
+- ``completed``: jobs have completed (also includes ``busy_seconds``, the time
+  spent running them)
+- ``failed``: jobs have failed (also includes ``error``, a description of the
+  error)
+- ``finished``: a set of jobs is finished (whether or not all the jobs
+  succeeded)
+
+Listeners are called in the thread which collects the results so they should
+return quickly. :class:`JobMetrics` summarises events into metrics (e.g. jobs
+per second and estimated time to completion) and
+:class:`OpenMetricsFileExporter` writes these metrics to a file in the
+OpenMetrics text format, e.g. for the Prometheus node exporter's textfile
+collector.
+
+.. code:: python
+
+    >>> from openscm_runner.events import OpenMetricsFileExporter
+    >>> with OpenMetricsFileExporter("/path/to/textfile/openscm_runner.prom") as exporter:
+    ...     with listening(exporter):
+    ...         res = run(climate_models_cfgs, scenarios)
+"""
+import contextlib
+import contextvars
+import os
+import os.path
+import tempfile
+import threading
+import time
+
+_ACTIVE_LISTENERS = contextvars.ContextVar(
+    "openscm_runner_active_listeners", default=()
+)
+
+
+@contextlib.contextmanager
+def listening(listener):
+    """
+    Send events to ``listener`` (as well as any listeners which are already active)
+
+    Parameters
+    ----------
+    listener : function
+        Function which is called with each event
+
+    Yields
+    ------
+    function
+        ``listener``
+    """
+    token = _ACTIVE_LISTENERS.set(_ACTIVE_LISTENERS.get() + (listener,))
+    try:
+        yield listener
+    finally:
+        _ACTIVE_LISTENERS.reset(token)
+
+
+def emit(event, stage, n_jobs, **kwargs):
+    """
+    Send an event to all the active listeners
+
+    Parameters
+    ----------
+    event : str
+        Type of event
+
+    stage : str
+        Name of the set of jobs to which the event applies
+
+    n_jobs : int
+        Number of jobs to which the event applies
+
+    **kwargs
+        Any other information about the event
+    """
+    listeners = _ACTIVE_LISTENERS.get()
+    if not listeners:
+        return
+
+    out = {"event": event, "stage": stage, "n_jobs": n_jobs, **kwargs}
+    out["time"] = time.time()
+    for listener in listeners:
+        listener(out)
+
+
+class _StageMetrics:  # pylint:disable=too-many-instance-attributes,too-few-public-methods
+    def __init__(self):
+        self.total = 0
+        self.submitted = 0
+        self.resubmitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.n_workers = None
+        self.first_started = None
+        self.last_completed = None
+        self.n_running_sets = 0
+
+
+class JobMetrics:
+    """
+    Listener which summarises events into metrics for each stage
+    """
+
+    def __init__(self):
+        """
+        Initialise
+        """
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def __call__(self, event):
+        """
+        Update the metrics with an event
+
+        Parameters
+        ----------
+        event : dict
+            Event
+        """
+        with self._lock:
+            stage = self._stages.setdefault(event["stage"], _StageMetrics())
+            event_type = event["event"]
+            if event_type == "started":
+                stage.total += event["n_jobs"]
+                stage.n_workers = event.get("n_workers")
+                stage.n_running_sets += 1
+                if stage.first_started is None:
+                    stage.first_started = event["time"]
+
+            elif event_type == "submitted":
+                stage.submitted += event["n_jobs"]
+
+            elif event_type == "resubmitted":
+                stage.resubmitted += event["n_jobs"]
+
+            elif event_type == "completed":
+                stage.completed += event["n_jobs"]
+                stage.busy_seconds += event.get("busy_seconds", 0.0)
+                stage.last_completed = event["time"]
+
+            elif event_type == "failed":
+                stage.failed += event["n_jobs"]
+
+            elif event_type == "finished":
+                stage.n_running_sets -= 1
+
+    def snapshot(self, now=None):
+        """
+        Get the current metrics
+
+        Parameters
+        ----------
+        now : float
+            Current time in seconds since the epoch (used to calculate rates
+            and estimated completion times). If ``None``, the current time is
+            used.
+
+        Returns
+        -------
+        dict[str: dict]
+            For each stage
+
+            - ``total``: number of jobs
+            - ``submitted``, ``resubmitted``, ``completed``, ``failed``:
+              number of jobs submitted, submitted again (because they were
+              straggling), completed and failed
+            - ``in_flight``: number of jobs which have been submitted but have
+              neither completed nor failed (including jobs which are queued)
+            - ``jobs_per_second``: average number of jobs completed per second
+            - ``utilisation``: fraction of the workers' time spent running jobs
+              (``None`` if the number of workers isn't known)
+            - ``eta_seconds``: estimated time until all jobs are complete
+              (``None`` if no jobs have completed yet)
+            - ``running``: whether the stage is still running
+        """
+        now = time.time() if now is None else now
+        out = {}
+        with self._lock:
+            for name, stage in self._stages.items():
+                running = stage.n_running_sets > 0
+                end = now if running else (stage.last_completed or now)
+                elapsed = (
+                    0.0 if stage.first_started is None else end - stage.first_started
+                )
+                jobs_per_second = stage.completed / elapsed if elapsed > 0 else 0.0
+
+                remaining = stage.total - stage.completed - stage.failed
+                if not running:
+                    eta_seconds = 0.0
+                elif jobs_per_second > 0:
+                    eta_seconds = remaining / jobs_per_second
+                else:
+                    eta_seconds = None
+
+                if stage.n_workers and elapsed > 0:
+                    utilisation = stage.busy_seconds / (elapsed * stage.n_workers)
+                else:
+                    utilisation = None
+
+                out[name] = {
+                    "total": stage.total,
+                    "submitted": stage.submitted,
+                    "resubmitted": stage.resubmitted,
+                    "completed": stage.completed,
+                    "failed": stage.failed,
+                    "in_flight": stage.submitted - stage.completed - stage.failed,
+                    "jobs_per_second": jobs_per_second,
+                    "utilisation": utilisation,
+                    "eta_seconds": eta_seconds,
+                    "running": running,
+                }
+
+        return out
+
+
+_OPENMETRICS_COUNTERS = (
+    ("submitted", "Jobs submitted to workers"),
+    ("resubmitted", "Straggling jobs submitted to workers again"),
+    ("completed", "Jobs completed"),
+    ("failed", "Jobs failed"),
+)
+
+_OPENMETRICS_GAUGES = (
+    ("total", "Jobs in stages which have started"),
+    ("in_flight", "Jobs submitted but not yet complete"),
+    ("jobs_per_second", "Average number of jobs completed per second"),
+    ("utilisation", "Fraction of the workers' time spent running jobs"),
+    ("eta_seconds", "Estimated time until all jobs are complete"),
+    ("running", "Whether the stage is running"),
+)
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_openmetrics(snapshot):
+    """
+    Format metrics in the OpenMetrics text format
+
+    Parameters
+    ----------
+    snapshot : dict
+        Metrics (as returned by :meth:`JobMetrics.snapshot`)
+
+    Returns
+    -------
+    str
+        Metrics in the OpenMetrics text format
+    """
+    lines = []
+
+    def _add_family(name, metric_type, help_text, suffix):
+        family = "openscm_runner_{}".format(name)
+        lines.append("# TYPE {} {}".format(family, metric_type))
+        lines.append("# HELP {} {}".format(family, help_text))
+        for stage, metrics in sorted(snapshot.items()):
+            value = metrics[name]
+            if value is None:
+                continue
+
+            lines.append(
+                '{}{}{{stage="{}"}} {}'.format(
+                    family, suffix, _escape_label(stage), float(value)
+                )
+            )
+
+    for name, help_text in _OPENMETRICS_COUNTERS:
+        _add_family(name, "counter", help_text, "_total")
+
+    for name, help_text in _OPENMETRICS_GAUGES:
+        _add_family(name, "gauge", help_text, "")
+
+    lines.append("# EOF")
+
+    return "\n".join(lines) + "\n"
+
+
+class OpenMetricsFileExporter(JobMetrics):
+    """
+    Listener which writes metrics to a file in the OpenMetrics text format
+
+    The file is rewritten (atomically) at most every ``min_interval`` seconds,
+    whenever a stage finishes and when the exporter is closed.
+    """
+
+    def __init__(self, path, min_interval=5):
+        """
+        Initialise
+
+        Parameters
+        ----------
+        path : str
+            File to write
+
+        min_interval : float
+            Minimum number of seconds between writes
+        """
+        super().__init__()
+        self.path = os.path.expanduser(path)
+        self.min_interval = min_interval
+        self._write_lock = threading.Lock()
+        self._last_written = None
+
+    def __enter__(self):
+        """
+        Use the exporter as a context manager
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the exporter
+        """
+        self.close()
+
+    def __call__(self, event):
+        """
+        Update the metrics with an event, writing them if they are due
+
+        Parameters
+        ----------
+        event : dict
+            Event
+        """
+        super().__call__(event)
+
+        now = time.monotonic()
+        due = (
+            event["event"] == "finished"
+            or self._last_written is None
+            or now - self._last_written >= self.min_interval
+        )
+        if due:
+            self.write()
+
+    def write(self):
+        """
+        Write the current metrics
+        """
+        with self._write_lock:
+            self._last_written = time.monotonic()
+            out_dir = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(out_dir, exist_ok=True)
+            file_descriptor, tmp_file = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as file_handle:
+                file_handle.write(to_openmetrics(self.snapshot()))
+
+            # mkstemp only lets the owner read the file, the collector may not
+            # be running as us
+            os.chmod(tmp_file, 0o644)
+            os.replace(tmp_file, self.path)
+
+    def close(self):
+        """
+        Write the final metrics
+        """
+        self.write()
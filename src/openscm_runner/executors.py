@@ -0,0 +1,239 @@
+"""
+Executors in which to run climate models
+
+Any :class:`concurrent.futures.Executor` can be passed to
+:func:`openscm_runner.run.run` via its ``pool`` argument and every adapter
+submits its jobs to it. This module provides executors for the common cases:
+
+- :class:`SerialExecutor` runs every job in the calling thread, which is
+  useful for debugging and profiling without any process overhead
+- :class:`WorkerPool` runs jobs in a pool of local processes
+- :class:`DaskExecutor` runs jobs on a dask-distributed cluster, so the same
+  job can run on a :class:`distributed.LocalCluster` on one machine or fan
+  out over many nodes
+
+A :class:`concurrent.futures.ThreadPoolExecutor` can also be used directly.
+
+Re-using executors
+~~~~~~~~~~~~~~~~~~
+
+By default, every call to :func:`openscm_runner.run.run` starts new worker
+processes and shuts them down again once the climate models have been run.
+When :func:`openscm_runner.run.run` is called many times (e.g. in a
+calibration loop), this start-up cost can dominate. A
+:class:`WorkerPool` keeps its workers (and e.g. their copies of MAGICC) alive
+until it is shut down, so only the first call pays the start-up cost.
+
+.. code:: python
+
+    >>> from openscm_runner import run
+    >>> from openscm_runner.executors import WorkerPool
+    >>> with WorkerPool(max_workers=8, climate_models=["MAGICC7"]) as pool:
+    ...     for climate_models_cfgs in calibration_cfgs:
+    ...         res = run(climate_models_cfgs, scenarios, pool=pool)
+"""
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
+from .adapters import get_adapter
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _init_worker(climate_models):
+    LOGGER.debug("Initialising worker %s", multiprocessing.current_process())
+    for climate_model in climate_models:
+        get_adapter(climate_model)._init_worker()  # pylint:disable=protected-access
+
+
+def _check_climate_models(climate_models):
+    # resolve in the parent so we fail immediately for unknown models
+    climate_models = tuple(climate_models)
+    for climate_model in climate_models:
+        get_adapter(climate_model)
+
+    return climate_models
+
+
+class SerialExecutor(Executor):
+    """
+    Executor which runs each job in the calling thread as soon as it is submitted
+    """
+
+    def __init__(self):
+        """
+        Initialise the executor
+        """
+        self._shutdown = False
+        self._shutdown_lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):  # pylint:disable=arguments-differ
+        """
+        Run a job
+
+        Parameters
+        ----------
+        fn : function
+            Function to run
+
+        *args
+            Passed to ``fn``
+
+        **kwargs
+            Passed to ``fn``
+
+        Returns
+        -------
+        :obj:`concurrent.futures.Future`
+            Future which is already complete
+
+        Raises
+        ------
+        RuntimeError
+            The executor has been shut down
+        """
+        with self._shutdown_lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+
+        future = Future()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:  # pylint:disable=broad-except
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+        return future
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the executor
+
+        Parameters
+        ----------
+        wait : bool
+            Ignored, all jobs are complete by the time they are submitted
+        """
+        with self._shutdown_lock:
+            self._shutdown = True
+
+
+class WorkerPool(ProcessPoolExecutor):
+    """
+    Process pool whose workers are prepared to run climate models
+
+    Each worker imports the adapters for ``climate_models`` and does any
+    expensive setup (e.g. copying MAGICC) as soon as it starts. Workers keep
+    this state until the pool is shut down, so it is re-used by every call to
+    :func:`openscm_runner.run.run` to which the pool is passed.
+    """
+
+    def __init__(self, max_workers=None, climate_models=(), mp_context=None):
+        """
+        Initialise the pool
+
+        Parameters
+        ----------
+        max_workers : int
+            Number of worker processes. If ``None``, the number of CPUs is
+            used.
+
+        climate_models : list[str]
+            Climate models to prepare each worker for. Other climate models
+            can still be run in the pool, their setup just happens when they
+            are first run in each worker.
+
+        mp_context : :obj:`multiprocessing.context.BaseContext`
+            Context with which to start the worker processes (passed to
+            :class:`concurrent.futures.ProcessPoolExecutor`)
+        """
+        climate_models = _check_climate_models(climate_models)
+
+        super().__init__(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(climate_models,),
+        )
+        self.climate_models = climate_models
+
+
+class DaskExecutor(Executor):
+    """
+    Executor which runs jobs on a dask-distributed cluster
+
+    Requires dask-distributed to be installed (``pip install distributed``).
+
+    .. code:: python
+
+        >>> from distributed import Client, LocalCluster
+        >>> from openscm_runner.executors import DaskExecutor
+        >>> client = Client(LocalCluster(n_workers=4))
+        >>> with DaskExecutor(client, climate_models=["FaIR"]) as pool:
+        ...     res = run(climate_models_cfgs, scenarios, pool=pool)
+    """
+
+    def __init__(self, client, climate_models=(), **kwargs):
+        """
+        Initialise the executor
+
+        Parameters
+        ----------
+        client : :obj:`distributed.Client`
+            Client connected to the cluster on which to run the jobs
+
+        climate_models : list[str]
+            Climate models to prepare each worker for (see
+            :class:`WorkerPool`)
+
+        **kwargs
+            Passed to :meth:`distributed.Client.get_executor`
+        """
+        climate_models = _check_climate_models(climate_models)
+        if climate_models:
+            client.register_worker_callbacks(
+                setup=functools.partial(_init_worker, climate_models)
+            )
+
+        self.client = client
+        self.climate_models = climate_models
+        self._executor = client.get_executor(**kwargs)
+
+    def submit(self, fn, *args, **kwargs):  # pylint:disable=arguments-differ
+        """
+        Submit a job to the cluster
+
+        Parameters
+        ----------
+        fn : function
+            Function to run
+
+        *args
+            Passed to ``fn``
+
+        **kwargs
+            Passed to ``fn``
+
+        Returns
+        -------
+        :obj:`concurrent.futures.Future`
+            Future representing the job
+        """
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting jobs
+
+        The client and cluster are left running.
+
+        Parameters
+        ----------
+        wait : bool
+            Wait for any outstanding jobs to complete before returning
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,158 @@
+"""
+Journals which allow interrupted runs to be resumed
+
+A journal records each completed run and saves its output to disk as soon as
+it is available. If a job dies part way through (e.g. it runs out of memory
+or the node it is on is pre-empted), calling :func:`openscm_runner.run.run`
+again with the same inputs and a journal which resumes from the same
+directory only runs the work which wasn't finished.
+
+.. code:: python
+
+    >>> from openscm_runner import run
+    >>> from openscm_runner.journal import RunJournal
+    >>> res = run(
+    ...     climate_models_cfgs,
+    ...     scenarios,
+    ...     journal=RunJournal("/path/to/journal"),
+    ... )
+    >>> # after a crash, only the runs which didn't finish are run
+    >>> res = run(
+    ...     climate_models_cfgs,
+    ...     scenarios,
+    ...     journal=RunJournal("/path/to/journal", resume=True),
+    ... )
+
+Runs are identified by a hash of the scenario's data, the config, the climate
+model version, the output variables and the output config, so changing any of
+these means the affected runs are run again.
+"""
+import json
+import logging
+import os
+import os.path
+import threading
+
+from .adapters.utils._result_store import _ResultStore
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RunJournal(_ResultStore):
+    """
+    Journal of completed runs
+    """
+
+    _journal_file_name = "journal.jsonl"
+
+    def __init__(self, path, resume=False):
+        """
+        Initialise the journal
+
+        Parameters
+        ----------
+        path : str
+            Directory in which to keep the journal
+
+        resume : bool
+            Should the runs recorded in an existing journal in ``path`` be
+            re-used?
+
+        Raises
+        ------
+        ValueError
+            ``path`` already contains a journal and ``resume`` is ``False``
+        """
+        super().__init__(path)
+        self._journal_file = os.path.join(self.path, self._journal_file_name)
+        self._lock = threading.Lock()
+
+        if os.path.exists(self._journal_file) and not resume:
+            raise ValueError(
+                "A journal already exists in {}, pass `resume=True` to resume "
+                "from it".format(self.path)
+            )
+
+        self._completed = set()
+        if resume and os.path.exists(self._journal_file):
+            with open(self._journal_file) as file_handle:
+                for line in file_handle:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # last line may be incomplete if we died whilst writing
+                        continue
+
+                    self._completed.add(entry["key"])
+
+            LOGGER.info(
+                "Resuming from %d completed runs in %s",
+                len(self._completed),
+                self.path,
+            )
+
+    @property
+    def n_completed(self):
+        """
+        int: Number of runs recorded in the journal
+        """
+        return len(self._completed)
+
+    def get(self, key):
+        """
+        Get a completed run's output
+
+        Parameters
+        ----------
+        key : str
+            Key of the run
+
+        Returns
+        -------
+        :obj:`scmdata.ScmRun`
+            Output, ``None`` if the run is not recorded in the journal
+        """
+        if key not in self._completed:
+            return None
+
+        return super().get(key)
+
+    def put(self, key, res):
+        """
+        Record a completed run
+
+        The output is written to disk before the run is recorded in the
+        journal so the journal never refers to output which doesn't exist.
+
+        Parameters
+        ----------
+        key : str
+            Key of the run
+
+        res : :obj:`scmdata.ScmRun`
+            Output of the run
+
+        Returns
+        -------
+        int
+            Size of the saved output in bytes
+        """
+        size = super().put(key, res)
+
+        entry = {
+            "key": key,
+            **{
+                col: str(res.get_unique_meta(col, no_duplicates=True))
+                for col in ("climate_model", "model", "scenario")
+                if col in res.meta.columns
+            },
+        }
+        with self._lock:
+            with open(self._journal_file, "a") as file_handle:
+                file_handle.write("{}\n".format(json.dumps(entry)))
+                file_handle.flush()
+                os.fsync(file_handle.fileno())
+
+            self._completed.add(key)
+
+        return size
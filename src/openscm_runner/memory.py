@@ -0,0 +1,168 @@
+"""
+Accounting of peak memory use
+
+If ``OPENSCM_RUNNER_TRACK_MEMORY`` is set, :mod:`tracemalloc` is started for
+the duration of each call to :func:`openscm_runner.run.run` (and in each
+worker whilst it runs jobs, as long as a tracer is active to record the
+results). Each span recorded by
+:mod:`openscm_runner.tracing` (e.g. preparing emissions, each job, reading
+output and appending results) then also records the peak memory allocated by
+Python whilst it was running and each job records the peak resident set size
+(RSS) of the worker which ran it. :func:`openscm_runner.run.run` attaches a
+summary of these to its output's metadata as a JSON string.
+
+.. code:: python
+
+    >>> import json
+    >>> json.loads(res.metadata["memory"])
+    {'stages': {'FaIR': 1203450112, 'FaIR: scmdf_to_emissions': 312104960, ...},
+     'workers': {'12345': {'jobs': 150, 'seconds': 40.2, 'peak_memory': 21045248,
+     'max_rss': 190054400}, ...}}
+
+All values are in bytes. The peak memory of a stage is the peak of all the
+memory traced in its process whilst the stage was running, so it includes
+memory held by anything running at the same time (e.g. in other threads).
+Memory allocated outside of Python (e.g. by model binaries) is not traced,
+although the memory of the workers themselves is included in their RSS.
+
+Tracing allocations slows Python down, so memory tracking should not be left
+on in production. Peak memory of stages requires Python 3.9 or later (earlier
+versions only record the RSS of the workers).
+"""
+import contextlib
+import itertools
+import logging
+import sys
+import threading
+import tracemalloc
+
+from .settings import config
+
+try:
+    import resource
+except ImportError:  # pragma: no cover # not available on Windows
+    resource = None
+
+LOGGER = logging.getLogger(__name__)
+
+_CAN_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+_OPEN_PEAKS = {}
+"""dict: Peak memory so far of each measurement which is in progress"""
+
+_OPEN_PEAKS_LOCK = threading.Lock()
+
+_MEASUREMENT_IDS = itertools.count()
+
+
+def _get_track_memory():
+    """
+    Get whether memory use should be tracked
+
+    Returns
+    -------
+    bool
+        ``True`` if ``OPENSCM_RUNNER_TRACK_MEMORY`` is set to a true value
+    """
+    track_memory = config.get("OPENSCM_RUNNER_TRACK_MEMORY", None)
+    if not track_memory:
+        return False
+
+    return str(track_memory).lower() not in ("0", "false", "no", "off")
+
+
+@contextlib.contextmanager
+def tracking_memory(enabled=True):
+    """
+    Trace memory allocations whilst in this context
+
+    Does nothing if ``enabled`` is ``False`` or memory allocations are
+    already being traced (e.g. by an enclosing call).
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to trace memory allocations
+
+    Yields
+    ------
+    bool
+        Whether memory allocations are being traced
+    """
+    if not enabled or tracemalloc.is_tracing():
+        yield tracemalloc.is_tracing()
+        return
+
+    if not _CAN_RESET_PEAK:
+        LOGGER.warning(
+            "Peak memory of stages can only be tracked with Python 3.9 or later"
+        )
+
+    tracemalloc.start()
+    try:
+        yield True
+    finally:
+        tracemalloc.stop()
+
+
+def _fold_peak():
+    # must be called with _OPEN_PEAKS_LOCK held. tracemalloc only has a single
+    # (per process) peak so, before it is reset, the peak so far is passed on
+    # to every measurement in progress
+    _, peak = tracemalloc.get_traced_memory()
+    for key, open_peak in _OPEN_PEAKS.items():
+        _OPEN_PEAKS[key] = max(open_peak, peak)
+
+    tracemalloc.reset_peak()
+
+
+@contextlib.contextmanager
+def _measure_peak_memory():
+    """
+    Measure the peak traced memory whilst in this context
+
+    Yields
+    ------
+    dict
+        Measurement, its ``"peak"`` (in bytes) is set on exit (it is left as
+        ``None`` if memory allocations aren't being traced)
+    """
+    measurement = {"peak": None}
+    if not _CAN_RESET_PEAK or not tracemalloc.is_tracing():
+        yield measurement
+        return
+
+    key = next(_MEASUREMENT_IDS)
+    with _OPEN_PEAKS_LOCK:
+        _fold_peak()
+        _OPEN_PEAKS[key], _ = tracemalloc.get_traced_memory()
+
+    try:
+        yield measurement
+    finally:
+        with _OPEN_PEAKS_LOCK:
+            if tracemalloc.is_tracing():
+                _fold_peak()
+
+            measurement["peak"] = _OPEN_PEAKS.pop(key)
+
+
+def _get_max_rss():
+    """
+    Get the peak resident set size of this process
+
+    Returns
+    -------
+    int
+        Peak resident set size in bytes, ``None`` if it isn't available on
+        this platform
+    """
+    if resource is None:  # pragma: no cover
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # pragma: no cover
+        return max_rss
+
+    # kilobytes everywhere else
+    return max_rss * 1024
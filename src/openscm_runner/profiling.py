@@ -0,0 +1,204 @@
+"""
+Profiling of the jobs run in workers
+
+If ``OPENSCM_RUNNER_PROFILE_DIR`` is set, every job is run under
+:mod:`cProfile`. Each worker (process and thread) writes its profile to its
+own file and, at the end of :func:`openscm_runner.run.run`, the profiles are
+merged into a single profile (``merged.prof``) and a text report of the
+functions with the highest cumulative time (``merged.txt``). Each call to
+:func:`openscm_runner.run.run` writes its profiles to a new sub-directory of
+``OPENSCM_RUNNER_PROFILE_DIR``.
+
+The merged profile can be inspected with e.g. :mod:`pstats` or snakeviz.
+
+.. code:: python
+
+    >>> import pstats
+    >>> pstats.Stats("/path/to/profiles/run-.../merged.prof").sort_stats(
+    ...     "tottime"
+    ... ).print_stats(20)
+
+Profiles are written by the workers so, if the workers are on other machines
+(e.g. with :class:`openscm_runner.executors.DaskExecutor`),
+``OPENSCM_RUNNER_PROFILE_DIR`` must be on a shared filesystem for the
+profiles to be merged.
+"""
+import contextlib
+import contextvars
+import cProfile
+import glob
+import itertools
+import logging
+import os
+import os.path
+import pstats
+import socket
+import tempfile
+import threading
+import time
+
+from .settings import config
+
+LOGGER = logging.getLogger(__name__)
+
+_REPORT_N_FUNCTIONS = 50
+"""int: Number of functions to include in the text report"""
+
+_RUN_PROFILE_DIR = contextvars.ContextVar(
+    "openscm_runner_run_profile_dir", default=None
+)
+
+_RUN_COUNTER = itertools.count()
+
+_PROFILERS = {}
+"""dict: Profiler of each (profile directory, process, thread)"""
+
+_PROFILERS_LOCK = threading.Lock()
+
+
+def _get_profile_dir():
+    """
+    Get the directory in which jobs should write their profiles
+
+    Returns
+    -------
+    str
+        Directory in which to write profiles, ``None`` if profiling is not
+        enabled
+    """
+    run_profile_dir = _RUN_PROFILE_DIR.get()
+    if run_profile_dir is not None:
+        return run_profile_dir
+
+    profile_dir = config.get("OPENSCM_RUNNER_PROFILE_DIR", None)
+    if not profile_dir:
+        return None
+
+    return os.path.expanduser(profile_dir)
+
+
+def _get_profiler(profile_dir):
+    key = (profile_dir, os.getpid(), threading.get_ident())
+    with _PROFILERS_LOCK:
+        if key not in _PROFILERS:
+            # a new run has started, workers which are re-used across runs
+            # don't need their profiles from earlier runs any more
+            for old_key in [k for k in _PROFILERS if k[1:] == key[1:]]:
+                del _PROFILERS[old_key]
+
+            _PROFILERS[key] = cProfile.Profile()
+
+        return _PROFILERS[key]
+
+
+@contextlib.contextmanager
+def _profile_job(profile_dir):
+    """
+    Profile a job, adding the result to this worker's profile
+    """
+    if profile_dir is None:
+        yield
+        return
+
+    profiler = _get_profiler(profile_dir)
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+
+
+def _write_worker_profile(profile_dir):
+    """
+    Write this worker's profile (if it has one) to ``profile_dir``
+    """
+    if profile_dir is None:
+        return
+
+    key = (profile_dir, os.getpid(), threading.get_ident())
+    with _PROFILERS_LOCK:
+        profiler = _PROFILERS.get(key)
+
+    if profiler is None:
+        return
+
+    os.makedirs(profile_dir, exist_ok=True)
+    out_file = os.path.join(
+        profile_dir,
+        "worker-{}-{}-{}.prof".format(
+            socket.gethostname(), os.getpid(), threading.get_ident()
+        ),
+    )
+    # write then rename so the profile can't be merged whilst half-written
+    file_descriptor, tmp_file = tempfile.mkstemp(dir=profile_dir, suffix=".tmp")
+    os.close(file_descriptor)
+    profiler.dump_stats(tmp_file)
+    os.replace(tmp_file, out_file)
+
+
+def merge_profiles(profile_dir):
+    """
+    Merge the worker profiles in a directory
+
+    Writes the merged profile to ``merged.prof`` and a report of the functions
+    with the highest cumulative time to ``merged.txt`` in ``profile_dir``.
+
+    Parameters
+    ----------
+    profile_dir : str
+        Directory containing the worker profiles
+
+    Returns
+    -------
+    :obj:`pstats.Stats`
+        Merged profile, ``None`` if there are no worker profiles
+    """
+    worker_files = sorted(glob.glob(os.path.join(profile_dir, "worker-*.prof")))
+    if not worker_files:
+        LOGGER.info("No worker profiles in %s", profile_dir)
+        return None
+
+    merged = pstats.Stats(*worker_files)
+    merged.dump_stats(os.path.join(profile_dir, "merged.prof"))
+
+    with open(os.path.join(profile_dir, "merged.txt"), "w") as file_handle:
+        report = pstats.Stats(*worker_files, stream=file_handle)
+        file_handle.write("Merged from {} worker profiles\n".format(len(worker_files)))
+        report.sort_stats("cumulative").print_stats(_REPORT_N_FUNCTIONS)
+
+    LOGGER.info(
+        "Merged %d worker profiles into %s", len(worker_files), profile_dir,
+    )
+
+    return merged
+
+
+@contextlib.contextmanager
+def _profiling_run():
+    """
+    Profile the jobs run in a call to :func:`openscm_runner.run.run`
+
+    Does nothing unless ``OPENSCM_RUNNER_PROFILE_DIR`` is set. Otherwise, the
+    jobs write their profiles to a new sub-directory of
+    ``OPENSCM_RUNNER_PROFILE_DIR`` and the profiles are merged at the end.
+    """
+    profile_root = config.get("OPENSCM_RUNNER_PROFILE_DIR", None)
+    if not profile_root:
+        yield
+        return
+
+    run_profile_dir = os.path.join(
+        os.path.expanduser(profile_root),
+        "run-{}-{}-{}".format(
+            time.strftime("%Y%m%d-%H%M%S"), os.getpid(), next(_RUN_COUNTER)
+        ),
+    )
+    os.makedirs(run_profile_dir)
+    LOGGER.info("Writing profiles to %s", run_profile_dir)
+
+    token = _RUN_PROFILE_DIR.set(run_profile_dir)
+    try:
+        yield
+    finally:
+        _RUN_PROFILE_DIR.reset(token)
+        merge_profiles(run_profile_dir)
@@ -2,8 +2,6 @@
 Progress bar wrapper
 """
 
-from tqdm.autonotebook import tqdm
-
 # TODO: handle configuration in a consistent manner
 _default_tqdm_params = {
     "mininterval": 5,
@@ -32,5 +30,8 @@ def progress(*args, **kwargs):
     tqdm.auto_notebook.tqdm
         tqdm instance with consistent configuration
     """
+    # imported here as tqdm.autonotebook is slow to import
+    from tqdm.autonotebook import tqdm  # pylint:disable=import-outside-toplevel
+
     kwargs = {**_default_tqdm_params, **kwargs}
     return tqdm(*args, **kwargs)
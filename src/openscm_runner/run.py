@@ -1,12 +1,19 @@
 """
 High-level run function
 """
+import contextvars
+import itertools
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import scmdata
 
-from .adapters import CICEROSCM, FAIR, MAGICC7
+from .adapters import get_adapter
+from .memory import _get_track_memory, tracking_memory
+from .profiling import _profiling_run
 from .progress import progress
+from .tracing import Tracer, span, tracing
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,12 +36,49 @@ def _check_out_config(out_config, climate_models_cfgs):
                 )
 
 
+def _get_adapter(climate_model):
+    return get_adapter(climate_model)()
+
+
+def _run_model(  # pylint:disable=too-many-arguments
+    runner,
+    climate_model,
+    cfgs,
+    scenarios,
+    output_variables,
+    out_config,
+    pool,
+    sink,
+    journal,
+):
+    if out_config is not None and climate_model in out_config:
+        output_config_cm = out_config[climate_model]
+        LOGGER.debug("Using output config: %s for %s", output_config_cm, climate_model)
+    else:
+        LOGGER.debug("No output config for %s", climate_model)
+        output_config_cm = None
+
+    with span(climate_model, category="climate model"):
+        return runner.run(
+            scenarios,
+            cfgs,
+            output_variables=output_variables,
+            output_config=output_config_cm,
+            pool=pool,
+            sink=sink,
+            journal=journal,
+        )
+
+
 def run(
     climate_models_cfgs,
     scenarios,
     output_variables=("Surface Temperature",),
     out_config=None,
-):  # pylint: disable=W9006
+    pool=None,
+    sink=None,
+    journal=None,
+):  # pylint: disable=W9006,too-many-arguments
     """
     Run a number of climate models over a number of scenarios
 
@@ -55,10 +99,35 @@ def run(
         Dictionary where each key is a model and each value is a tuple of
         configuration values to include in the output's metadata.
 
+    pool : :obj:`concurrent.futures.Executor`
+        Pool into which every climate model submits its jobs (see
+        :mod:`openscm_runner.executors` for serial, process pool and
+        dask-distributed executors). If supplied, the climate models are run
+        concurrently so that the pool's workers
+        are shared across model boundaries and the ``*_WORKER_NUMBER``
+        settings are ignored. The pool is not shut down by this function.
+        If ``None``, the climate models are run one after another and each
+        adapter manages its own pool.
+
+    sink : :obj:`openscm_runner.sinks.ResultSink`
+        Sink to which each model's results are written as soon as they are
+        available (see :mod:`openscm_runner.sinks`). If supplied, results are
+        not collected in memory and ``None`` is returned.
+
+    journal : :obj:`openscm_runner.journal.RunJournal`
+        Journal in which each completed run is recorded (see
+        :mod:`openscm_runner.journal`). Runs which are already recorded in the
+        journal are not run again, so an interrupted job can be resumed.
+
     Returns
     -------
     :obj:`scmdata.ScmRun`
-        Model output
+        Model output (``None`` if ``sink`` is supplied). The time spent in
+        each stage of the run is stored as a JSON string in the output's
+        ``metadata["timings"]`` (see :mod:`openscm_runner.tracing`). If
+        ``OPENSCM_RUNNER_TRACK_MEMORY`` is set, the peak memory of each stage
+        and worker is stored as a JSON string in ``metadata["memory"]`` (see
+        :mod:`openscm_runner.memory`).
 
     Raises
     ------
@@ -68,39 +137,87 @@ def run(
     TypeError
         A value in ``out_config`` is not a :obj:`tuple`
     """
-    _check_out_config(out_config, climate_models_cfgs)
+    track_memory = _get_track_memory()
+    # the totals don't need the stages within each job, so the workers only
+    # send these back if the caller is tracing too
+    run_tracer = Tracer(keep_spans=False, job_stages=False)
+    with tracing(run_tracer), _profiling_run(), tracking_memory(track_memory):
+        scmdf = _run(
+            climate_models_cfgs,
+            scenarios,
+            output_variables=output_variables,
+            out_config=out_config,
+            pool=pool,
+            sink=sink,
+            journal=journal,
+        )
 
-    res = []
-    for climate_model, cfgs in progress(
-        climate_models_cfgs.items(), desc="Climate models"
-    ):
-        if climate_model == "MAGICC7":
-            runner = MAGICC7()
-        elif climate_model.upper() == "FAIR":  # allow various capitalisations
-            runner = FAIR()
-        elif climate_model.upper() == "CICEROSCM":  # allow various capitalisations
-            runner = CICEROSCM()
-        else:
-            raise NotImplementedError(
-                "No adapter available for {}".format(climate_model)
+    if scmdf is not None:
+        timings = run_tracer.summary()
+        scmdf.metadata["timings"] = json.dumps(timings)
+        if track_memory:
+            scmdf.metadata["memory"] = json.dumps(
+                {
+                    "stages": {
+                        name: stage["peak_memory"]
+                        for name, stage in timings.items()
+                        if "peak_memory" in stage
+                    },
+                    "workers": run_tracer.worker_summary(),
+                }
             )
 
-        if out_config is not None and climate_model in out_config:
-            output_config_cm = out_config[climate_model]
-            LOGGER.debug(
-                "Using output config: %s for %s", output_config_cm, climate_model
+    return scmdf
+
+
+def _run(  # pylint:disable=too-many-arguments,too-many-locals
+    climate_models_cfgs, scenarios, output_variables, out_config, pool, sink, journal
+):
+    _check_out_config(out_config, climate_models_cfgs)
+
+    # get all the adapters up front so we fail before any models are run
+    runners = {
+        climate_model: _get_adapter(climate_model)
+        for climate_model in climate_models_cfgs
+    }
+
+    run_model_kwargs = dict(
+        scenarios=scenarios,
+        output_variables=output_variables,
+        out_config=out_config,
+        pool=pool,
+        sink=sink,
+        journal=journal,
+    )
+    if pool is None:
+        res = [
+            _run_model(runners[climate_model], climate_model, cfgs, **run_model_kwargs)
+            for climate_model, cfgs in progress(
+                climate_models_cfgs.items(), desc="Climate models"
             )
-        else:
-            LOGGER.debug("No output config for %s", climate_model)
-            output_config_cm = None
+        ]
+    else:
+        LOGGER.info("Running climate models concurrently in the provided pool")
+        with ThreadPoolExecutor(
+            max_workers=len(climate_models_cfgs)
+        ) as climate_model_threads:
+            # copy the context so the climate models' spans are recorded
+            futures = [
+                climate_model_threads.submit(
+                    contextvars.copy_context().run,
+                    _run_model,
+                    runners[climate_model],
+                    climate_model,
+                    cfgs,
+                    **run_model_kwargs,
+                )
+                for climate_model, cfgs in climate_models_cfgs.items()
+            ]
+            res = [future.result() for future in futures]
 
-        model_res = runner.run(
-            scenarios,
-            cfgs,
-            output_variables=output_variables,
-            output_config=output_config_cm,
-        )
-        res.append(model_res)
+    if sink is not None:
+        LOGGER.info("All results written to the sink")
+        return None
 
     for i, model_res in enumerate(res):
         if i < 1:
@@ -120,6 +237,102 @@ def run(
         scmdf = res[0]
     else:
         LOGGER.info("Appending model results")
-        scmdf = scmdata.run_append(res)
+        with span("run_append"):
+            scmdf = scmdata.run_append(res)
 
     return scmdf
+
+
+def _get_scenario_batches(scenarios, scenario_batch_size):
+    model_scenarios = (
+        scenarios.timeseries()
+        .index.to_frame(index=False)[["model", "scenario"]]
+        .drop_duplicates()
+        .sort_values(["model", "scenario"])
+    )
+    for model, model_df in itertools.groupby(
+        model_scenarios.itertuples(index=False), key=lambda x: x.model
+    ):
+        scenario_names = [v.scenario for v in model_df]
+        for i in range(0, len(scenario_names), scenario_batch_size):
+            yield model, scenario_names[i : i + scenario_batch_size]
+
+
+def run_iter(  # pylint:disable=too-many-arguments
+    climate_models_cfgs,
+    scenarios,
+    output_variables=("Surface Temperature",),
+    out_config=None,
+    pool=None,
+    scenario_batch_size=1,
+    journal=None,
+):
+    """
+    Run a number of climate models over a number of scenarios, yielding results as we go
+
+    Unlike :func:`run`, the results are never all held in memory at once. The
+    scenarios are split into batches and the results for each batch are
+    yielded as soon as all the climate models have been run for that batch.
+    This allows the results to be written to disk or reduced (e.g. with
+    :func:`openscm_runner.utils.calculate_quantiles`) incrementally.
+
+    ``run_id`` values are only unique within each yielded result.
+
+    Parameters
+    ----------
+    climate_models_cfgs : dict[str: list]
+        Dictionary where each key is a model and each value is the configs
+        with which to run the model. The configs are passed to the model
+        adapter.
+
+    scenarios : :obj:`pyam.IamDataFrame`
+        Scenarios to run
+
+    output_variables : list[str]
+        Variables to include in the output
+
+    out_config : dict[str: tuple of str]
+        Dictionary where each key is a model and each value is a tuple of
+        configuration values to include in the output's metadata.
+
+    pool : :obj:`concurrent.futures.Executor`
+        Pool into which every climate model submits its jobs (see
+        :func:`run`). Supplying a pool is recommended as it avoids starting
+        new workers for every batch.
+
+    scenario_batch_size : int
+        Maximum number of scenarios to run in each batch. Each batch only
+        contains scenarios from a single (IAM) model.
+
+    journal : :obj:`openscm_runner.journal.RunJournal`
+        Journal in which each completed run is recorded (see :func:`run`)
+
+    Yields
+    ------
+    :obj:`scmdata.ScmRun`
+        Model output for each batch of scenarios
+
+    Raises
+    ------
+    ValueError
+        ``scenario_batch_size`` is less than one
+    """
+    if scenario_batch_size < 1:
+        raise ValueError(
+            "`scenario_batch_size` must be at least 1, received: {}".format(
+                scenario_batch_size
+            )
+        )
+
+    _check_out_config(out_config, climate_models_cfgs)
+
+    for model, scenario_names in _get_scenario_batches(scenarios, scenario_batch_size):
+        LOGGER.debug("Running batch: model %s, scenarios %s", model, scenario_names)
+        yield run(
+            climate_models_cfgs,
+            scenarios.filter(model=model, scenario=scenario_names),
+            output_variables=output_variables,
+            out_config=out_config,
+            pool=pool,
+            journal=journal,
+        )
@@ -0,0 +1,197 @@
+"""
+Sinks to which results are written as soon as they are available
+
+Passing a sink to :func:`openscm_runner.run.run` means that each completed
+run is written to disk straight away, rather than all results being collected
+in memory and returned once every run is finished. This keeps the memory
+footprint of large ensembles bounded and allows partial results to be
+inspected whilst a job is still running.
+
+.. code:: python
+
+    >>> from openscm_runner import run
+    >>> from openscm_runner.sinks import NetCDFSink
+    >>> with NetCDFSink("/path/to/output") as sink:
+    ...     run(climate_models_cfgs, scenarios, sink=sink)
+    >>> res = sink.read()
+"""
+import glob
+import os.path
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import scmdata
+
+
+class ResultSink(ABC):
+    """
+    Base class for result sinks
+
+    Sinks must be safe to write to from multiple threads as
+    :func:`openscm_runner.run.run` may run several climate models at once.
+    """
+
+    def __enter__(self):
+        """
+        Use the sink as a context manager
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the sink
+        """
+        self.close()
+
+    @abstractmethod
+    def write(self, scmrun):
+        """
+        Write results
+
+        Parameters
+        ----------
+        scmrun : :obj:`scmdata.ScmRun`
+            Results to write
+        """
+
+    def close(self):
+        """
+        Close the sink, flushing any outstanding results
+        """
+
+
+class _ChunkedFileSink(ResultSink):
+    """
+    Sink which writes each set of results to its own file in a directory
+    """
+
+    _extension = None
+
+    def __init__(self, path):
+        """
+        Initialise the sink
+
+        Parameters
+        ----------
+        path : str
+            Directory in which to write the results. If the directory already
+            contains results, new results are added alongside them.
+        """
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._n_chunks = len(self.chunk_files)
+
+    @property
+    def chunk_files(self):
+        """
+        list[str]: Files which have been completely written to the sink
+        """
+        return sorted(
+            glob.glob(os.path.join(self.path, "chunk-*{}".format(self._extension)))
+        )
+
+    def write(self, scmrun):
+        """
+        Write results
+
+        The results are written to a temporary file which is only renamed once
+        writing is complete, hence :meth:`read` never sees partially written
+        results.
+
+        Parameters
+        ----------
+        scmrun : :obj:`scmdata.ScmRun`
+            Results to write
+        """
+        with self._lock:
+            chunk = self._n_chunks
+            self._n_chunks += 1
+
+        out_name = "chunk-{:08d}{}".format(chunk, self._extension)
+        out_file = os.path.join(self.path, out_name)
+        tmp_file = os.path.join(self.path, "tmp-{}".format(out_name))
+        self._write_chunk(scmrun, tmp_file)
+        os.replace(tmp_file, out_file)
+
+    def read(self):
+        """
+        Read all the results which have been written to the sink
+
+        Returns
+        -------
+        :obj:`scmdata.ScmRun`
+            Results
+
+        Raises
+        ------
+        ValueError
+            No results have been written to the sink
+        """
+        chunk_files = self.chunk_files
+        if not chunk_files:
+            raise ValueError("No results found in {}".format(self.path))
+
+        return scmdata.run_append([self._read_chunk(f) for f in chunk_files])
+
+    @staticmethod
+    @abstractmethod
+    def _write_chunk(scmrun, out_file):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _read_chunk(in_file):
+        pass
+
+
+class NetCDFSink(_ChunkedFileSink):
+    """
+    Sink which writes results to a directory of netCDF files
+
+    Requires netCDF4 to be installed (``pip install netcdf4``).
+    """
+
+    _extension = ".nc"
+
+    @staticmethod
+    def _write_chunk(scmrun, out_file):
+        dimensions = [
+            c
+            for c in scmrun.meta.columns
+            if c not in ("variable", "unit") and len(scmrun.get_unique_meta(c)) > 1
+        ]
+        scmrun.to_nc(out_file, dimensions=dimensions)
+
+    @staticmethod
+    def _read_chunk(in_file):
+        res = scmdata.ScmRun.from_nc(in_file)
+
+        # writing with dimensions fills in any missing combinations with nan
+        return scmdata.ScmRun(res.timeseries().dropna(how="all"))
+
+
+class ParquetSink(_ChunkedFileSink):
+    """
+    Sink which writes results to a directory of Parquet files
+
+    Requires pyarrow (or fastparquet) to be installed (``pip install
+    pyarrow``).
+    """
+
+    _extension = ".parquet"
+
+    @staticmethod
+    def _write_chunk(scmrun, out_file):
+        scmrun.long_data().to_parquet(out_file, index=False)
+
+    @staticmethod
+    def _read_chunk(in_file):
+        long_data = pd.read_parquet(in_file)
+        meta_cols = [c for c in long_data.columns if c not in ("time", "value")]
+
+        return scmdata.ScmRun(
+            long_data.set_index(meta_cols + ["time"])["value"].unstack("time")
+        )
@@ -0,0 +1,361 @@
+"""
+Tracing of where the time goes during a run
+
+Each stage of a run (e.g. converting the scenarios into a climate model's
+inputs, running the model, post-processing the results and appending them) is
+recorded as a span. Each job run in a worker is also recorded as a span, as
+are any stages within the job (e.g. calling the model binary and reading its
+output). To keep the spans, activate a :class:`Tracer` with :func:`tracing`
+and run as normal.
+
+.. code:: python
+
+    >>> from openscm_runner import run
+    >>> from openscm_runner.tracing import Tracer, tracing
+    >>> tracer = Tracer()
+    >>> with tracing(tracer):
+    ...     res = run(climate_models_cfgs, scenarios)
+    >>> tracer.write_chrome_trace("trace.json")
+
+The trace can be viewed with e.g. ``chrome://tracing`` or
+https://ui.perfetto.dev. Whether or not a tracer is active,
+:func:`openscm_runner.run.run` attaches the total time spent in each stage to
+its output's metadata as a JSON string. The stages within each job (e.g.
+calling the model) are only included if a tracer is active, as they have to
+be sent back from the workers.
+
+.. code:: python
+
+    >>> import json
+    >>> json.loads(res.metadata["timings"])
+    {'FaIR': {'count': 1, 'seconds': 10.1}, 'FaIR run': {'count': 600, ...}, ...}
+
+Adapters (and any other code) can record their own stages with :func:`span`.
+If memory tracking is enabled, each span also records the peak memory used
+whilst it was running (see :mod:`openscm_runner.memory`).
+"""
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+from .memory import _measure_peak_memory
+
+_ACTIVE_TRACERS = contextvars.ContextVar("openscm_runner_active_tracers", default=())
+
+
+class Tracer:
+    """
+    Collects spans
+    """
+
+    def __init__(self, keep_spans=True, job_stages=True):
+        """
+        Initialise the tracer
+
+        Parameters
+        ----------
+        keep_spans : bool
+            Keep each span. If ``False``, only the totals reported by
+            :meth:`summary` are kept so memory use does not grow with the
+            number of jobs.
+
+        job_stages : bool
+            Ask the workers for the spans recorded within each job. If
+            ``False``, each job is still recorded but the stages within it
+            are only recorded if another active tracer asks for them.
+        """
+        self.keep_spans = keep_spans
+        self.job_stages = job_stages
+        self._lock = threading.Lock()
+        self._spans = []
+        self._totals = {}
+        self._peaks = {}
+        self._workers = {}
+
+    @property
+    def spans(self):
+        """
+        list[dict]: Spans which have been recorded
+
+        Each span has the keys ``name``, ``category``, ``start`` (seconds
+        since the epoch), ``duration`` (seconds), ``pid``, ``tid``, ``args``
+        and ``peak_memory`` (bytes, ``None`` unless memory is tracked).
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def add_span(  # pylint:disable=too-many-arguments
+        self,
+        name,
+        start,
+        duration,
+        category="stage",
+        pid=None,
+        tid=None,
+        args=None,
+        peak_memory=None,
+    ):
+        """
+        Record a span
+
+        Parameters
+        ----------
+        name : str
+            Name of the span
+
+        start : float
+            Start time in seconds since the epoch
+
+        duration : float
+            Duration in seconds
+
+        category : str
+            Category of the span (e.g. ``"stage"`` or ``"job"``)
+
+        pid : int
+            Process in which the span occurred (defaults to the current
+            process)
+
+        tid : int
+            Thread in which the span occurred (defaults to the current thread)
+
+        args : dict
+            Any extra information about the span. For jobs (category
+            ``"job"``), ``max_rss`` is the peak resident set size of the
+            worker in bytes.
+
+        peak_memory : int
+            Peak memory traced whilst the span was running in bytes (see
+            :mod:`openscm_runner.memory`)
+        """
+        pid = os.getpid() if pid is None else pid
+        with self._lock:
+            count, total = self._totals.get(name, (0, 0.0))
+            self._totals[name] = (count + 1, total + duration)
+            if peak_memory is not None:
+                self._peaks[name] = max(self._peaks.get(name, 0), peak_memory)
+
+            if category == "job":
+                self._add_job(pid, duration, peak_memory, (args or {}).get("max_rss"))
+
+            if self.keep_spans:
+                self._spans.append(
+                    {
+                        "name": name,
+                        "category": category,
+                        "start": start,
+                        "duration": duration,
+                        "pid": pid,
+                        "tid": threading.get_ident() if tid is None else tid,
+                        "args": {} if args is None else args,
+                        "peak_memory": peak_memory,
+                    }
+                )
+
+    def _add_job(self, pid, duration, peak_memory, max_rss):
+        worker = self._workers.setdefault(
+            pid, {"jobs": 0, "seconds": 0.0, "peak_memory": None, "max_rss": None}
+        )
+        worker["jobs"] += 1
+        worker["seconds"] += duration
+        for key, value in (("peak_memory", peak_memory), ("max_rss", max_rss)):
+            if value is not None:
+                worker[key] = max(worker[key] or 0, value)
+
+    def summary(self):
+        """
+        Get the total time spent in each span
+
+        Returns
+        -------
+        dict[str: dict]
+            For each span name, the number of spans (``count``) and their
+            total duration in seconds (``seconds``). Spans can overlap (e.g.
+            jobs running in parallel) so the totals can add up to more than
+            the elapsed time. If memory is tracked, the highest peak memory
+            of the spans (``peak_memory``, in bytes) is also included.
+        """
+        with self._lock:
+            out = {
+                name: {"count": count, "seconds": total}
+                for name, (count, total) in self._totals.items()
+            }
+            for name, peak in self._peaks.items():
+                out[name]["peak_memory"] = peak
+
+        return out
+
+    def worker_summary(self):
+        """
+        Get the jobs run by each worker (process)
+
+        Returns
+        -------
+        dict[int: dict]
+            For each process which ran jobs, the number of jobs (``jobs``),
+            the total time spent running them (``seconds``), the highest peak
+            memory traced whilst running a job (``peak_memory``, bytes) and
+            the peak resident set size of the process (``max_rss``, bytes).
+            The memory values are ``None`` unless memory is tracked.
+        """
+        with self._lock:
+            return {pid: dict(worker) for pid, worker in self._workers.items()}
+
+    def to_chrome_trace(self):
+        """
+        Convert the spans to Chrome's trace event format
+
+        Returns
+        -------
+        dict
+            Trace in Chrome's trace event format
+        """
+        events = [
+            {
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["duration"] * 1e6,
+                "pid": span["pid"],
+                "tid": span["tid"],
+                "args": span["args"]
+                if span["peak_memory"] is None
+                else {**span["args"], "peak_memory": span["peak_memory"]},
+            }
+            for span in self.spans
+        ]
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        """
+        Write the spans to a file in Chrome's trace event format
+
+        Parameters
+        ----------
+        path : str
+            File to write
+        """
+        with open(path, "w") as file_handle:
+            json.dump(self.to_chrome_trace(), file_handle)
+
+
+@contextlib.contextmanager
+def tracing(tracer):
+    """
+    Record spans in ``tracer`` (as well as any tracers which are already active)
+
+    Parameters
+    ----------
+    tracer : :obj:`Tracer`
+        Tracer in which to record spans
+
+    Yields
+    ------
+    :obj:`Tracer`
+        ``tracer``
+    """
+    token = _ACTIVE_TRACERS.set(_ACTIVE_TRACERS.get() + (tracer,))
+    try:
+        yield tracer
+    finally:
+        _ACTIVE_TRACERS.reset(token)
+
+
+def _is_tracing():
+    """
+    Get whether any tracers are active
+    """
+    return bool(_ACTIVE_TRACERS.get())
+
+
+def _is_tracing_job_stages():
+    """
+    Get whether any active tracers want the spans recorded within each job
+    """
+    return any(tracer.job_stages for tracer in _ACTIVE_TRACERS.get())
+
+
+@contextlib.contextmanager
+def _only_tracing(tracer):
+    """
+    Record spans in ``tracer`` only (used to collect the spans of a job)
+
+    If ``tracer`` is ``None``, no spans are recorded.
+    """
+    token = _ACTIVE_TRACERS.set(() if tracer is None else (tracer,))
+    try:
+        yield tracer
+    finally:
+        _ACTIVE_TRACERS.reset(token)
+
+
+def add_span(  # pylint:disable=too-many-arguments
+    name,
+    start,
+    duration,
+    category="stage",
+    pid=None,
+    tid=None,
+    args=None,
+    peak_memory=None,
+):
+    """
+    Record a span in all the active tracers
+
+    See :meth:`Tracer.add_span` for a description of the parameters.
+    """
+    for tracer in _ACTIVE_TRACERS.get():
+        tracer.add_span(
+            name,
+            start,
+            duration,
+            category=category,
+            pid=pid,
+            tid=tid,
+            args=args,
+            peak_memory=peak_memory,
+        )
+
+
+@contextlib.contextmanager
+def span(name, category="stage", **args):
+    """
+    Record the time spent in a block of code as a span
+
+    Does nothing if no tracers are active.
+
+    Parameters
+    ----------
+    name : str
+        Name of the span
+
+    category : str
+        Category of the span
+
+    **args
+        Any extra information about the span
+    """
+    if not _ACTIVE_TRACERS.get():
+        yield
+        return
+
+    start = time.time()
+    start_perf = time.perf_counter()
+    memory = {"peak": None}
+    try:
+        with _measure_peak_memory() as memory:
+            yield
+    finally:
+        add_span(
+            name,
+            start,
+            time.perf_counter() - start_perf,
+            category=category,
+            args=args or None,
+            peak_memory=memory["peak"],
+        )
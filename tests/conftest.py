@@ -1,5 +1,6 @@
 import os.path
 
+import numpy as np
 import pyam
 import pytest
 from scmdata import ScmRun
@@ -96,6 +97,27 @@ def pytest_addoption(parser):
     )
 
 
+@pytest.fixture
+def make_results():
+    def _make_results(scenario="ssp126", run_ids=(0,)):
+        return ScmRun(
+            np.arange(3 * len(run_ids) * 2).reshape(3, -1).astype(float),
+            index=[2015, 2016, 2017],
+            columns={
+                "climate_model": "a_model",
+                "model": "an_iam",
+                "scenario": scenario,
+                "region": "World",
+                "variable": ["Surface Air Temperature Change", "Heat Uptake"]
+                * len(run_ids),
+                "unit": ["K", "W/m^2"] * len(run_ids),
+                "run_id": [r for r in run_ids for _ in range(2)],
+            },
+        )
+
+    return _make_results
+
+
 @pytest.fixture
 def update_expected_values(request):
     return request.config.getoption("--update-expected-values")
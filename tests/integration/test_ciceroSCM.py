@@ -1,4 +1,6 @@
 import os
+import subprocess
+import sys
 
 import numpy as np
 import numpy.testing as npt
@@ -9,9 +11,11 @@ from scmdata import ScmRun
 from openscm_runner import run
 from openscm_runner.adapters import CICEROSCM
 from openscm_runner.adapters.ciceroscm_adapter import (
+    _run_ciceroscm_parallel,
     make_scenario_files,
     write_parameter_files,
 )
+from openscm_runner.adapters.utils import _runtimes
 from openscm_runner.utils import calculate_quantiles
 
 RTOL = 1e-5
@@ -296,6 +300,64 @@ class TestCICEROSCMAdapter(_AdapterTester):
                 out_config={"CiceroSCM": ("With ECS",)},
             )
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+    def test_executable_setting(self, test_scenarios, monkeypatch, tmp_path):
+        executable = tmp_path / "scm_fails"
+        executable.write_text("#!/bin/sh\nexit 3\n")
+        executable.chmod(0o755)
+        monkeypatch.setenv("CICEROSCM_EXECUTABLE", str(executable))
+
+        # the bundled binary would run successfully
+        with pytest.raises(subprocess.CalledProcessError):
+            run(
+                scenarios=test_scenarios.filter(scenario=["ssp126"]),
+                climate_models_cfgs={"CiceroSCM": [{"model_end": 2100}]},
+                output_variables=("Surface Air Temperature Change",),
+            )
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+    def test_run_timeout(self, test_scenarios, monkeypatch, tmp_path):
+        calls = tmp_path / "calls"
+        executable = tmp_path / "scm_hangs"
+        executable.write_text("#!/bin/sh\necho >> {}\nexec sleep 30\n".format(calls))
+        executable.chmod(0o755)
+        monkeypatch.setenv("CICEROSCM_EXECUTABLE", str(executable))
+        monkeypatch.setenv("CICEROSCM_RUN_TIMEOUT", "0.5")
+        monkeypatch.setenv("CICEROSCM_RUN_RETRIES", "2")
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            run(
+                scenarios=test_scenarios.filter(scenario=["ssp126"]),
+                climate_models_cfgs={"CiceroSCM": [{"model_end": 2100}]},
+                output_variables=("Surface Air Temperature Change",),
+            )
+
+        # the first run and two re-runs
+        assert len(calls.read_text().splitlines()) == 3
+
+    def test_run_timeout_from_runtime_history(self, test_scenarios, monkeypatch):
+        monkeypatch.delenv("CICEROSCM_RUN_TIMEOUT", raising=False)
+        monkeypatch.setenv("OPENSCM_RUNNER_STRAGGLER_FACTOR", "3")
+        history = _runtimes._RuntimeHistory()
+        monkeypatch.setattr(_run_ciceroscm_parallel, "_RUNTIME_HISTORY", history)
+
+        scenariodata = test_scenarios.filter(scenario=["ssp126"]).timeseries()
+        job = {"cfgs": [{}] * 4, "scenariodata": scenariodata}
+
+        # nothing to go on yet
+        assert _run_ciceroscm_parallel._get_run_timeout(job) is None
+
+        history.record(
+            _run_ciceroscm_parallel._execute_run,
+            _run_ciceroscm_parallel._estimate_cost(job),
+            _run_ciceroscm_parallel._get_runtime_key(job),
+            40.0,
+        )
+        assert _run_ciceroscm_parallel._get_run_timeout(job) == 3 * 40.0 / 4
+
+        monkeypatch.setenv("CICEROSCM_RUN_TIMEOUT", "600")
+        assert _run_ciceroscm_parallel._get_run_timeout(job) == 600
+
     def test_make_scenario_files(self, test_scenarios):
         npt.assert_allclose(
             3.0 / 11.0 * 1000.0,
@@ -1,4 +1,8 @@
+import json
 import os.path
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import patch
 
 import numpy as np
 import numpy.testing as npt
@@ -6,8 +10,12 @@ import pytest
 from base import _AdapterTester
 from scmdata import ScmRun
 
-from openscm_runner import run
+from openscm_runner import run, run_iter
 from openscm_runner.adapters import FAIR
+from openscm_runner.executors import DaskExecutor, SerialExecutor, WorkerPool
+from openscm_runner.journal import RunJournal
+from openscm_runner.sinks import ParquetSink
+from openscm_runner.tracing import Tracer, tracing
 from openscm_runner.utils import calculate_quantiles
 
 
@@ -104,6 +112,36 @@ class TestFairAdapter(_AdapterTester):
             raise AssertionError(missing_vars)
 
 
+def test_make_full_cfgs(test_scenarios):
+    scenarios = ScmRun(
+        test_scenarios.filter(scenario=["ssp126", "ssp245"]).timeseries()
+    )
+    cfgs, scenario_inputs = FAIR()._make_full_cfgs(scenarios, [{}, {"r0": 30.0}])
+
+    # the configs only hold what differs between runs
+    assert [set(cfg) for cfg in cfgs] == [
+        {"scenario", "model", "run_id"},
+        {"scenario", "model", "run_id", "r0"},
+    ] * 2
+    assert set(scenario_inputs) == {(cfg["scenario"], cfg["model"]) for cfg in cfgs}
+    for inputs in scenario_inputs.values():
+        assert inputs["startyear"] == 1750
+        assert inputs["emissions"].shape == (2100 - 1750 + 1, 40)
+
+
+def test_make_full_cfgs_startyear(test_scenarios):
+    scenarios = ScmRun(test_scenarios.filter(scenario=["ssp126"]).timeseries())
+    in_cfgs = [{"startyear": 1850}, {"startyear": 1850, "r0": 30.0}]
+    cfgs, scenario_inputs = FAIR()._make_full_cfgs(scenarios, in_cfgs)
+
+    # the caller's configs are untouched and the start year is only a
+    # scenario input
+    assert in_cfgs == [{"startyear": 1850}, {"startyear": 1850, "r0": 30.0}]
+    assert all("startyear" not in cfg for cfg in cfgs)
+    for inputs in scenario_inputs.values():
+        assert inputs["startyear"] == 1850
+
+
 def test_fair_ocean_factors(test_scenarios):
     res_default_factors = run(
         climate_models_cfgs={"FaIR": [{}]},
@@ -212,6 +250,17 @@ def test_startyear(test_scenarios, test_scenarios_2600):
         )
 
 
+@pytest.mark.parametrize("restart_key", ("restart_in", "restart_out"))
+def test_restarts_not_supported(test_scenarios, restart_key):
+    with pytest.raises(ValueError, match=restart_key):
+        run(
+            climate_models_cfgs={"FaIR": [{}, {restart_key: True}]},
+            scenarios=test_scenarios.filter(scenario=["ssp245"]),
+            output_variables=("Surface Air Temperature Change",),
+            out_config=None,
+        )
+
+
 def test_forcing_categories(test_scenarios):
     forcing_categories = [
         "Effective Radiative Forcing|CO2",
@@ -424,3 +473,249 @@ def test_forcing_categories(test_scenarios):
         + forcing["Effective Radiative Forcing|Solar"],
         forcing["Effective Radiative Forcing"],
     )
+
+
+@pytest.fixture(params=["process", "thread", "worker-pool", "serial", "dask"])
+def shared_pool(request):
+    if request.param == "process":
+        pool = ProcessPoolExecutor(2)
+    elif request.param == "thread":
+        pool = ThreadPoolExecutor(2)
+    elif request.param == "worker-pool":
+        pool = WorkerPool(2, climate_models=["FaIR"])
+    elif request.param == "serial":
+        pool = SerialExecutor()
+    else:
+        distributed = pytest.importorskip("distributed")
+        cluster = distributed.LocalCluster(n_workers=2, threads_per_worker=1)
+        request.addfinalizer(cluster.close)
+        client = distributed.Client(cluster)
+        request.addfinalizer(client.close)
+        pool = DaskExecutor(client, climate_models=["FaIR"])
+
+    with pool:
+        yield pool
+
+
+def test_run_in_shared_pool(test_scenarios, shared_pool):
+    climate_models_cfgs = {
+        "FaIR": [{}, {"q": np.array([0.3, 0.45]), "r0": 30.0, "lambda_global": 0.9},],
+    }
+    scenarios = test_scenarios.filter(scenario=["ssp126", "ssp370"])
+    output_variables = ("Surface Air Temperature Change",)
+
+    res_own_pool = run(
+        climate_models_cfgs=climate_models_cfgs,
+        scenarios=scenarios,
+        output_variables=output_variables,
+    )
+
+    res_shared_pool = run(
+        climate_models_cfgs=climate_models_cfgs,
+        scenarios=scenarios,
+        output_variables=output_variables,
+        pool=shared_pool,
+    )
+
+    assert res_shared_pool.shape == res_own_pool.shape
+    npt.assert_allclose(
+        res_shared_pool.timeseries().sort_index(),
+        res_own_pool.timeseries().sort_index(),
+    )
+
+
+@pytest.mark.parametrize("scenario_batch_size,exp_n_chunks", ((1, 3), (2, 2), (5, 1)))
+def test_run_iter(test_scenarios, scenario_batch_size, exp_n_chunks):
+    climate_models_cfgs = {
+        "FaIR": [{}, {"q": np.array([0.3, 0.45]), "r0": 30.0, "lambda_global": 0.9},],
+    }
+    # batches never mix models so use scenarios from a single model
+    scenarios = test_scenarios.filter(model="AIM/CGE")
+    assert scenarios.data["scenario"].nunique() == 3
+    output_variables = ("Surface Air Temperature Change",)
+
+    res = run(
+        climate_models_cfgs=climate_models_cfgs,
+        scenarios=scenarios,
+        output_variables=output_variables,
+    )
+
+    chunks = list(
+        run_iter(
+            climate_models_cfgs=climate_models_cfgs,
+            scenarios=scenarios,
+            output_variables=output_variables,
+            scenario_batch_size=scenario_batch_size,
+        )
+    )
+
+    assert len(chunks) == exp_n_chunks
+    assert sum(c.shape[0] for c in chunks) == res.shape[0]
+    for chunk in chunks:
+        assert isinstance(chunk, ScmRun)
+        for scenario in chunk.get_unique_meta("scenario"):
+            npt.assert_allclose(
+                chunk.filter(scenario=scenario)
+                .timeseries(meta=["run_id", "variable"])
+                .sort_index(),
+                res.filter(scenario=scenario)
+                .timeseries(meta=["run_id", "variable"])
+                .sort_index(),
+            )
+
+
+@pytest.mark.parametrize("nworkers", (1, 4))
+def test_run_with_sink(test_scenarios, monkeypatch, nworkers, tmpdir):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv("FAIR_WORKER_NUMBER", "{}".format(nworkers))
+
+    run_kwargs = dict(
+        climate_models_cfgs={
+            "FaIR": [
+                {},
+                {"q": np.array([0.3, 0.45]), "r0": 30.0, "lambda_global": 0.9},
+            ],
+        },
+        scenarios=test_scenarios.filter(scenario=["ssp126", "ssp370"]),
+        output_variables=("Surface Air Temperature Change", "Heat Uptake"),
+    )
+
+    res = run(**run_kwargs)
+
+    with ParquetSink(str(tmpdir)) as sink:
+        assert run(**run_kwargs, sink=sink) is None
+
+    # one chunk per run
+    assert len(sink.chunk_files) == 4
+
+    res_sink = sink.read()
+    meta_cols = res.meta.columns.tolist()
+    assert set(res_sink.meta.columns) == set(meta_cols)
+    npt.assert_allclose(
+        res_sink.timeseries(meta=meta_cols).sort_index(),
+        res.timeseries(meta=meta_cols).sort_index(),
+    )
+
+
+def test_run_with_cache(test_scenarios, monkeypatch, tmpdir):
+    monkeypatch.setenv("FAIR_WORKER_NUMBER", "1")
+
+    cfgs = [
+        {},
+        {"q": np.array([0.3, 0.45]), "r0": 30.0, "lambda_global": 0.9},
+        {"r0": 40.0},
+    ]
+    run_kwargs = dict(
+        scenarios=test_scenarios.filter(scenario=["ssp126", "ssp370"]),
+        output_variables=("Surface Air Temperature Change", "Heat Uptake"),
+    )
+
+    res = run(climate_models_cfgs={"FaIR": cfgs}, **run_kwargs)
+
+    monkeypatch.setenv("OPENSCM_RUNNER_CACHE_DIR", str(tmpdir))
+    with patch.object(FAIR, "_run", autospec=True, side_effect=FAIR._run) as spy:
+        run(climate_models_cfgs={"FaIR": cfgs[:2]}, **run_kwargs)
+        assert spy.call_count == 1
+
+        # only the new config is run
+        res_cached = run(climate_models_cfgs={"FaIR": cfgs}, **run_kwargs)
+        assert spy.call_count == 2
+        assert len(spy.call_args[0][2]) == 1
+
+        # everything is in the cache
+        run(climate_models_cfgs={"FaIR": cfgs}, **run_kwargs)
+        assert spy.call_count == 2
+
+    meta_cols = res.meta.columns.tolist()
+    npt.assert_allclose(
+        res_cached.timeseries(meta=meta_cols).sort_index(),
+        res.timeseries(meta=meta_cols).sort_index(),
+    )
+
+
+def test_run_resume_from_journal(test_scenarios, monkeypatch, tmpdir):
+    monkeypatch.setenv("FAIR_WORKER_NUMBER", "1")
+
+    cfgs = [
+        {},
+        {"q": np.array([0.3, 0.45]), "r0": 30.0, "lambda_global": 0.9},
+        {"r0": 40.0},
+    ]
+    run_kwargs = dict(
+        scenarios=test_scenarios.filter(scenario=["ssp126", "ssp370"]),
+        output_variables=("Surface Air Temperature Change", "Heat Uptake"),
+    )
+
+    res = run(climate_models_cfgs={"FaIR": cfgs}, **run_kwargs)
+
+    # pretend the job died after the first two configs
+    run(
+        climate_models_cfgs={"FaIR": cfgs[:2]},
+        journal=RunJournal(str(tmpdir)),
+        **run_kwargs,
+    )
+
+    with pytest.raises(ValueError, match="pass `resume=True`"):
+        RunJournal(str(tmpdir))
+
+    with patch.object(FAIR, "_run", autospec=True, side_effect=FAIR._run) as spy:
+        res_resumed = run(
+            climate_models_cfgs={"FaIR": cfgs},
+            journal=RunJournal(str(tmpdir), resume=True),
+            **run_kwargs,
+        )
+        assert spy.call_count == 1
+        assert len(spy.call_args[0][2]) == 1
+
+    meta_cols = res.meta.columns.tolist()
+    npt.assert_allclose(
+        res_resumed.timeseries(meta=meta_cols).sort_index(),
+        res.timeseries(meta=meta_cols).sort_index(),
+    )
+
+
+def test_run_timings(test_scenarios, tmpdir):
+    tracer = Tracer()
+    with tracing(tracer):
+        res = run(
+            climate_models_cfgs={"FaIR": [{}, {"r0": 30.0}]},
+            scenarios=test_scenarios.filter(scenario=["ssp126", "ssp370"]),
+            output_variables=("Surface Air Temperature Change",),
+        )
+
+    timings = json.loads(res.metadata["timings"])
+    assert timings["FaIR"]["count"] == 1
+    # the emissions of all scenarios are made at once
+    assert timings["FaIR: scmdf_to_emissions"]["count"] == 1
+    assert timings["FaIR run"]["count"] == 4
+    assert timings["FaIR: fair_scm"]["count"] == 4
+
+    # the tracer sees the same spans as the timings
+    assert tracer.summary().keys() == timings.keys()
+
+    trace_file = str(tmpdir.join("trace.json"))
+    tracer.write_chrome_trace(trace_file)
+    with open(trace_file) as file_handle:
+        trace = json.load(file_handle)
+
+    assert len(trace["traceEvents"]) == sum(v["count"] for v in timings.values())
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 9), reason="tracemalloc.reset_peak requires Python 3.9"
+)
+def test_run_memory(test_scenarios, monkeypatch):
+    monkeypatch.setenv("OPENSCM_RUNNER_TRACK_MEMORY", "1")
+    res = run(
+        climate_models_cfgs={"FaIR": [{}, {"r0": 30.0}]},
+        scenarios=test_scenarios.filter(scenario=["ssp126", "ssp370"]),
+        output_variables=("Surface Air Temperature Change",),
+    )
+
+    memory = json.loads(res.metadata["memory"])
+    for stage in ("FaIR", "FaIR: scmdf_to_emissions", "FaIR run", "FaIR: run_append"):
+        assert memory["stages"][stage] > 0
+
+    assert sum(w["jobs"] for w in memory["workers"].values()) == 4
+    for worker in memory["workers"].values():
+        assert worker["max_rss"] > 0
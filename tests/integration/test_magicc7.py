@@ -1,5 +1,7 @@
+import glob
 import os.path
 
+import pandas as pd
 import pymagicc.io
 import pytest
 from base import _AdapterTester
@@ -7,6 +9,7 @@ from scmdata import ScmRun
 
 from openscm_runner import run
 from openscm_runner.adapters import MAGICC7
+from openscm_runner.executors import WorkerPool
 from openscm_runner.utils import calculate_quantiles
 
 
@@ -219,3 +222,54 @@ def test_return_config_clash_error(test_scenarios, cfgs):
             output_variables=("Surface Air Temperature Change",),
             out_config={"MAGICC7": ("pf_apply",)},
         )
+
+
+@pytest.mark.magicc
+def test_worker_pool_reuses_magicc_copies(test_scenarios, monkeypatch, tmpdir):
+    monkeypatch.setenv("MAGICC_WORKER_ROOT_DIR", str(tmpdir))
+
+    def _get_magicc_copies():
+        return set(glob.glob(os.path.join(str(tmpdir), "pymagicc-*")))
+
+    run_kwargs = dict(
+        climate_models_cfgs={
+            "MAGICC7": [
+                {"core_climatesensitivity": cs} for cs in (2, 2.5, 3, 3.5, 4, 4.5)
+            ]
+        },
+        scenarios=test_scenarios.filter(scenario=["ssp126"]),
+        output_variables=("Surface Air Temperature Change",),
+    )
+
+    with WorkerPool(max_workers=2, climate_models=["MAGICC7"]) as pool:
+        res_first = run(**run_kwargs, pool=pool)
+        copies = _get_magicc_copies()
+        # one per worker plus one for the front serial runs
+        assert len(copies) == 3
+
+        res_second = run(**run_kwargs, pool=pool)
+        assert _get_magicc_copies() == copies
+
+    # workers remove their copies as they exit, the main process' copy stays
+    # until the main process exits
+    assert len(_get_magicc_copies()) == 1
+
+    pd.testing.assert_frame_equal(res_first.timeseries(), res_second.timeseries())
+
+
+@pytest.mark.magicc
+def test_own_pool_removes_magicc_copies(test_scenarios, monkeypatch, tmpdir):
+    monkeypatch.setenv("MAGICC_WORKER_ROOT_DIR", str(tmpdir))
+    monkeypatch.setenv("MAGICC_WORKER_NUMBER", "2")
+
+    run(
+        climate_models_cfgs={
+            "MAGICC7": [
+                {"core_climatesensitivity": cs} for cs in (2, 2.5, 3, 3.5, 4, 4.5)
+            ]
+        },
+        scenarios=test_scenarios.filter(scenario=["ssp126"]),
+        output_variables=("Surface Air Temperature Change",),
+    )
+
+    assert not glob.glob(os.path.join(str(tmpdir), "pymagicc-*"))
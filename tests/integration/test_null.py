@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+from base import _AdapterTester
+from scmdata import ScmRun
+
+from openscm_runner import run
+from openscm_runner.adapters import NULL, get_adapter
+from openscm_runner.executors import SerialExecutor
+
+
+class TestNullAdapter(_AdapterTester):
+    @pytest.mark.parametrize("null_worker_number", ("1", "2"))
+    def test_run(self, test_scenarios, monkeypatch, null_worker_number):
+        monkeypatch.setenv("NULL_WORKER_NUMBER", null_worker_number)
+
+        res = run(
+            climate_models_cfgs={"NULL": [{}, {}, {}]},
+            scenarios=test_scenarios.filter(scenario=["ssp126", "ssp245", "ssp370"]),
+            output_variables=(
+                "Surface Air Temperature Change",
+                "Effective Radiative Forcing",
+                "Atmospheric Concentrations|CO2",
+            ),
+            out_config=None,
+        )
+
+        assert isinstance(res, ScmRun)
+        assert res["run_id"].min() == 0
+        assert res["run_id"].max() == 8
+
+        assert res.get_unique_meta("climate_model", no_duplicates=True) == "NULL"
+
+        assert set(res.get_unique_meta("variable")) == set(
+            [
+                "Surface Air Temperature Change",
+                "Effective Radiative Forcing",
+                "Atmospheric Concentrations|CO2",
+            ]
+        )
+        assert (
+            res.filter(variable="Surface Air Temperature Change").get_unique_meta(
+                "unit", True
+            )
+            == "K"
+        )
+
+        # one value per year of the scenarios
+        assert res.shape == (3 * 3 * 3, 2100 - 2015 + 1)
+        npt.assert_allclose(res.values, 0)
+
+        assert "NULL run" in json.loads(res.metadata["timings"])
+
+    def test_variable_naming(self, test_scenarios):
+        res = run(
+            climate_models_cfgs={"NULL": ({},)},
+            scenarios=test_scenarios.filter(scenario="ssp126"),
+            output_variables=self._common_variables,
+        )
+
+        missing_vars = set(self._common_variables) - set(res["variable"])
+        if missing_vars:
+            raise AssertionError(missing_vars)
+
+
+def test_get_adapter():
+    assert get_adapter("null") is NULL
+
+
+def test_out_config(test_scenarios):
+    res = run(
+        climate_models_cfgs={"NULL": [{"ecs": 3.0}, {"ecs": 4.5}]},
+        scenarios=test_scenarios.filter(scenario="ssp126"),
+        output_variables=("Surface Air Temperature Change",),
+        out_config={"NULL": ("ecs",)},
+    )
+
+    npt.assert_allclose(sorted(res["ecs"]), [3.0, 4.5])
+
+
+def test_pool(test_scenarios):
+    with SerialExecutor() as pool:
+        res = run(
+            climate_models_cfgs={"NULL": [{}] * 4},
+            scenarios=test_scenarios.filter(scenario=["ssp126", "ssp245"]),
+            output_variables=("Surface Air Temperature Change",),
+            pool=pool,
+        )
+
+    np.testing.assert_equal(sorted(res["run_id"]), np.arange(8))
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+
+from openscm_runner import adapters
+from openscm_runner.adapters import get_adapter, register_adapter
+from openscm_runner.adapters.base import _Adapter
+from openscm_runner.adapters.fair_adapter import FAIR
+from openscm_runner.executors import SerialExecutor
+
+
+def test_import_does_not_import_models():
+    code = (
+        "import sys; import openscm_runner; "
+        "loaded = {'fair', 'pymagicc', 'f90nml'} & set(sys.modules); "
+        "assert not loaded, loaded"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize("name", ("FaIR", "fair", "FAIR"))
+def test_get_adapter(name):
+    assert get_adapter(name) is FAIR
+
+
+def test_get_adapter_unknown():
+    with pytest.raises(NotImplementedError, match="No adapter available for junk"):
+        get_adapter("junk")
+
+
+@pytest.mark.parametrize("adapter", (FAIR, "openscm_runner.adapters.fair_adapter:FAIR"))
+def test_register_adapter(monkeypatch, adapter):
+    monkeypatch.setattr(adapters, "_registry", dict(adapters._registry))
+
+    register_adapter("my-model", adapter)
+
+    assert get_adapter("MY-MODEL") is FAIR
+
+
+class _FourArgumentAdapter(_Adapter):
+    # written before ``_run`` took ``pool`` and ``sink``
+    def _init_model(self):
+        pass
+
+    def _run(self, scenarios, cfgs, output_variables, output_config):
+        return "ran"
+
+
+def test_run_without_pool_and_sink(monkeypatch):
+    monkeypatch.delenv("OPENSCM_RUNNER_CACHE_DIR", raising=False)
+    adapter = _FourArgumentAdapter()
+
+    assert adapter.run(None, [{}], ("Surface Air Temperature Change",), None) == "ran"
+
+    with pytest.raises(NotImplementedError, match="doesn't take `pool`"):
+        adapter.run(None, [{}], (), None, pool=SerialExecutor())
+
+
+def test_run_without_sink_skips_cache(monkeypatch, tmpdir, caplog):
+    monkeypatch.setenv("OPENSCM_RUNNER_CACHE_DIR", str(tmpdir))
+
+    assert _FourArgumentAdapter().run(None, [{}], (), None) == "ran"
+    assert "Not using the result cache" in caplog.text
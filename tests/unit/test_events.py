@@ -0,0 +1,130 @@
+import pytest
+
+from openscm_runner.adapters.utils._parallel_process import _parallel_process
+from openscm_runner.events import (
+    JobMetrics,
+    OpenMetricsFileExporter,
+    emit,
+    listening,
+    to_openmetrics,
+)
+from openscm_runner.executors import SerialExecutor
+
+
+def _square(x):
+    return x ** 2
+
+
+def _fail_on_three(x):
+    if x == 3:
+        raise ValueError("bad config: {}".format(x))
+
+    return x
+
+
+def test_emit_without_listener():
+    # does nothing
+    emit("submitted", "stage", 1)
+
+
+@pytest.mark.parametrize("pool", (None, SerialExecutor()))
+@pytest.mark.parametrize("chunksize", (1, 2))
+def test_parallel_process_events(pool, chunksize):
+    events = []
+    with listening(events.append):
+        _parallel_process(
+            func=_square,
+            configuration=[1, 2, 3, 4, 5],
+            pool=pool,
+            front_serial=1,
+            front_parallel=1,
+            chunksize=chunksize,
+            name="squaring",
+        )
+
+    assert all(e["stage"] == "squaring" for e in events)
+    assert events[0]["event"] == "started"
+    assert events[0]["n_jobs"] == 5
+    assert events[-1]["event"] == "finished"
+
+    def _n_jobs(event_type):
+        return sum(e["n_jobs"] for e in events if e["event"] == event_type)
+
+    assert _n_jobs("submitted") == 5
+    assert _n_jobs("completed") == 5
+    assert _n_jobs("failed") == 0
+
+
+@pytest.mark.parametrize("pool", (None, SerialExecutor()))
+def test_parallel_process_failed_event(pool):
+    metrics = JobMetrics()
+    with listening(metrics):
+        with pytest.raises(ValueError, match="bad config: 3"):
+            _parallel_process(
+                func=_fail_on_three,
+                configuration=[1, 2, 3, 4, 5],
+                pool=pool,
+                front_serial=0,
+                front_parallel=0,
+                name="failing",
+            )
+
+    snapshot = metrics.snapshot()["failing"]
+    assert snapshot["failed"] == 1
+    assert not snapshot["running"]
+
+
+def _event(event, n_jobs, time, **kwargs):
+    return {"event": event, "stage": "stage", "n_jobs": n_jobs, "time": time, **kwargs}
+
+
+def test_job_metrics():
+    metrics = JobMetrics()
+    metrics(_event("started", 10, 100, n_workers=2))
+    metrics(_event("submitted", 6, 100))
+    metrics(_event("completed", 4, 102, busy_seconds=4))
+    metrics(_event("failed", 1, 102))
+
+    snapshot = metrics.snapshot(now=104)["stage"]
+    assert snapshot["total"] == 10
+    assert snapshot["in_flight"] == 1
+    assert snapshot["jobs_per_second"] == 1
+    assert snapshot["eta_seconds"] == 5
+    assert snapshot["utilisation"] == 0.5
+    assert snapshot["running"]
+
+    metrics(_event("finished", 10, 110))
+    snapshot = metrics.snapshot(now=120)["stage"]
+    assert snapshot["eta_seconds"] == 0
+    assert not snapshot["running"]
+
+
+def test_to_openmetrics():
+    metrics = JobMetrics()
+    metrics(_event("started", 10, 100))
+    metrics(_event("submitted", 6, 100))
+
+    out = to_openmetrics(metrics.snapshot(now=101))
+    assert 'openscm_runner_submitted_total{stage="stage"} 6.0' in out
+    assert 'openscm_runner_in_flight{stage="stage"} 6.0' in out
+    # unknown values are left out
+    assert "openscm_runner_utilisation{" not in out
+    assert "openscm_runner_eta_seconds{" not in out
+    assert out.endswith("# EOF\n")
+
+
+def test_openmetrics_file_exporter(tmpdir):
+    out_file = tmpdir.join("metrics.prom")
+    with OpenMetricsFileExporter(str(out_file), min_interval=1000) as exporter:
+        with listening(exporter):
+            _parallel_process(
+                func=_square,
+                configuration=[1, 2, 3],
+                pool=None,
+                front_serial=0,
+                name="squaring",
+            )
+
+    out = out_file.read()
+    assert 'openscm_runner_completed_total{stage="squaring"} 3.0' in out
+    assert 'openscm_runner_running{stage="squaring"} 0.0' in out
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openscm_runner.adapters.utils._parallel_process import _parallel_process
+from openscm_runner.executors import SerialExecutor
+
+
+def _square(x):
+    return x ** 2
+
+
+def _fail(x):
+    raise ValueError("bad config: {}".format(x))
+
+
+def test_serial_executor():
+    with SerialExecutor() as pool:
+        future = pool.submit(_square, 3)
+        assert future.done()
+        assert future.result() == 9
+
+        future = pool.submit(_fail, 3)
+        assert future.done()
+        assert isinstance(future.exception(), ValueError)
+
+    with pytest.raises(RuntimeError, match="after shutdown"):
+        pool.submit(_square, 3)
+
+
+@pytest.mark.parametrize("pool_cls", (SerialExecutor, ThreadPoolExecutor))
+def test_parallel_process_executors(pool_cls):
+    with pool_cls() as pool:
+        res = _parallel_process(
+            func=_square,
+            configuration=list(range(10)),
+            pool=pool,
+            front_serial=2,
+            front_parallel=2,
+        )
+
+    assert res == [x ** 2 for x in range(10)]
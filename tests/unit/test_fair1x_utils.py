@@ -1,6 +1,15 @@
+import numpy as np
 import numpy.testing as npt
+from scmdata import ScmRun
 
-from openscm_runner.adapters.fair_adapter._scmdf_to_emissions import scmdf_to_emissions
+from openscm_runner.adapters.fair_adapter._run_fair import (
+    _get_full_cfg,
+    _process_output,
+)
+from openscm_runner.adapters.fair_adapter._scmdf_to_emissions import (
+    scmdf_to_emissions,
+    scmdf_to_emissions_cube,
+)
 
 
 # All emissions that are not covered by FaIR (see
@@ -13,3 +22,84 @@ def test_emissions_to_ignore(test_scenario_ssp370_world):
         emissions[0, 1], 2.59244179e-03, rtol=1e-5,
     )
     assert emissions.shape[1] == 40
+
+
+def test_emissions_cube(test_scenarios):
+    scenarios = ScmRun(
+        test_scenarios.filter(scenario=["ssp370", "ssp126"]).timeseries()
+    )
+
+    scenario_models, emissions = scmdf_to_emissions_cube(scenarios)
+
+    assert [scenario for scenario, _ in scenario_models] == ["ssp126", "ssp370"]
+    assert emissions.shape == (2, 2100 - 1750 + 1, 40)
+
+    # the same history, different scenarios
+    first_scen_row = 2015 - 1750
+    npt.assert_equal(emissions[0, :first_scen_row], emissions[1, :first_scen_row])
+    assert not np.allclose(
+        emissions[0, first_scen_row:, 1], emissions[1, first_scen_row:, 1]
+    )
+
+    for (scenario, _), scenario_emissions in zip(scenario_models, emissions):
+        npt.assert_allclose(
+            scenario_emissions, scmdf_to_emissions(scenarios.filter(scenario=scenario))
+        )
+
+
+def _get_fair_output(nt):
+    rng = np.random.default_rng(0)
+
+    return (
+        rng.random((nt, 31)),
+        rng.random((nt, 45)),
+        *[rng.random(nt) for _ in range(5)],
+    )
+
+
+def test_process_output():
+    fair_output = _get_fair_output(10)
+    concentrations, forcing, temperature = fair_output[:3]
+
+    data, unit, nt = _process_output(
+        fair_output,
+        (
+            "Effective Radiative Forcing|Aerosols",
+            "Surface Air Ocean Blended Temperature Change",
+            "Atmospheric Concentrations|CH4",
+            "Effective Radiative Forcing",
+            "Effective Radiative Forcing|Solar",
+            "CO2 Air to Land Flux",  # not available from FaIR
+        ),
+        {"gmst": 0.9, "ohu": 0.92},
+    )
+
+    assert nt == 10
+    # only the requested variables, in the requested order
+    assert list(data) == [
+        "Effective Radiative Forcing|Aerosols",
+        "Surface Air Ocean Blended Temperature Change",
+        "Atmospheric Concentrations|CH4",
+        "Effective Radiative Forcing",
+        "Effective Radiative Forcing|Solar",
+    ]
+    assert unit["Atmospheric Concentrations|CH4"] == "ppb"
+    assert unit["Effective Radiative Forcing"] == "W/m**2"
+
+    npt.assert_allclose(
+        data["Effective Radiative Forcing|Aerosols"], forcing[:, 35:41].sum(axis=1)
+    )
+    npt.assert_allclose(
+        data["Surface Air Ocean Blended Temperature Change"], temperature * 0.9
+    )
+    npt.assert_allclose(data["Atmospheric Concentrations|CH4"], concentrations[:, 1])
+    npt.assert_allclose(data["Effective Radiative Forcing"], forcing.sum(axis=1))
+    npt.assert_allclose(data["Effective Radiative Forcing|Solar"], forcing[:, 44])
+
+
+def test_get_full_cfg_copies_defaults():
+    cfg = {"scenario": "ssp126", "model": "a_model", "scenario_inputs": {}}
+    first = _get_full_cfg(cfg)
+    first["efficacy"][0] = 2.0
+
+    assert _get_full_cfg(cfg)["efficacy"][0] == 1.0
@@ -0,0 +1,41 @@
+import os.path
+
+import pytest
+
+from openscm_runner.journal import RunJournal
+
+
+def test_journal_resume(tmpdir, make_results):
+    journal = RunJournal(str(tmpdir))
+    assert journal.get("abcd") is None
+
+    journal.put("abcd", make_results())
+    assert journal.get("abcd") is not None
+
+    resumed = RunJournal(str(tmpdir), resume=True)
+    assert resumed.n_completed == 1
+    assert resumed.get("abcd") is not None
+
+
+def test_journal_exists_error(tmpdir, make_results):
+    RunJournal(str(tmpdir)).put("abcd", make_results())
+
+    with pytest.raises(ValueError, match="pass `resume=True`"):
+        RunJournal(str(tmpdir))
+
+
+def test_journal_incomplete_entry(tmpdir, make_results):
+    journal = RunJournal(str(tmpdir))
+    journal.put("abcd", make_results())
+    with open(os.path.join(str(tmpdir), "journal.jsonl"), "a") as fh:
+        fh.write('{"key": "ef')
+
+    assert RunJournal(str(tmpdir), resume=True).n_completed == 1
+
+
+def test_journal_ignores_unrecorded_output(tmpdir, make_results):
+    # output written but the process died before recording it in the journal
+    journal = RunJournal(str(tmpdir))
+    super(RunJournal, journal).put("abcd", make_results())
+
+    assert RunJournal(str(tmpdir), resume=True).get("abcd") is None
@@ -0,0 +1,83 @@
+import sys
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openscm_runner.adapters.utils._parallel_process import _parallel_process
+from openscm_runner.memory import tracking_memory
+from openscm_runner.tracing import Tracer, span, tracing
+
+requires_reset_peak = pytest.mark.skipif(
+    sys.version_info < (3, 9), reason="tracemalloc.reset_peak requires Python 3.9"
+)
+
+MB = 1024 ** 2
+
+
+def _allocate(n_mb):
+    with span("allocate"):
+        data = bytearray(n_mb * MB)
+
+    return len(data)
+
+
+@requires_reset_peak
+def test_span_peak_memory():
+    tracer = Tracer()
+    with tracking_memory(), tracing(tracer):
+        with span("outer"):
+            data = bytearray(10 * MB)
+            del data
+            with span("inner"):
+                data = bytearray(2 * MB)
+                del data
+
+    assert not tracemalloc.is_tracing()
+
+    summary = tracer.summary()
+    # the inner span doesn't hide the peak of the outer span
+    assert 10 * MB <= summary["outer"]["peak_memory"] < 11 * MB
+    assert 2 * MB <= summary["inner"]["peak_memory"] < 3 * MB
+
+
+def test_no_memory_tracking(monkeypatch):
+    monkeypatch.delenv("OPENSCM_RUNNER_TRACK_MEMORY", raising=False)
+
+    tracer = Tracer()
+    with tracing(tracer):
+        _parallel_process(func=_allocate, configuration=[1, 2], pool=None)
+
+    assert "peak_memory" not in tracer.summary()["allocate"]
+    assert tracer.spans[0]["peak_memory"] is None
+    (worker,) = tracer.worker_summary().values()
+    assert worker["jobs"] == 2
+    assert worker["max_rss"] is None
+
+
+@requires_reset_peak
+@pytest.mark.parametrize("pool", (None, ThreadPoolExecutor(2)))
+def test_parallel_process_memory(monkeypatch, pool):
+    monkeypatch.setenv("OPENSCM_RUNNER_TRACK_MEMORY", "1")
+
+    tracer = Tracer()
+    with tracing(tracer):
+        _parallel_process(
+            func=_allocate,
+            configuration=[1, 20, 5, 2],
+            pool=pool,
+            front_serial=1,
+            front_parallel=1,
+            name="allocating",
+        )
+
+    assert not tracemalloc.is_tracing()
+
+    summary = tracer.summary()
+    assert summary["allocating"]["peak_memory"] >= 20 * MB
+    assert summary["allocate"]["peak_memory"] >= 20 * MB
+
+    workers = tracer.worker_summary()
+    assert sum(w["jobs"] for w in workers.values()) == 4
+    for worker in workers.values():
+        assert worker["max_rss"] > 0
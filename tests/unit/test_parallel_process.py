@@ -0,0 +1,248 @@
+import json
+import os.path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openscm_runner.adapters.utils import _runtimes
+from openscm_runner.adapters.utils._parallel_process import (
+    _get_auto_chunksize,
+    _owned_pool,
+    _parallel_process,
+)
+from openscm_runner.executors import SerialExecutor
+
+
+@pytest.fixture(autouse=True)
+def runtime_history(monkeypatch):
+    history = _runtimes._RuntimeHistory()
+    monkeypatch.setattr(_runtimes, "_RUNTIME_HISTORY", history)
+    monkeypatch.setattr(
+        "openscm_runner.adapters.utils._parallel_process._RUNTIME_HISTORY", history
+    )
+
+    return history
+
+
+def _double_cost(cfg):
+    return cfg["cost"] * 2
+
+
+@pytest.mark.parametrize("pool", (None, SerialExecutor()))
+@pytest.mark.parametrize("front_serial", (0, 1, 3))
+def test_parallel_process_cost_order(pool, front_serial):
+    configuration = [{"id": i, "cost": c} for i, c in enumerate((1, 5, 3, 5, 2, 4))]
+    run_order = []
+
+    # the jobs run in this process so we can record the order they run in
+    # (results of jobs which are already complete can be handled in any order)
+    def _record_double_cost(cfg):
+        run_order.append(cfg["id"])
+        return _double_cost(cfg)
+
+    res = _parallel_process(
+        func=_record_double_cost,
+        configuration=configuration,
+        pool=pool,
+        front_serial=front_serial,
+        front_parallel=1,
+        cost=lambda cfg: cfg["cost"],
+        callback=None,
+    )
+    # results come back in the original order
+    assert res == [2, 10, 6, 10, 4, 8]
+    # most expensive first, ties keep their original order
+    assert run_order == [1, 3, 5, 2, 4, 0]
+
+
+def test_runtime_history_preferred(runtime_history):
+    runtime_history.record(_double_cost, 1, "slow", 100)
+    runtime_history.record(_double_cost, 1, "fast", 1)
+
+    # without history, the third item is estimated using the mean seconds per
+    # unit cost of the recorded items (50.5)
+    order = _runtimes._get_submission_order(
+        _double_cost, 3, [10, 1, 1], ["fast", "slow", None]
+    )
+
+    assert order == [1, 2, 0]
+
+
+def test_runtime_history_file(tmpdir, monkeypatch, runtime_history):
+    history_file = tmpdir.join("runtimes.json")
+    monkeypatch.setenv("OPENSCM_RUNNER_RUNTIME_HISTORY_FILE", str(history_file))
+
+    runtime_history.record(_double_cost, 2, "key", 4)
+    runtime_history.save()
+
+    saved = json.loads(history_file.read())
+    assert list(saved["runtimes"].values()) == [4]
+
+    new_history = _runtimes._RuntimeHistory()
+    assert new_history.estimate(_double_cost, 1, "key") == 4
+    # seconds per unit cost is also remembered
+    assert new_history.estimate(_double_cost, 3, None) == 6
+
+
+def _square(x):
+    return x ** 2
+
+
+@pytest.mark.parametrize("chunksize", (1, 3, 20, "auto"))
+def test_parallel_process_chunksize(chunksize):
+    with ThreadPoolExecutor(2) as pool:
+        res = _parallel_process(
+            func=_square, configuration=list(range(20)), pool=pool, chunksize=chunksize,
+        )
+
+    assert res == [x ** 2 for x in range(20)]
+
+
+def test_parallel_process_combine():
+    with ThreadPoolExecutor(2) as pool:
+        res = _parallel_process(
+            func=_square,
+            configuration=list(range(20)),
+            pool=pool,
+            front_serial=0,
+            front_parallel=0,
+            chunksize=5,
+            combine=sum,
+        )
+
+    assert len(res) == 4
+    assert sum(res) == sum(x ** 2 for x in range(20))
+
+
+@pytest.mark.parametrize("chunksize", (0, -1))
+def test_parallel_process_chunksize_error(chunksize):
+    error_msg = "`chunksize` must be 'auto' or at least 1, received: {}".format(
+        chunksize
+    )
+    with pytest.raises(ValueError, match=error_msg):
+        _parallel_process(
+            func=_square, configuration=list(range(20)), chunksize=chunksize,
+        )
+
+
+@pytest.mark.parametrize(
+    "n_items,item_seconds,exp",
+    (
+        # no information
+        (1000, None, 1),
+        # limited by target chunk runtime
+        (1000, 0.1, 5),
+        # limited by needing several chunks per worker
+        (100, 0.001, 7),
+        # slow items aren't chunked
+        (1000, 10, 1),
+    ),
+)
+def test_get_auto_chunksize(n_items, item_seconds, exp):
+    with ThreadPoolExecutor(4) as pool:
+        assert _get_auto_chunksize(pool, n_items, item_seconds) == exp
+
+
+def test_parallel_process_straggler(monkeypatch):
+    monkeypatch.setattr(
+        "openscm_runner.adapters.utils._parallel_process._STRAGGLER_MIN_SECONDS", 0.05
+    )
+    monkeypatch.setattr(
+        "openscm_runner.adapters.utils._parallel_process._STRAGGLER_POLL_SECONDS", 0.01,
+    )
+    release = threading.Event()
+    attempts = []
+
+    def _hang_first_attempt(cfg):
+        attempts.append(cfg["x"])
+        if cfg["x"] == 3 and attempts.count(3) == 1:
+            # only returns once the test is over
+            release.wait(30)
+
+        return cfg["x"] ** 2
+
+    configuration = [{"x": x} for x in range(10)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        try:
+            res = _parallel_process(
+                func=_hang_first_attempt,
+                configuration=configuration,
+                pool=pool,
+                front_serial=0,
+                front_parallel=0,
+                timeout=10,
+                straggler_factor=2,
+            )
+        finally:
+            release.set()
+
+    assert res == [x ** 2 for x in range(10)]
+    assert attempts.count(3) == 2
+
+
+def _hang_first_attempt_in_process(cfg):
+    # attempts are in different processes so are tracked with a file
+    if cfg["x"] == 3 and not os.path.exists(cfg["marker"]):
+        open(cfg["marker"], "w").close()
+        time.sleep(60)
+
+    return cfg["x"] ** 2
+
+
+def test_owned_pool_kills_straggler(monkeypatch, tmpdir):
+    monkeypatch.setattr(
+        "openscm_runner.adapters.utils._parallel_process._STRAGGLER_MIN_SECONDS", 0.5
+    )
+    monkeypatch.setattr(
+        "openscm_runner.adapters.utils._parallel_process._STRAGGLER_POLL_SECONDS", 0.01,
+    )
+    marker = str(tmpdir.join("started"))
+
+    start = time.monotonic()
+    with _owned_pool(2) as pool:
+        res = _parallel_process(
+            func=_hang_first_attempt_in_process,
+            configuration=[{"x": x, "marker": marker} for x in range(10)],
+            pool=pool,
+            front_serial=0,
+            front_parallel=0,
+            timeout=30,
+            straggler_factor=2,
+        )
+
+    assert res == [x ** 2 for x in range(10)]
+    # the pool doesn't wait for the hung copy
+    assert time.monotonic() - start < 30
+
+
+def test_parallel_process_streams_results():
+    first_result_received = threading.Event()
+
+    def _wait_for_first_result(x):
+        # only completes if the first result is handed on while this job is
+        # still running
+        if x == 1 and not first_result_received.wait(5):
+            raise TimeoutError("First result was not handed on")
+
+        return x
+
+    received = []
+
+    def _callback(res):
+        received.append(res)
+        first_result_received.set()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        res = _parallel_process(
+            func=_wait_for_first_result,
+            configuration=[0, 1],
+            pool=pool,
+            front_serial=0,
+            front_parallel=0,
+            callback=_callback,
+        )
+
+    assert res == []
+    assert received == [0, 1]
@@ -0,0 +1,80 @@
+import glob
+import os.path
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openscm_runner.adapters.utils._parallel_process import _parallel_process
+from openscm_runner.profiling import _profiling_run, merge_profiles
+
+
+def _profiled_function(x):
+    return sum(i ** 2 for i in range(x))
+
+
+def _get_profiled_function_calls(stats):
+    return sum(
+        n_calls
+        for (_, _, func_name), (_, n_calls, _, _, _) in stats.stats.items()
+        if func_name == "_profiled_function"
+    )
+
+
+def _run(pool):
+    return _parallel_process(
+        func=_profiled_function,
+        configuration=[10, 100, 1000, 10000],
+        pool=pool,
+        front_serial=1,
+        front_parallel=1,
+    )
+
+
+@pytest.mark.parametrize("pool", (None, ThreadPoolExecutor(2)))
+def test_profiling_run(tmpdir, monkeypatch, pool):
+    monkeypatch.setenv("OPENSCM_RUNNER_PROFILE_DIR", str(tmpdir))
+
+    with _profiling_run():
+        _run(pool)
+
+    run_dirs = glob.glob(os.path.join(str(tmpdir), "run-*"))
+    assert len(run_dirs) == 1
+
+    run_dir = run_dirs[0]
+    assert glob.glob(os.path.join(run_dir, "worker-*.prof"))
+
+    merged = pstats.Stats(os.path.join(run_dir, "merged.prof"))
+    # every job is in the merged profile
+    assert _get_profiled_function_calls(merged) == 4
+
+    with open(os.path.join(run_dir, "merged.txt")) as file_handle:
+        assert "_profiled_function" in file_handle.read()
+
+
+def test_profiling_each_run_separate(tmpdir, monkeypatch):
+    monkeypatch.setenv("OPENSCM_RUNNER_PROFILE_DIR", str(tmpdir))
+
+    with ThreadPoolExecutor(2) as pool:
+        for _ in range(2):
+            with _profiling_run():
+                _run(pool)
+
+    run_dirs = glob.glob(os.path.join(str(tmpdir), "run-*"))
+    assert len(run_dirs) == 2
+    for run_dir in run_dirs:
+        merged = pstats.Stats(os.path.join(run_dir, "merged.prof"))
+        assert _get_profiled_function_calls(merged) == 4
+
+
+def test_no_profiling(tmpdir, monkeypatch):
+    monkeypatch.delenv("OPENSCM_RUNNER_PROFILE_DIR", raising=False)
+
+    with _profiling_run():
+        _run(None)
+
+    assert not tmpdir.listdir()
+
+
+def test_merge_profiles_no_profiles(tmpdir):
+    assert merge_profiles(str(tmpdir)) is None
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from openscm_runner.adapters.utils._result_store import (
+    _get_result_cache,
+    _hash_cfg,
+    _hash_timeseries,
+    _ResultCache,
+    _ResultStore,
+)
+
+
+def test_hash_cfg_order_independent():
+    assert _hash_cfg({"a": 1, "b": np.array([1.0, 2.0])}) == _hash_cfg(
+        {"b": np.array([1.0, 2.0]), "a": 1}
+    )
+    assert _hash_cfg({"a": 1}) != _hash_cfg({"a": 2})
+
+
+def test_hash_timeseries_ignores_empty_times(make_results):
+    ts = make_results(run_ids=[0]).timeseries()
+    ts_extra_time = ts.copy()
+    ts_extra_time[pd.Timestamp("2018-01-01")] = np.nan
+
+    assert _hash_timeseries(ts) == _hash_timeseries(ts_extra_time)
+    assert _hash_timeseries(ts) != _hash_timeseries(ts * 2)
+
+
+def test_result_store(tmpdir, make_results):
+    store = _ResultStore(str(tmpdir))
+    assert store.get("abcd") is None
+
+    res = make_results(run_ids=[0])
+    store.put("abcd", res)
+
+    # survives re-opening
+    res_read = _ResultStore(str(tmpdir)).get("abcd")
+    pd.testing.assert_frame_equal(res_read.timeseries(), res.timeseries())
+
+
+def test_result_cache_evicts_least_recently_used(tmpdir, make_results):
+    cache = _ResultCache(str(tmpdir), max_size=np.inf)
+    size = cache.put("aa01", make_results(run_ids=[0]))
+    cache.put("aa02", make_results(run_ids=[1]))
+
+    # make aa01 the most recently used
+    os.utime(cache._get_file("aa02"), (0, 0))
+    assert cache.get("aa01") is not None
+
+    cache = _ResultCache(str(tmpdir), max_size=2.5 * size)
+    cache.put("aa03", make_results(run_ids=[2]))
+
+    assert cache.get("aa02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("aa03") is not None
+
+
+def test_result_cache_evicts_below_max_size(tmpdir, make_results):
+    cache = _ResultCache(str(tmpdir), max_size=np.inf)
+    size = cache.put("aa01", make_results(run_ids=[0]))
+    cache.max_size = 3.2 * size
+    for i in range(1, 4):
+        cache.put("aa0{}".format(i + 1), make_results(run_ids=[i]))
+
+    # evicts to leave room for more results, rather than just fitting
+    assert cache._size <= 0.9 * cache.max_size
+    assert cache.get("aa01") is None
+    assert cache.get("aa02") is None
+    assert cache.get("aa03") is not None
+    assert cache.get("aa04") is not None
+
+
+def test_get_result_cache_reused(tmpdir, monkeypatch, make_results):
+    monkeypatch.setenv("OPENSCM_RUNNER_CACHE_DIR", str(tmpdir))
+    monkeypatch.setenv("OPENSCM_RUNNER_CACHE_MAX_SIZE_MB", "1")
+    cache = _get_result_cache()
+    size = cache.put("aa01", make_results(run_ids=[0]))
+
+    # the size is tracked without walking the directory again
+    assert _get_result_cache() is cache
+    assert cache._size == size
+
+    monkeypatch.setenv("OPENSCM_RUNNER_CACHE_MAX_SIZE_MB", "2")
+    assert _get_result_cache().max_size == 2 * 1024 ** 2
+
+
+def test_get_result_cache_not_configured(monkeypatch):
+    monkeypatch.delenv("OPENSCM_RUNNER_CACHE_DIR", raising=False)
+    assert _get_result_cache() is None
@@ -2,7 +2,7 @@ import re
 
 import pytest
 
-from openscm_runner import run
+from openscm_runner import run, run_iter
 
 
 def test_run_out_config_conflict_error():
@@ -30,3 +30,15 @@ def test_run_out_config_type_error():
             scenarios="not used",
             out_config={"model_a": "hi"},
         )
+
+
+def test_run_iter_batch_size_error():
+    error_msg = re.escape("`scenario_batch_size` must be at least 1, received: 0")
+    with pytest.raises(ValueError, match=error_msg):
+        next(
+            run_iter(
+                climate_models_cfgs={"model_a": ["config list"]},
+                scenarios="not used",
+                scenario_batch_size=0,
+            )
+        )
@@ -0,0 +1,47 @@
+import numpy.testing as npt
+import pytest
+from scmdata import run_append
+
+from openscm_runner.sinks import NetCDFSink, ParquetSink
+
+
+@pytest.fixture(params=["netcdf", "parquet"])
+def sink_cls(request):
+    if request.param == "netcdf":
+        pytest.importorskip("netCDF4")
+        return NetCDFSink
+
+    pytest.importorskip("pyarrow")
+    return ParquetSink
+
+
+def test_sink_write_read(sink_cls, tmpdir, make_results):
+    chunks = [make_results("ssp126", [0, 1]), make_results("ssp245", [2])]
+
+    with sink_cls(str(tmpdir)) as sink:
+        for chunk in chunks:
+            sink.write(chunk)
+
+    assert len(sink.chunk_files) == len(chunks)
+
+    res = sink.read()
+    exp = run_append(chunks)
+
+    assert res.shape == exp.shape
+    npt.assert_allclose(
+        res.timeseries(meta=exp.meta.columns.tolist()).sort_index(),
+        exp.timeseries(meta=exp.meta.columns.tolist()).sort_index(),
+    )
+
+
+def test_sink_adds_to_existing(sink_cls, tmpdir, make_results):
+    sink_cls(str(tmpdir)).write(make_results("ssp126", [0]))
+    sink_cls(str(tmpdir)).write(make_results("ssp245", [0]))
+
+    res = sink_cls(str(tmpdir)).read()
+    assert set(res.get_unique_meta("scenario")) == {"ssp126", "ssp245"}
+
+
+def test_sink_read_empty(tmpdir):
+    with pytest.raises(ValueError, match="No results found in"):
+        NetCDFSink(str(tmpdir)).read()
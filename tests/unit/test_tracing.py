@@ -0,0 +1,154 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openscm_runner.adapters.utils._parallel_process import (
+    _execute_work_items,
+    _parallel_process,
+)
+from openscm_runner.executors import SerialExecutor
+from openscm_runner.tracing import Tracer, span, tracing
+
+
+def test_span_without_tracer():
+    # does nothing
+    with span("stage"):
+        pass
+
+
+def test_tracer():
+    tracer = Tracer()
+    with tracing(tracer):
+        with span("outer", scenario="ssp126"):
+            with span("inner"):
+                pass
+
+            with span("inner"):
+                pass
+
+    # spans are recorded as they end
+    assert [s["name"] for s in tracer.spans] == ["inner", "inner", "outer"]
+    assert tracer.spans[-1]["args"] == {"scenario": "ssp126"}
+
+    summary = tracer.summary()
+    assert summary["inner"]["count"] == 2
+    assert summary["outer"]["count"] == 1
+    assert summary["outer"]["seconds"] >= summary["inner"]["seconds"]
+
+
+def test_tracer_no_spans():
+    tracer = Tracer(keep_spans=False)
+    with tracing(tracer):
+        with span("stage"):
+            pass
+
+    assert tracer.spans == []
+    assert tracer.summary()["stage"]["count"] == 1
+
+
+def test_nested_tracers():
+    outer = Tracer()
+    inner = Tracer()
+    with tracing(outer):
+        with span("first"):
+            pass
+
+        with tracing(inner):
+            with span("second"):
+                pass
+
+    assert [s["name"] for s in outer.spans] == ["first", "second"]
+    assert [s["name"] for s in inner.spans] == ["second"]
+
+
+def test_write_chrome_trace(tmpdir):
+    tracer = Tracer()
+    with tracing(tracer):
+        with span("stage"):
+            pass
+
+    out_file = str(tmpdir.join("trace.json"))
+    tracer.write_chrome_trace(out_file)
+    with open(out_file) as file_handle:
+        trace = json.load(file_handle)
+
+    assert len(trace["traceEvents"]) == 1
+    event = trace["traceEvents"][0]
+    assert event["name"] == "stage"
+    assert event["ph"] == "X"
+    assert event["dur"] >= 0
+
+
+def _traced_square(x):
+    with span("square"):
+        return x ** 2
+
+
+@pytest.mark.parametrize("pool", (None, SerialExecutor(), ThreadPoolExecutor(2)))
+@pytest.mark.parametrize("chunksize", (1, 2))
+def test_parallel_process_spans(pool, chunksize):
+    tracer = Tracer()
+    with tracing(tracer):
+        res = _parallel_process(
+            func=_traced_square,
+            configuration=[1, 2, 3, 4, 5],
+            pool=pool,
+            front_serial=1,
+            front_parallel=1,
+            chunksize=chunksize,
+            name="squaring",
+        )
+
+    assert res == [1, 4, 9, 16, 25]
+
+    # each job and the span within it is recorded exactly once
+    summary = tracer.summary()
+    assert summary["squaring"]["count"] == 5
+    assert summary["square"]["count"] == 5
+    assert sorted(
+        s["args"]["index"] for s in tracer.spans if s["category"] == "job"
+    ) == list(range(5))
+
+
+def test_parallel_process_no_tracer(monkeypatch):
+    def _no_tracer():
+        raise AssertionError("Tracer created without an active tracer")
+
+    monkeypatch.setattr(
+        "openscm_runner.adapters.utils._parallel_process.Tracer", _no_tracer
+    )
+    res = _parallel_process(
+        func=_traced_square,
+        configuration=[1, 2, 3],
+        pool=SerialExecutor(),
+        front_serial=1,
+        front_parallel=1,
+    )
+
+    assert res == [1, 4, 9]
+
+
+def test_execute_work_items_no_trace():
+    res_stats = _execute_work_items(_traced_square, [1, 2], False, None, trace=False)
+
+    assert [res for res, _ in res_stats] == [1, 4]
+    assert all(stats["spans"] == [] for _, stats in res_stats)
+
+
+def test_parallel_process_no_job_stages():
+    tracer = Tracer(job_stages=False)
+    with tracing(tracer):
+        _parallel_process(
+            func=_traced_square,
+            configuration=[1, 2, 3],
+            pool=SerialExecutor(),
+            front_serial=1,
+            front_parallel=1,
+            name="squaring",
+        )
+
+    # the jobs are recorded, the stages within them aren't
+    summary = tracer.summary()
+    assert summary["squaring"]["count"] == 3
+    assert "square" not in summary